@@ -0,0 +1,224 @@
+"""Offline benchmark suite for the crawl methods, feed filtering and report rendering
+
+Usage:
+    python benchmarks/bench_crawler.py                  # compare with benchmarks/baseline.json
+    python benchmarks/bench_crawler.py --save-baseline  # record a new baseline
+    python benchmarks/bench_crawler.py --only synthetic --repeat 3
+
+Every case runs against responses replayed from disk (config.replay_dir), never the network:
+  recorded   pages and feeds in benchmarks/fixtures (index.json maps the real URLs)
+  synthetic  HCMUS feeds scaled up to --feed-items items (default 10000)
+
+The suite exits with status 1 when a case is slower than its baseline by more than
+--tolerance (relative) and --min-delta (absolute seconds). Baselines are machine specific:
+record them on the machine that runs the comparison.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hcmus_crawler.config import config, ProgramType  # noqa: E402
+from hcmus_crawler.crawler import NewsCrawler  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+FEED_SECTIONS = ["standard_course_info", "standard_talented_bachelor", "standard_ai"]
+FEED_SECTIONS += ["standard_course_chain", "clc"]
+
+WORDS = (
+    "thông báo học bổng sinh viên khoa công nghệ thông tin lịch thi học phần hội thảo "
+    "trí tuệ nhân tạo chương trình chất lượng cao tuyển sinh tốt nghiệp cử nhân tài năng "
+    "nghiên cứu khoa học hóa học vật lý sinh học môi trường địa chất toán tin IT AI CLC"
+).split()
+
+
+def synthetic_feed(items: int) -> bytes:
+    """RSS feed of items with pseudo-random Vietnamese titles"""
+    base = datetime(2025, 11, 15, 9, tzinfo=timezone(timedelta(hours=7)))
+    out = ['<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>']
+    out.append("<title>Trường Đại học Khoa học Tự nhiên</title>")
+    for i in range(items):
+        title = " ".join(WORDS[(i * 7 + k * 13) % len(WORDS)] for k in range(9))
+        link = f"https://hcmus.edu.vn/{2025 - i // 2000}/{i % 12 + 1:02d}/bai-viet-{i}/"
+        out.append(
+            f"<item><title>{title} {i}</title><link>{link}</link>"
+            f"<pubDate>{format_datetime(base - timedelta(hours=i))}</pubDate>"
+            f"<description><![CDATA[<p>{title}. Chi tiết xem tại website.</p>]]></description>"
+            "</item>"
+        )
+    out.append("</channel></rss>")
+    return "\n".join(out).encode("utf-8")
+
+
+def write_synthetic_fixtures(directory: str, items: int) -> None:
+    body = synthetic_feed(items)
+    with open(os.path.join(directory, "feed.xml"), "wb") as f:
+        f.write(body)
+
+    # Trang HTML dùng lại bản đã ghi (đường dẫn tuyệt đối), chỉ feed được phóng to
+    with open(os.path.join(FIXTURES_DIR, "index.json"), "r", encoding="utf-8") as f:
+        index = json.load(f)
+    for entry in index.values():
+        entry["body"] = os.path.join(FIXTURES_DIR, entry["body"])
+
+    feed_entry = {
+        "status": 200,
+        "headers": {"Content-Type": "application/rss+xml; charset=UTF-8"},
+        "body": "feed.xml",
+    }
+    index[config.hcmus_url] = feed_entry
+    index[config.main_feed_url] = feed_entry
+    with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def new_crawler(replay_dir: str) -> NewsCrawler:
+    config.replay_dir = replay_dir
+    config.record_dir = None
+    config.conditional_requests = False
+    config.item_store = False
+    crawler = NewsCrawler()
+    logging.getLogger().setLevel(logging.WARNING)
+    return crawler
+
+
+def build_cases(crawler: NewsCrawler, prefix: str) -> List[Tuple[str, Callable[[], object]]]:
+    """(name, function) pairs; every function starts from a cold per-run feed cache"""
+
+    def cold(method: Callable[[], object]) -> Callable[[], object]:
+        def run():
+            crawler._feed_cache.clear()
+            crawler._feed_matches.clear()
+            return method()
+
+        return run
+
+    def rss_filter():
+        # Feed đã parse sẵn, chỉ đo phân loại keyword và lọc cho mọi section
+        crawler._feed_matches.clear()
+        return [crawlers[key][1]() for key in FEED_SECTIONS]
+
+    def render_reports():
+        return [report.to_markdown() for report in reports.values()]
+
+    crawlers = crawler._get_section_crawlers()
+    cases = []
+    if prefix == "recorded":
+        for key in ["ctda", "fit", "old_hcmus"]:
+            cases.append((f"recorded.crawl_{key}", cold(crawlers[key][1])))
+    cases.append((f"{prefix}.crawl_hcmus", cold(crawlers["hcmus"][1])))
+    cases.append((f"{prefix}.crawl_standard_course_info", cold(crawlers[FEED_SECTIONS[0]][1])))
+    cases.append((f"{prefix}.crawl_clc", cold(crawlers["clc"][1])))
+
+    # Chuẩn bị feed và báo cáo một lần cho hai case cuối
+    crawler._feed_cache.clear()
+    crawler._feed_matches.clear()
+    reports = crawler.generate_reports(list(ProgramType))
+    cases.append((f"{prefix}.rss_filter", rss_filter))
+    cases.append((f"{prefix}.to_markdown", render_reports))
+    return cases
+
+
+def time_case(function: Callable[[], object], repeat: int) -> float:
+    function()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case (median)")
+    parser.add_argument("--feed-items", type=int, default=10_000)
+    parser.add_argument("--only", choices=["recorded", "synthetic"])
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative slowdown")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="Ignored slowdown (s)")
+    args = parser.parse_args()
+    args.baseline = os.path.abspath(args.baseline)
+
+    results: Dict[str, float] = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # crawler.log và .crawler-state không rơi vào repo
+
+        suites = []
+        if args.only in (None, "recorded"):
+            suites.append(("recorded", FIXTURES_DIR))
+        if args.only in (None, "synthetic"):
+            synthetic_dir = os.path.join(tmp, "synthetic")
+            os.makedirs(synthetic_dir)
+            write_synthetic_fixtures(synthetic_dir, args.feed_items)
+            suites.append(("synthetic", synthetic_dir))
+
+        for prefix, replay_dir in suites:
+            crawler = new_crawler(replay_dir)
+            for name, function in build_cases(crawler, prefix):
+                results[name] = time_case(function, args.repeat)
+            crawler.close()
+        os.chdir(cwd)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "machine": platform.machine(),
+                    "cases": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        for name, seconds in results.items():
+            print(f"{name:<42}{seconds * 1000:>10.2f} ms")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["cases"]
+    except (OSError, ValueError, KeyError):
+        baseline = {}
+
+    failed = []
+    print(f"{'case':<42}{'ms':>10}{'baseline':>10}{'ratio':>8}")
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<42}{seconds * 1000:>10.2f}{'-':>10}{'-':>8}")
+            continue
+        ratio = seconds / base if base else float("inf")
+        slow = seconds > base * (1 + args.tolerance) and seconds - base > args.min_delta
+        marker = "  SLOWER" if slow else ""
+        print(f"{name:<42}{seconds * 1000:>10.2f}{base * 1000:>10.2f}{ratio:>7.2f}x{marker}")
+        if slow:
+            failed.append(name)
+
+    if failed:
+        print(f"{len(failed)} case(s) slower than baseline: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
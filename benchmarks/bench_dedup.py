@@ -0,0 +1,147 @@
+"""Near-duplicate clustering of a large set of synthetic titles, MinHash/LSH versus pairwise
+
+Usage:
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --titles 300000 --repost-rate 0.2 --pairwise 5000
+
+Builds --titles synthetic titles (topic words from bench_crawler.WORDS and syllables from
+bench_search.VOCABULARY). A share of --repost-rate of the announcements is reposted once
+or twice with the edits seen across the HCMUS sources: a "[CTĐA]"-style tag, other
+punctuation, no diacritics, another case, an "(cập nhật)" suffix or one word changed.
+Then it reports:
+  lsh       time of dedup.find_clusters on every title, and its pair precision/recall
+            against the known reposts
+  pairwise  time of comparing every pair of the first --pairwise titles exactly, with the
+            time extrapolated (quadratically) to every title
+
+The benchmark exits with status 1 when the recall is below --min-recall or the precision
+below --min-precision.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import List, Set, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_crawler import WORDS  # noqa: E402
+from bench_search import VOCABULARY  # noqa: E402
+from hcmus_crawler.dedup import find_clusters, jaccard, normalize_title  # noqa: E402
+from hcmus_crawler.dedup import shingle_hashes  # noqa: E402
+from hcmus_crawler.matcher import fold_diacritics  # noqa: E402
+
+TAGS = ["[CTĐA] ", "[FIT] ", "(HCMUS) ", "[Thông báo] ", "【SV】 "]
+
+
+def repost(title: str, rng: random.Random) -> str:
+    """The title as another source might publish it"""
+    edit = rng.randrange(6)
+    if edit == 0:
+        return rng.choice(TAGS) + title
+    if edit == 1:
+        words = title.split()
+        cut = rng.randrange(1, len(words))
+        return f"{' '.join(words[:cut])}: {' '.join(words[cut:])}!"
+    if edit == 2:
+        return fold_diacritics(title).capitalize()
+    if edit == 3:
+        return title.upper()
+    if edit == 4:
+        return f"{title} (cập nhật)"
+    words = title.split()
+    words[rng.randrange(len(words))] = rng.choice(VOCABULARY)
+    return " ".join(words)
+
+
+def synthetic_titles(count: int, repost_rate: float, seed: int) -> Tuple[List[str], List[int]]:
+    """Titles in publication order and the announcement each one belongs to"""
+    rng = random.Random(seed)
+    titles: List[str] = []
+    origins: List[int] = []
+    announcement = 0
+    while len(titles) < count:
+        words = rng.sample(WORDS, 2) + rng.choices(VOCABULARY, k=rng.randint(6, 14))
+        rng.shuffle(words)
+        title = " ".join(words).capitalize()
+        copies = [title]
+        if rng.random() < repost_rate:
+            copies += [repost(title, rng) for _ in range(rng.randint(1, 2))]
+        for copy in copies[: count - len(titles)]:
+            titles.append(copy)
+            origins.append(announcement)
+        announcement += 1
+
+    # Các bản đăng lại nằm rải rác, không liền nhau
+    order = list(range(count))
+    rng.shuffle(order)
+    return [titles[i] for i in order], [origins[i] for i in order]
+
+
+def cluster_pairs(clusters: List[List[int]]) -> Set[Tuple[int, int]]:
+    return {(a, b) for members in clusters for i, a in enumerate(members) for b in members[i + 1 :]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--repost-rate", type=float, default=0.1, help="share reposted")
+    parser.add_argument("--pairwise", type=int, default=2000, help="titles compared pairwise")
+    parser.add_argument("--threshold", type=float, default=0.6)
+    parser.add_argument("--shingle-size", type=int, default=5)
+    parser.add_argument("--bands", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=2025)
+    parser.add_argument("--min-recall", type=float, default=0.95)
+    parser.add_argument("--min-precision", type=float, default=0.95)
+    args = parser.parse_args()
+
+    titles, origins = synthetic_titles(args.titles, args.repost_rate, args.seed)
+    by_origin = Counter(origins)
+    print(
+        f"titles   {len(titles)} title(s), {sum(1 for n in by_origin.values() if n > 1)} "
+        f"reposted announcement(s)"
+    )
+
+    start = time.perf_counter()
+    clusters = find_clusters(titles, args.threshold, args.shingle_size, args.bands, args.rows)
+    lsh_seconds = time.perf_counter() - start
+
+    expected: dict = {}
+    for index, origin in enumerate(origins):
+        expected.setdefault(origin, []).append(index)
+    expected_pairs = cluster_pairs([members for members in expected.values() if len(members) > 1])
+    found_pairs = cluster_pairs(clusters)
+    correct = len(found_pairs & expected_pairs)
+    recall = correct / len(expected_pairs) if expected_pairs else 1.0
+    precision = correct / len(found_pairs) if found_pairs else 1.0
+    print(
+        f"lsh      {lsh_seconds:7.2f} s  {len(clusters)} cluster(s)  "
+        f"recall {recall:.3f}  precision {precision:.3f}"
+    )
+
+    subset = titles[: args.pairwise]
+    start = time.perf_counter()
+    shingles = [shingle_hashes(normalize_title(title), args.shingle_size) for title in subset]
+    pairs = 0
+    for i, a in enumerate(shingles):
+        for b in shingles[i + 1 :]:
+            pairs += jaccard(a, b) >= args.threshold
+    pairwise_seconds = time.perf_counter() - start
+    estimate = pairwise_seconds * (len(titles) / max(len(subset), 1)) ** 2
+    print(
+        f"pairwise {pairwise_seconds:7.2f} s  for {len(subset)} title(s) "
+        f"({pairs} pair(s)), about {estimate / 60:.0f} min for {len(titles)}"
+    )
+
+    failed = recall < args.min_recall or precision < args.min_precision
+    if failed:
+        print("BELOW TARGET: recall or precision")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
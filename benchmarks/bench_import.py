@@ -0,0 +1,105 @@
+"""Cold-start benchmark: import time of the package and of the CLI help
+
+Usage:
+    python benchmarks/bench_import.py                 # check the default budget
+    python benchmarks/bench_import.py --budget-ms 80 --repeat 10
+
+Each case runs in a fresh interpreter under `python -X importtime` (PYTHONPATH=src) and
+reports the median cumulative import time of the hcmus_crawler modules, the heaviest
+modules it pulled in, and whether a heavy dependency (requests, urllib3, lxml, bs4) was
+loaded although the case does not need it.
+
+The benchmark exits with status 1 when a case is over --budget-ms or loads a forbidden
+module. Timings are machine specific: set the budget for the machine that runs the check.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+HEAVY_MODULES = ["requests", "urllib3", "lxml", "bs4"]
+
+# (tên, tham số python, module nặng không được nạp)
+CASES: List[Tuple[str, List[str], List[str]]] = [
+    ("import", ["-c", "import hcmus_crawler"], HEAVY_MODULES),
+    ("cli_help", ["-m", "hcmus_crawler", "--help"], HEAVY_MODULES),
+    ("import_crawler", ["-c", "import hcmus_crawler.crawler"], HEAVY_MODULES),
+]
+
+
+def import_times(python_args: List[str]) -> Dict[str, Tuple[int, int]]:
+    """{module: (self µs, cumulative µs)} of one run under -X importtime"""
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(SRC_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *python_args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+    times: Dict[str, Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def package_time(times: Dict[str, Tuple[int, int]]) -> int:
+    """Cumulative µs of the top-level hcmus_crawler imports (nested ones are included)"""
+    total = times.get("hcmus_crawler", (0, 0))[1]
+    # `python -m` nạp package trước rồi mới chạy __main__ ở ngoài importtime
+    for name, (_, cumulative) in times.items():
+        if name.startswith("hcmus_crawler.") and cumulative > total:
+            total = cumulative
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (median)")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=100.0,
+        help="maximum median import time of the package per case (default: 100)",
+    )
+    parser.add_argument("--top", type=int, default=8, help="heaviest modules to list")
+    args = parser.parse_args()
+
+    failed = False
+    for name, python_args, forbidden in CASES:
+        # Lần đầu cũng tạo .pyc, không tính vào kết quả
+        times = import_times(python_args)
+        runs = [package_time(import_times(python_args)) for _ in range(max(1, args.repeat))]
+        median_ms = statistics.median(runs) / 1000
+        loaded = [module for module in forbidden if module in times]
+
+        status = "ok"
+        if median_ms > args.budget_ms:
+            status = f"OVER BUDGET ({args.budget_ms:g} ms)"
+        if loaded:
+            status = f"loads {', '.join(loaded)}"
+        failed = failed or status != "ok"
+        print(f"{name:<16} {median_ms:8.1f} ms  {status}")
+
+        heaviest = sorted(times.items(), key=lambda entry: entry[1][0], reverse=True)
+        for module, (self_us, cumulative_us) in heaviest[: args.top]:
+            print(
+                f"    {module:<40} self {self_us / 1000:6.1f} ms  "
+                f"cum {cumulative_us / 1000:6.1f} ms"
+            )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""Memory used by NewsItem/NewsSection for a large item history
+
+Usage: python benchmarks/bench_items.py [--items 100000]
+
+Builds the same synthetic items with a plain __dict__ dataclass (the previous NewsItem)
+and with the current NewsItem, wraps them in a section and reports the tracemalloc
+footprint of each.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hcmus_crawler.models import NewsItem, NewsSection  # noqa: E402
+
+CATEGORIES = ["Academic Planning", "Academic Affairs", "Student Support", None]
+
+
+@dataclass
+class LegacyNewsItem:
+    """NewsItem before __slots__ and interning"""
+
+    title: str
+    url: str
+    date: str
+    category: Optional[str] = None
+    description: Optional[str] = None
+
+    def __post_init__(self):
+        self.title = self.title.strip()
+        self.url = self.url.strip()
+        self.date = self.date.strip()
+        if self.category:
+            self.category = self.category.strip()
+        if self.description:
+            self.description = self.description.strip()
+
+    def is_valid(self) -> bool:
+        return bool(self.title and self.url and self.date)
+
+
+@dataclass
+class LegacyNewsSection:
+    """NewsSection before in-place filtering"""
+
+    title: str
+    items: List[LegacyNewsItem]
+
+    def __post_init__(self):
+        self.items = [item for item in self.items if item.is_valid()]
+
+
+def raw_fields(count: int) -> Iterator[tuple]:
+    # Mỗi item có chuỗi riêng như khi parse, không dùng chung literal
+    for i in range(count):
+        category = CATEGORIES[i % 4]
+        yield (
+            f"Thông báo số {i} về kế hoạch học tập",
+            f"https://hcmus.edu.vn/thong-bao-{i}/",
+            f"{i % 28 + 1:02d}/{i % 12 + 1:02d}/2025",
+            f"{category} " if category else None,
+        )
+
+
+def measure(item_cls, section_cls, count: int) -> tuple:
+    """(section, retained bytes, peak bytes) of parsing count items into one section"""
+    tracemalloc.start()
+    section = section_cls("History", [item_cls(*row) for row in raw_fields(count)])
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return section, current, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    args = parser.parse_args()
+
+    legacy, legacy_current, legacy_peak = measure(LegacyNewsItem, LegacyNewsSection, args.items)
+    compact, compact_current, compact_peak = measure(NewsItem, NewsSection, args.items)
+
+    if [asdict(item) for item in legacy.items] != [asdict(item) for item in compact.items]:
+        print("NewsItem fields differ from the legacy dataclass", file=sys.stderr)
+        return 1
+
+    print(f"{args.items} items, slots={not hasattr(compact.items[0], '__dict__')}")
+    print(f"{'':<10}{'retained MiB':>14}{'peak MiB':>10}{'bytes/item':>12}")
+    for name, current, peak in [
+        ("legacy", legacy_current, legacy_peak),
+        ("compact", compact_current, compact_peak),
+    ]:
+        print(
+            f"{name:<10}{current / 2**20:>14.2f}{peak / 2**20:>10.2f}"
+            f"{current / args.items:>12.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
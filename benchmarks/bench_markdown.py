@@ -0,0 +1,128 @@
+"""Compare the streaming markdown renderer with string concatenation on large reports
+
+Usage: python benchmarks/bench_markdown.py [--sizes 10000 50000 100000]
+
+Each report is written to a temporary file, once through the previous implementation
+(to_markdown() built with +=, then one f.write) and once through
+f.writelines(report.iter_markdown()). Peak memory is measured with tracemalloc.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hcmus_crawler.models import CrawlerReport, NewsItem, NewsSection  # noqa: E402
+
+
+def legacy_section_markdown(section: NewsSection) -> str:
+    """NewsSection.to_markdown before the streaming renderer"""
+    if section.error_message:
+        return f"## {section.title}\n\n*{section.error_message}*\n\n"
+
+    if not section.items:
+        return f"## {section.title}\n\n*No news items found*\n\n"
+
+    result = f"## {section.title}\n\n"
+    current_category = None
+
+    for item in section.items:
+        if item.category and item.category != current_category:
+            result += f"### {item.category}\n\n"
+            current_category = item.category
+
+        date_part = f"**{item.date}**: " if item.date else ""
+        result += f"• {date_part}[{item.title}]({item.url})\n\n"
+
+    return result
+
+
+def legacy_report_markdown(report: CrawlerReport) -> str:
+    """CrawlerReport.to_markdown before the streaming renderer"""
+    result = "# 🎓 HCMUS News Update\n\n"
+    result += f'*Last updated: **{report.timestamp.strftime("%Y-%m-%d at %H:%M %Z")}***\n\n'
+    result += "---\n\n"
+
+    if report.errors:
+        result += "## ⚠️ Errors\n\n"
+        for error in report.errors:
+            result += f"• {error}\n"
+        result += "\n"
+
+    for section in report.sections:
+        result += legacy_section_markdown(section)
+
+    return result
+
+
+def synthetic_report(total_items: int, sections: int = 10) -> CrawlerReport:
+    per_section = total_items // sections
+    return CrawlerReport(
+        sections=[
+            NewsSection(
+                f"Section {s}",
+                [
+                    NewsItem(
+                        title=f"[CTĐA] Thông báo kế hoạch học tập số {s}-{i} năm học 2025-2026",
+                        url=f"https://www.ctda.hcmus.edu.vn/vi/2025/09/thong-bao-{s}-{i}/",
+                        date=f"{i % 28 + 1:02d}/09/2025",
+                        category=f"Category {i // 50}",
+                    )
+                    for i in range(per_section)
+                ],
+            )
+            for s in range(sections)
+        ],
+        timestamp=datetime.now(timezone.utc),
+    )
+
+
+def measure(write, report: CrawlerReport, path: str) -> tuple:
+    """(seconds, peak traced bytes) of one write of report to path"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(path, "w", encoding="utf-8") as f:
+        write(report, f)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = parser.parse_args()
+
+    engines = {
+        "concat": lambda report, f: f.write(legacy_report_markdown(report)),
+        "stream": lambda report, f: f.writelines(report.iter_markdown()),
+    }
+
+    ok = True
+    print(f"{'items':>8}  {'engine':<8}{'time ms':>10}{'peak MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            report = synthetic_report(size)
+            outputs = {}
+            for name, write in engines.items():
+                path = os.path.join(tmp, f"{name}.md")
+                elapsed, peak = measure(write, report, path)
+                with open(path, encoding="utf-8") as f:
+                    outputs[name] = f.read()
+                print(f"{size:>8}  {name:<8}{elapsed * 1000:>10.1f}{peak / 2**20:>10.2f}")
+
+            if outputs["concat"] != outputs["stream"]:
+                print(f"{size}: streaming output differs from concatenation", file=sys.stderr)
+                ok = False
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
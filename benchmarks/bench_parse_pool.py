@@ -0,0 +1,80 @@
+"""Parse throughput of fetch threads alone versus the process parse pool
+
+Usage:
+    python benchmarks/bench_parse_pool.py
+    python benchmarks/bench_parse_pool.py --pages 64 --feed-items 2000 --processes 4
+
+Parses --pages synthetic feeds the way a large crawl or backfill would: --threads fetch
+threads each parse their own pages (GIL-bound), then the same threads hand the bodies to
+a ParsePool of --processes workers. Both runs must yield identical items. Worker start-up
+is not timed; the pool is warmed up with one page first.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_crawler import synthetic_feed  # noqa: E402
+from hcmus_crawler.models import NewsItem  # noqa: E402
+from hcmus_crawler.parsepool import ParsePool, parse_page  # noqa: E402
+
+
+def run_pages(
+    pages: List[bytes], threads: int, parse: Callable[[bytes], List[NewsItem]]
+) -> List[List[NewsItem]]:
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        return list(executor.map(parse, pages))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=32)
+    parser.add_argument("--feed-items", type=int, default=2000, help="items per page")
+    parser.add_argument("--threads", type=int, default=8, help="fetch threads")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--queue-size", type=int, default=0, help="0 = 2 x processes")
+    args = parser.parse_args()
+
+    body = synthetic_feed(args.feed_items)
+    pages = [body] * args.pages
+    print(
+        f"{args.pages} page(s) x {args.feed_items} item(s) ({len(body) / 1024:.0f} KiB each), "
+        f"{args.threads} thread(s)"
+    )
+
+    start = time.perf_counter()
+    expected = run_pages(pages, args.threads, lambda content: parse_page("feed", content))
+    threads_seconds = time.perf_counter() - start
+    print(
+        f"threads only          {threads_seconds:8.2f} s  "
+        f"{args.pages / threads_seconds:7.1f} pages/s"
+    )
+
+    pool = ParsePool(args.processes, args.queue_size or None)
+    try:
+        pool.submit("feed", body).result()  # khởi động các process
+        start = time.perf_counter()
+        results = run_pages(
+            pages, args.threads, lambda content: pool.submit("feed", content).result()
+        )
+        pool_seconds = time.perf_counter() - start
+    finally:
+        pool.close()
+    print(
+        f"{args.processes:>2} parse process(es) {pool_seconds:8.2f} s  "
+        f"{args.pages / pool_seconds:7.1f} pages/s  ({threads_seconds / pool_seconds:.2f}x)"
+    )
+
+    if results != expected:
+        print("MISMATCH: the parse pool returned different items")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
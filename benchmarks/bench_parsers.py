@@ -0,0 +1,68 @@
+"""Compare the BeautifulSoup and lxml HTML extraction engines on saved pages
+
+Usage: python benchmarks/bench_parsers.py [--repeat N]
+
+Both engines must return identical NewsItems for every fixture; the script exits with
+status 1 when they differ.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from hcmus_crawler.config import config  # noqa: E402
+from hcmus_crawler.parsers import HTML_PARSERS  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(source: str) -> tuple:
+    with open(os.path.join(FIXTURES_DIR, f"{source}.html"), "rb") as f:
+        content = f.read()
+    if source == "ctda":
+        return (content, config.ctda_section_titles)
+    return (content,)
+
+
+def time_parser(parser, args: tuple, repeat: int) -> float:
+    """Median wall time of one parse, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parser(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per engine (default: 20)")
+    args = parser.parse_args()
+
+    ok = True
+    print(f"{'source':<12}{'items':>7}{'bs4 ms':>10}{'lxml ms':>10}{'speedup':>10}")
+    for source, engines in HTML_PARSERS.items():
+        parse_args = load_fixture(source)
+
+        expected = engines["bs4"](*parse_args)
+        actual = engines["lxml"](*parse_args)
+        if expected != actual:
+            print(f"{source}: lxml engine output differs from bs4", file=sys.stderr)
+            ok = False
+
+        bs4_ms = time_parser(engines["bs4"], parse_args, args.repeat)
+        lxml_ms = time_parser(engines["lxml"], parse_args, args.repeat)
+        print(
+            f"{source:<12}{len(expected):>7}{bs4_ms:>10.2f}{lxml_ms:>10.2f}"
+            f"{bs4_ms / lxml_ms:>9.1f}x"
+        )
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
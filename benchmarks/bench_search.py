@@ -0,0 +1,133 @@
+"""Full-text search latency over a large synthetic item history
+
+Usage:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --items 500000 --budget-ms 200
+
+Fills a temporary item store with --items synthetic items spread over several years, in
+batches like the regular runs. Titles mix a few topic words (bench_crawler.WORDS) with
+words from a larger pseudo-random vocabulary, so a query matches a realistic share of the
+history rather than nearly every item. Then it reports:
+  index   time of one incremental run (--run-items items, a tenth of them new)
+  search  median latency of typical queries and how many items each one matches
+
+The benchmark exits with status 1 when a query median is over --budget-ms.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from bench_crawler import WORDS  # noqa: E402
+from hcmus_crawler.models import NewsItem, NewsSection  # noqa: E402
+from hcmus_crawler.store import ItemStore, fts_query  # noqa: E402
+
+SOURCES = ["ctda", "fit", "hcmus", "old_hcmus"]
+QUERIES = [
+    ("học bổng", {}),
+    ("hoc bong", {"since": "2025-01"}),
+    ("lịch thi", {}),
+    ("trí tuệ", {"until": "2023"}),
+    ("tuyển sinh", {"newest_first": True}),
+    ("khoa", {"section": "fit"}),
+    ("sinh", {}),
+]
+
+
+_rng = random.Random(2025)
+_SYLLABLES = [
+    f"{onset}{vowel}{coda}"
+    for onset in ["b", "c", "d", "đ", "g", "h", "kh", "l", "m", "n", "ng", "nh", "ph", "s", "t"]
+    for vowel in ["a", "ă", "â", "e", "ê", "i", "o", "ô", "ơ", "u", "ư", "oa", "uyê"]
+    for coda in ["", "c", "m", "n", "ng", "nh", "p", "t"]
+]
+VOCABULARY = _rng.sample(_SYLLABLES, 1000)
+
+
+def synthetic_items(start: int, count: int, first_day: datetime) -> List[NewsItem]:
+    items = []
+    for i in range(start, start + count):
+        rng = random.Random(i)
+        words = rng.sample(WORDS, 2) + rng.choices(VOCABULARY, k=7)
+        rng.shuffle(words)
+        title = " ".join(words)
+        day = first_day + timedelta(days=i // 40)
+        items.append(
+            NewsItem(
+                title=f"{title} {i}",
+                url=f"https://hcmus.edu.vn/{day.year}/bai-viet-{i}/",
+                date=day.strftime("%d/%m/%Y"),
+                description=f"<p>{title}. Chi tiết xem tại website.</p>",
+            )
+        )
+    return items
+
+
+def record(store: ItemStore, items: List[NewsItem]) -> int:
+    sections = []
+    for index, source in enumerate(SOURCES):
+        sections.append((source, source, NewsSection(source, items[index :: len(SOURCES)])))
+    return store.record(sections, datetime.now(timezone.utc))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000, help="items in the history")
+    parser.add_argument("--batch", type=int, default=5000, help="items per run while filling")
+    parser.add_argument("--run-items", type=int, default=500, help="items in the timed run")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query (median)")
+    parser.add_argument("--budget-ms", type=float, default=100.0)
+    args = parser.parse_args()
+
+    # Khoảng 40 tin mỗi ngày, lùi về quá khứ đủ để chứa toàn bộ lịch sử
+    first_day = datetime(2025, 12, 31) - timedelta(days=args.items // 40)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ItemStore(os.path.join(tmp, "items.sqlite3"))
+
+        start = time.perf_counter()
+        for offset in range(0, args.items, args.batch):
+            record(store, synthetic_items(offset, min(args.batch, args.items - offset), first_day))
+        fill_seconds = time.perf_counter() - start
+        print(f"history  {args.items} item(s) recorded in {fill_seconds:.1f} s")
+
+        # Một lượt bình thường: phần lớn tin đã biết, một phần mười là tin mới
+        new = args.run_items // 10
+        run = synthetic_items(args.items - (args.run_items - new), args.run_items, first_day)
+        start = time.perf_counter()
+        added = record(store, run)
+        index_ms = (time.perf_counter() - start) * 1000
+        print(f"index    {added} new of {len(run)} item(s) in {index_ms:.1f} ms")
+
+        failed = False
+        for query, filters in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = store.search(query, **filters)
+                timings.append(time.perf_counter() - start)
+            median_ms = statistics.median(timings) * 1000
+            over = median_ms > args.budget_ms
+            failed = failed or over
+            matches = store._conn.execute(
+                "SELECT COUNT(*) FROM items_fts WHERE items_fts MATCH ?", [fts_query(query)]
+            ).fetchone()[0]
+            label = f"{query} {filters}" if filters else query
+            print(
+                f"search   {label:<40} {median_ms:7.2f} ms  {len(results):>3} result(s) "
+                f"of {matches} match(es)" + ("  OVER BUDGET" if over else "")
+            )
+        store.close()
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,35 @@ __version__ = "2.0.0"
 __author__ = ""
 __description__ = "Automated news aggregation system for HCMUS websites"
 
-from .crawler import NewsCrawler
-from .models import NewsItem, NewsSection, CrawlerReport
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# config nạp ngay: submodule .config được import sẽ che mất instance nếu export lười
 from .config import config
 
+# Export lười: `import hcmus_crawler` không kéo theo requests/lxml/bs4 cho tới khi cần
+_EXPORTS = {
+    "NewsCrawler": ".crawler",
+    "NewsItem": ".models",
+    "NewsSection": ".models",
+    "CrawlerReport": ".models",
+}
+
+if TYPE_CHECKING:
+    from .crawler import NewsCrawler
+    from .models import CrawlerReport, NewsItem, NewsSection
+
 __all__ = ["NewsCrawler", "NewsItem", "NewsSection", "CrawlerReport", "config"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,233 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+import requests
+
+from .cache import content_hash
+from .config import config
+from .parsers import extract_article_text
+
+if TYPE_CHECKING:
+    from .client import HttpClient
+
+INDEX_FILE = "index.json"
+
+
+class ArticleCache:
+    """Content-addressed on-disk cache of extracted article text with LRU size eviction
+
+    Texts are stored once per page body hash (articles/<hash[:2]>/<hash>.txt); the index maps
+    each URL to the hash and ETag of the body it was extracted from, and when the URL was last
+    checked. When the total size goes over max_bytes the least recently used texts are deleted
+    together with their URLs.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, logger: Optional[logging.Logger] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._urls: Dict[str, dict] = {}
+        self._blobs: Dict[str, dict] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(os.path.join(self.directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._urls = data.get("urls", {})
+            self._blobs = data.get("blobs", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable article cache index: {str(e)}")
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"urls": self._urls, "blobs": self._blobs}
+            self._dirty = False
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = os.path.join(self.directory, f"{INDEX_FILE}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+        except OSError as e:
+            self.logger.warning(f"Failed to save article cache index: {str(e)}")
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.txt")
+
+    def _read_blob(self, digest: str) -> Optional[str]:
+        try:
+            with open(self._blob_path(digest), "r", encoding="utf-8") as f:
+                text = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            if digest in self._blobs:
+                self._blobs[digest]["atime"] = time.time()
+                self._dirty = True
+        return text
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached text of url, or None"""
+        with self._lock:
+            entry = self._urls.get(url)
+        return self._read_blob(entry["hash"]) if entry else None
+
+    def is_stale(self, url: str, now: Optional[float] = None) -> bool:
+        """Whether url was last checked more than config.article_revalidate_after ago"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._urls.get(url)
+        # Index cũ không có "checked": kiểm tra lại một lần
+        return entry is not None and now - entry.get("checked", 0) > config.article_revalidate_after
+
+    def etag(self, url: str) -> Optional[str]:
+        with self._lock:
+            entry = self._urls.get(url)
+        return entry.get("etag") if entry else None
+
+    def revalidated(self, url: str) -> Optional[str]:
+        """Cached text of url after the server answered 304 Not Modified, or None"""
+        text = self.get(url)
+        with self._lock:
+            if text is None:
+                # Văn bản đã mất: lần sau tải lại đầy đủ
+                self._urls.pop(url, None)
+            elif url in self._urls:
+                self._urls[url]["checked"] = time.time()
+            self._dirty = True
+        return text
+
+    def get_by_hash(self, url: str, body_hash: str, etag: Optional[str]) -> Optional[str]:
+        """Text already extracted from an identical body (another URL or an evicted entry)"""
+        with self._lock:
+            known = body_hash in self._blobs
+        text = self._read_blob(body_hash) if known else None
+        if text is not None:
+            with self._lock:
+                self._urls[url] = {"hash": body_hash, "etag": etag, "checked": time.time()}
+                self._dirty = True
+        return text
+
+    def put(self, url: str, body_hash: str, etag: Optional[str], text: str) -> None:
+        path = self._blob_path(body_hash)
+        data = text.encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to cache article text for {url}: {str(e)}")
+            return
+
+        with self._lock:
+            now = time.time()
+            self._blobs[body_hash] = {"size": len(data), "atime": now}
+            self._urls[url] = {"hash": body_hash, "etag": etag, "checked": now}
+            self._dirty = True
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            total = sum(blob["size"] for blob in self._blobs.values())
+            if total <= self.max_bytes:
+                return
+
+            evicted = set()
+            for digest, blob in sorted(self._blobs.items(), key=lambda entry: entry[1]["atime"]):
+                if total <= self.max_bytes:
+                    break
+                total -= blob["size"]
+                evicted.add(digest)
+            for digest in evicted:
+                del self._blobs[digest]
+            self._urls = {
+                url: entry for url, entry in self._urls.items() if entry["hash"] not in evicted
+            }
+
+        for digest in evicted:
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+
+
+class ArticleFetcher:
+    """Fetch and extract the main text of article pages, each at most once across runs"""
+
+    def __init__(
+        self, client: "HttpClient", cache: ArticleCache, logger: Optional[logging.Logger] = None
+    ):
+        self.client = client
+        self.cache = cache
+        self.logger = logger or logging.getLogger(__name__)
+
+    def texts(self, urls: Iterable[str], deadline: Optional[float] = None) -> Dict[str, str]:
+        """Text of every url that is cached or could be fetched now
+
+        Uncached pages are fetched concurrently, newest first (urls in feed order), then
+        cached pages due for revalidation (with If-None-Match), at most
+        config.article_max_fetch_per_run per call; the rest wait for a later run. No page
+        is requested after deadline (a time.monotonic() value).
+        """
+        texts: Dict[str, str] = {}
+        missing: List[str] = []
+        stale: List[str] = []
+        for url in dict.fromkeys(urls):
+            text = self.cache.get(url)
+            if text is None:
+                missing.append(url)
+                continue
+            texts[url] = text
+            if self.cache.is_stale(url):
+                # Vẫn dùng văn bản cũ nếu kiểm tra lại thất bại hoặc để lượt sau
+                stale.append(url)
+
+        missing = (missing + stale)[: config.article_max_fetch_per_run]
+        if missing:
+            with ThreadPoolExecutor(
+                max_workers=max(1, config.article_workers), thread_name_prefix="article"
+            ) as executor:
+                fetched = executor.map(lambda url: self._fetch(url, deadline), missing)
+                for url, text in zip(missing, fetched):
+                    if text is not None:
+                        texts[url] = text
+            self.logger.info(f"Fetched {len(missing)} article page(s)")
+        return texts
+
+    def _fetch(self, url: str, deadline: Optional[float] = None) -> Optional[str]:
+        etag = self.cache.etag(url)
+        try:
+            response = self.client.get(
+                url, headers={"If-None-Match": etag} if etag else None, deadline=deadline
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            self.logger.warning(f"Failed to fetch article {url}: {str(e)}")
+            return None
+
+        if response.status_code == 304:
+            return self.cache.revalidated(url)
+
+        body_hash = content_hash(response.content)
+        etag = response.headers.get("ETag")
+        # Cùng nội dung đã trích xuất (URL khác hoặc đã bị xóa khỏi index): không parse lại
+        text = self.cache.get_by_hash(url, body_hash, etag)
+        if text is None:
+            text = extract_article_text(response.content)
+            self.cache.put(url, body_hash, etag, text)
+        return text
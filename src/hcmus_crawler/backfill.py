@@ -0,0 +1,274 @@
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .config import config
+from .crawler import NewsCrawler
+from .models import NewsItem, NewsSection
+from .ratelimit import HostRateLimiter
+from .schedule import sections_digest
+
+# Nguồn mà section được chia theo keyword (các section standard_* và clc)
+_KEYWORD_SOURCES = {"main_feed"}
+
+
+class BackfillCursor:
+    """Resumable progress of a backfill: completed pages and the last page of every source"""
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._sources: Dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._sources = json.load(f).get("sources", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable backfill cursor {self.path}: {str(e)}")
+
+    def save(self) -> None:
+        with self._lock:
+            data = {
+                "updated_at": time.time(),
+                "sources": {
+                    source: dict(entry, completed=sorted(entry.get("completed", [])))
+                    for source, entry in self._sources.items()
+                },
+            }
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save backfill cursor: {str(e)}")
+
+    def reset(self, source: str) -> None:
+        with self._lock:
+            self._sources.pop(source, None)
+
+    def is_completed(self, source: str, page: int) -> bool:
+        with self._lock:
+            return page in self._sources.get(source, {}).get("completed", ())
+
+    def last_page(self, source: str) -> Optional[int]:
+        with self._lock:
+            return self._sources.get(source, {}).get("last_page")
+
+    def complete(self, source: str, page: int, items: int) -> None:
+        with self._lock:
+            entry = self._sources.setdefault(source, {})
+            completed = entry.setdefault("completed", [])
+            if page not in completed:
+                completed.append(page)
+                entry["items"] = entry.get("items", 0) + items
+
+    def set_last_page(self, source: str, page: int) -> None:
+        """Record that the archive of source ends at page (pages after it are ignored)"""
+        with self._lock:
+            entry = self._sources.setdefault(source, {})
+            if entry.get("last_page") is None or page < entry["last_page"]:
+                entry["last_page"] = page
+                entry["completed"] = [p for p in entry.get("completed", []) if p <= page]
+
+
+@dataclass
+class BackfillStats:
+    pages_fetched: int = 0
+    pages_skipped: int = 0  # đã xong ở lượt trước
+    pages_failed: int = 0
+    items: int = 0
+    new_items: int = 0
+    rate_limit_seconds: float = 0.0  # thời gian chờ giới hạn request theo host
+
+
+class ArchiveBackfill:
+    """Walk the paged archives of several sources into the item store
+
+    Pages are fetched by a bounded pool of workers, one page per task, with requests to the
+    same host spaced by config.backfill_host_interval. Each finished page is written to the
+    item store and to the cursor, so an interrupted backfill resumes without refetching
+    completed pages. A source ends at the first page that is missing (404), empty, or a
+    repeat of another page (a listing that ignores the page parameter).
+    """
+
+    def __init__(
+        self,
+        crawler: NewsCrawler,
+        sources: List[str],
+        max_pages: Optional[int] = None,
+        workers: Optional[int] = None,
+    ):
+        if crawler.item_store is None:
+            raise ValueError("Backfill needs the item store (do not use --no-store)")
+        unknown = [source for source in sources if source not in config.archive_pages]
+        if unknown:
+            raise ValueError(f"No archive pages configured for {', '.join(unknown)}")
+
+        self.crawler = crawler
+        self.logger = crawler.logger
+        self.sources = list(sources)
+        self.max_pages = max_pages if max_pages is not None else config.backfill_max_pages
+        self.workers = max(1, workers or config.backfill_workers)
+        # Chậm hơn giới hạn chung của HttpClient: mỗi host một request mỗi khoảng, không burst
+        interval = config.backfill_host_interval
+        self.limiter = HostRateLimiter(default=(1 / interval if interval > 0 else 0.0, 1))
+        self.cursor = BackfillCursor(
+            os.path.join(config.state_dir, config.backfill_file), self.logger
+        )
+        self.stats = BackfillStats()
+
+        self._next_page = {source: 1 for source in sources}
+        self._page_digests: Dict[str, Dict[str, int]] = {source: {} for source in sources}
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def stop(self, *_: object) -> None:
+        """Stop submitting pages; pages in flight finish (usable as a signal handler)"""
+        self._stop.set()
+
+    def restart(self) -> None:
+        """Forget the progress of every source of this backfill"""
+        for source in self.sources:
+            self.cursor.reset(source)
+        self.cursor.save()
+
+    def _page_url(self, source: str, page: int) -> str:
+        template, _ = config.archive_pages[source]
+        return template.format(page=page)
+
+    def _fetch_page(self, source: str, page: int) -> Optional["Future[List[NewsItem]]"]:
+        """Items of one archive page being parsed, or None when the page does not exist
+
+        The worker is free for the next page as soon as the body is handed to the parser.
+        """
+        url = self._page_url(source, page)
+        waited = self.limiter.acquire(url)
+        with self._stats_lock:
+            self.stats.rate_limit_seconds += waited
+        response = self.crawler.client.get(url)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        _, kind = config.archive_pages[source]
+        return self.crawler.submit_parse(kind, response.content)
+
+    def _next_task(self) -> Optional[Tuple[str, int]]:
+        """Next (source, page) to fetch, taking sources in turn"""
+        for _ in range(len(self.sources)):
+            source = self.sources.pop(0)
+            self.sources.append(source)
+
+            last_page = self.cursor.last_page(source)
+            if self.max_pages is not None and (last_page is None or last_page > self.max_pages):
+                last_page = self.max_pages
+            page = self._next_page[source]
+            while last_page is None or page <= last_page:
+                if not self.cursor.is_completed(source, page):
+                    self._next_page[source] = page + 1
+                    return source, page
+                self.stats.pages_skipped += 1
+                page += 1
+            self._next_page[source] = page
+        return None
+
+    def _record_page(self, source: str, page: int, items: List[NewsItem]) -> None:
+        # Trang lặp lại một trang khác: nguồn bỏ qua tham số trang, coi như đã hết
+        digest = sections_digest([NewsSection(source, items)])
+        first_page = self._page_digests[source].setdefault(digest, page)
+        if first_page != page:
+            self.cursor.set_last_page(source, min(first_page, page))
+            return
+
+        sections = self._sections(source, items)
+        assert self.crawler.item_store is not None  # kiểm tra trong __init__
+        self.stats.new_items += self.crawler.item_store.record(
+            sections, datetime.now(timezone.utc), touch_existing=False
+        )
+        self.stats.items += len(items)
+        self.cursor.complete(source, page, len(items))
+
+    def _sections(self, source: str, items: List[NewsItem]) -> List[Tuple[str, str, NewsSection]]:
+        """(section key, source URL, section) triples for the item store"""
+        source_url = self._page_url(source, 1)
+        if source not in _KEYWORD_SOURCES:
+            return [(source, source_url, NewsSection(source, items))]
+
+        # Feed chung: mỗi item thuộc các section có keyword khớp, còn lại bỏ qua
+        by_section: Dict[str, List[NewsItem]] = {}
+        for item in items:
+            for key in self.crawler.keyword_matcher.match(f"{item.title} {item.description}"):
+                by_section.setdefault(key, []).append(item)
+        return [(key, source_url, NewsSection(key, found)) for key, found in by_section.items()]
+
+    def run(self) -> BackfillStats:
+        """Backfill until every source reached its last page, max_pages, or stop() was called"""
+        self.logger.info(f"Backfilling {', '.join(self.sources)} with {self.workers} worker(s)")
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill")
+        in_flight: Dict[Future, Tuple[str, int]] = {}
+        try:
+            while True:
+                # Hàng đợi có giới hạn: không bao giờ quá `workers` trang đang tải
+                while not self._stop.is_set() and len(in_flight) < self.workers:
+                    task = self._next_task()
+                    if task is None:
+                        break
+                    in_flight[executor.submit(self._fetch_page, *task)] = task
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, page = in_flight.pop(future)
+                    self._finish_page(source, page, future)
+                self.cursor.save()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.cursor.save()
+
+        self.logger.info(
+            f"Backfill: {self.stats.pages_fetched} page(s), {self.stats.new_items} new item(s), "
+            f"{self.stats.pages_failed} failed page(s)"
+        )
+        return self.stats
+
+    def _finish_page(self, source: str, page: int, future: Future) -> None:
+        last_page = self.cursor.last_page(source)
+        if last_page is not None and page > last_page:
+            return  # tải song song với trang cuối, bỏ qua
+
+        try:
+            parsing = future.result()
+            items = parsing.result() if parsing is not None else None
+        except Exception as error:
+            # Trang lỗi không được đánh dấu xong, lượt sau sẽ thử lại
+            self.stats.pages_failed += 1
+            if isinstance(error, requests.exceptions.RequestException):
+                self.logger.warning(f"Backfill {source} page {page} failed: {str(error)}")
+            else:
+                self.logger.warning(f"Backfill {source} page {page}: {error!r}")
+            return
+
+        self.stats.pages_fetched += 1
+        if not items:
+            self.logger.info(f"Backfill {source}: archive ends at page {page - 1}")
+            self.cursor.set_last_page(source, page - 1)
+            return
+        self._record_page(source, page, items)
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from .models import NewsItem
+
+if TYPE_CHECKING:
+    import requests
+
+# Tăng khi cách parse thay đổi để bỏ các item đã cache theo định dạng cũ
+STORE_VERSION = 1
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class ValidatorStore:
+    """Persistent ETag/Last-Modified/content-hash store with the parsed items of each URL"""
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, dict] = {}
+        self._dirty = False
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable validator store {self.path}: {str(e)}")
+            return
+
+        if data.get("version") == STORE_VERSION:
+            self._entries = data.get("entries", {})
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"version": STORE_VERSION, "entries": self._entries}
+            self._dirty = False
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save validator store: {str(e)}")
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for the last stored response of url"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def lookup(self, url: str, response: "requests.Response") -> Optional[List[NewsItem]]:
+        """Return the stored items when response is a 304 or carries an unchanged body"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return None
+
+        if response.status_code != 304 and content_hash(response.content) != entry["hash"]:
+            return None
+
+        return [NewsItem(**item) for item in entry["items"]]
+
+    def stored_items(self, url: str) -> Optional[List[NewsItem]]:
+        """Items stored for url by the last fetch, without any request"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return None
+        return [NewsItem(**item) for item in entry["items"]]
+
+    def previous_items(self, url: str, max_partial_parses: int) -> Optional[List[NewsItem]]:
+        """Stored items to parse url incrementally against (their first item is the high-water
+        mark), or None when a full parse is due after max_partial_parses incremental ones"""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry or entry.get("partial_parses", 0) >= max_partial_parses:
+            return None
+        return [NewsItem(**item) for item in entry["items"]]
+
+    def update(
+        self, url: str, response: "requests.Response", items: List[NewsItem], partial: bool = False
+    ) -> None:
+        """Store the validators and items of response; partial marks an incremental parse"""
+        with self._lock:
+            previous = self._entries.get(url) or {}
+        entry = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "hash": content_hash(response.content),
+            "items": [asdict(item) for item in items],
+            "partial_parses": previous.get("partial_parses", 0) + 1 if partial else 0,
+        }
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty = True
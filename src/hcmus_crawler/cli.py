@@ -0,0 +1,292 @@
+"""Command-line options and run flow shared by `python -m hcmus_crawler` and crawl.py"""
+
+import argparse
+import signal
+import traceback
+from typing import List, Optional
+
+from .config import ProgramType, config
+
+PROGRAMS = {"apcs": ProgramType.APCS, "standard": ProgramType.STANDARD, "clc": ProgramType.CLC}
+
+
+def _positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def build_parser(
+    description: str, epilog: Optional[str] = None, prog: Optional[str] = None
+) -> argparse.ArgumentParser:
+    """Parser of every crawl option; the entry points only differ in description and epilog"""
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description=description,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=epilog,
+    )
+
+    parser.add_argument(
+        "-p",
+        "--program",
+        type=str,
+        choices=list(PROGRAMS) + ["all"],
+        default="apcs",
+        help="Program to crawl news for; all writes every NEWS-*.md in one pass, fetching each "
+        "source once (default: apcs)",
+    )
+
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="Show detailed progress information"
+    )
+
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=_positive_int,
+        default=config.max_workers,
+        help=f"Sources crawled in parallel, 1 = sequential (default: {config.max_workers})",
+    )
+
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=config.run_deadline,
+        help=f"Overall run deadline in seconds (default: {config.run_deadline:g})",
+    )
+
+    parser.add_argument(
+        "--parse-processes",
+        type=int,
+        default=config.parse_processes,
+        metavar="N",
+        help="Parse pages in N worker processes, 0 = in the fetching threads "
+        f"(default: {config.parse_processes}); useful for large crawls and backfills",
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore stored ETag/Last-Modified validators and refetch everything",
+    )
+
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Do not record item history in the SQLite item store "
+        "(.crawler-state/items.sqlite3)",
+    )
+
+    parser.add_argument(
+        "--max-items",
+        type=_positive_int,
+        metavar="N",
+        default=config.report_max_items_per_section,
+        help="Maximum items per section in the markdown files; older items are cut "
+        "(default: all)",
+    )
+
+    parser.add_argument(
+        "--dedup",
+        action="store_true",
+        help="Collapse items reposted across sources (near-duplicate titles with the same "
+        "numbers) into one entry",
+    )
+
+    parser.add_argument(
+        "--due-only",
+        action="store_true",
+        help="Only request sources that are due according to their observed change rate "
+        "(.crawler-state/schedule.json); other sources reuse stored items",
+    )
+
+    parser.add_argument(
+        "--prometheus",
+        metavar="PATH",
+        default=config.prometheus_file,
+        help="Also write run metrics in Prometheus text format to PATH (the JSON summary "
+        "always goes to .crawler-state/metrics.json)",
+    )
+
+    parser.add_argument(
+        "--record",
+        metavar="DIR",
+        help="Save raw responses (status, headers, body) of every request to DIR",
+    )
+
+    parser.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="Serve responses recorded in DIR instead of the network (offline run)",
+    )
+
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and poll each source on its own interval (config.poll_intervals), "
+        "rewriting only changed reports; stop with SIGTERM/Ctrl+C",
+    )
+
+    parser.add_argument(
+        "--articles",
+        action="store_true",
+        help="Fetch the full text of feed articles and filter keywords on it "
+        "(cached in .crawler-state/articles)",
+    )
+
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        metavar="FORMAT",
+        choices=["json", "ndjson", "atom"],
+        help="Also write the report as json, ndjson (one item per line) and/or atom "
+        "(one feed merging all sections) next to NEWS-*.md, e.g. NEWS-APCS.json",
+    )
+
+    parser.add_argument(
+        "--backfill",
+        nargs="+",
+        metavar="SOURCE",
+        choices=list(config.archive_pages) + ["all"],
+        help="Walk the paged archives of SOURCE into the item history instead of writing "
+        f"reports ({', '.join(config.archive_pages)} or all); rerun to resume where it stopped",
+    )
+
+    parser.add_argument(
+        "--backfill-pages",
+        type=_positive_int,
+        default=config.backfill_max_pages,
+        metavar="N",
+        help="Maximum archive pages per source when backfilling (default: up to the last page)",
+    )
+
+    parser.add_argument(
+        "--backfill-restart",
+        action="store_true",
+        help="Forget the saved backfill progress (.crawler-state/backfill.json) and start "
+        "at page 1",
+    )
+
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> List[ProgramType]:
+    """Apply the parsed options to config; returns the programs to crawl, in report order"""
+    config.max_workers = args.workers
+    config.run_deadline = args.deadline
+    config.parse_processes = args.parse_processes
+    config.conditional_requests = not args.no_cache
+    config.item_store = not args.no_store
+    config.report_max_items_per_section = args.max_items
+    config.report_dedup = args.dedup or config.report_dedup
+    config.prometheus_file = args.prometheus
+    config.record_dir = args.record
+    config.replay_dir = args.replay
+    config.fetch_articles = args.articles or config.fetch_articles
+    config.output_formats = args.formats or config.output_formats
+
+    if args.program == "all":
+        return list(PROGRAMS.values())
+    return [PROGRAMS[args.program]]
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the crawl, backfill or daemon selected by args; returns the exit code"""
+    # Import sau khi parse tham số: --help không phải nạp requests/lxml/bs4
+    from .crawler import NewsCrawler
+    from .models import SaveStatus
+
+    program_types = config_from_args(args)
+
+    if args.backfill:
+        from .backfill import ArchiveBackfill
+
+        sources = list(config.archive_pages) if "all" in args.backfill else args.backfill
+        try:
+            backfill = ArchiveBackfill(NewsCrawler(), sources, max_pages=args.backfill_pages)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            return 1
+        if args.backfill_restart:
+            backfill.restart()
+        # SIGTERM/Ctrl+C: chờ các trang đang tải rồi lưu con trỏ để chạy tiếp lần sau
+        signal.signal(signal.SIGTERM, backfill.stop)
+        signal.signal(signal.SIGINT, backfill.stop)
+        backfill_stats = backfill.run()
+        print(
+            f"Backfill: {backfill_stats.pages_fetched} page(s), {backfill_stats.items} item(s) "
+            f"({backfill_stats.new_items} new), {backfill_stats.pages_skipped} page(s) done "
+            f"earlier, {backfill_stats.pages_failed} failed page(s)"
+        )
+        return 1 if backfill_stats.pages_failed else 0
+
+    if args.daemon:
+        from .daemon import CrawlerDaemon
+
+        daemon = CrawlerDaemon(NewsCrawler(program_type=program_types[0]), program_types)
+        # SIGTERM/Ctrl+C: dừng sau lượt poll hiện tại và lưu trạng thái
+        signal.signal(signal.SIGTERM, daemon.stop)
+        signal.signal(signal.SIGINT, daemon.stop)
+        daemon.run()
+        return 0
+
+    try:
+        crawler = NewsCrawler(program_type=program_types[0])
+        reports = crawler.generate_reports(program_types, due_only=args.due_only)
+
+        failed = False
+        for program_type, report in reports.items():
+            if args.verbose:
+                total_items = sum(len(section.items) for section in report.sections)
+                error_count = len([s for s in report.sections if s.has_errors()])
+                print(
+                    f"[{program_type.value.upper()}] Found {total_items} news items "
+                    f"from {len(report.sections)} sources"
+                )
+                if error_count > 0:
+                    print(f"{error_count} sources had errors")
+
+            status = crawler.save_report(report, program_type)
+            filename = config.get_output_filename(program_type)
+
+            if status is SaveStatus.WRITTEN:
+                print(f"Success! Results saved to: {filename}")
+            elif status is SaveStatus.UNCHANGED:
+                print(f"No changes, kept existing: {filename}")
+            else:
+                print("❌ Failed to save report!")
+                failed = True
+
+        crawler.write_metrics()
+
+        if args.verbose:
+            run_stats = crawler.get_run_stats()
+            if run_stats["skipped_sources"]:
+                print(f"Not due, reused stored items: {', '.join(run_stats['skipped_sources'])}")
+            if config.item_store:
+                print(f"New items since previous runs: {run_stats['new_items']}")
+            for host, stats in run_stats["hosts"].items():
+                print(
+                    f"{host}: {stats['requests']} request(s), "
+                    f"{stats['reused_connections']} reused connection(s), "
+                    f"{stats['bytes_transferred']} bytes transferred, "
+                    f"{stats['limiter_wait_seconds']:.1f}s waiting for the rate limiter"
+                )
+
+        return 1 if failed else 0
+
+    except KeyboardInterrupt:
+        print("\nCrawling interrupted by user")
+        return 1
+    except Exception as e:
+        print(f"Error during crawling: {str(e)}")
+        if args.verbose:
+            print("Full error trace:")
+            traceback.print_exc()
+        return 1
@@ -0,0 +1,252 @@
+import logging
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, ReadTimeoutError
+from urllib3.util import make_headers
+
+from .config import config
+from .metrics import RunMetrics
+from .ratelimit import (
+    DeadlineExceededError,
+    HostRateLimiter,
+    HostUnavailableError,
+    parse_retry_after,
+)
+from .replay import FixtureStore, ReplayAdapter
+from .utils import create_session, request_deadline
+
+
+class ResponseTooLargeError(requests.exceptions.RequestException):
+    """Response body exceeded config.max_response_bytes"""
+
+
+def is_timeout(error: requests.exceptions.RequestException) -> bool:
+    """Whether error is a connect/read timeout, also once urllib3 gave up retrying it"""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(reason, MaxRetryError) and isinstance(
+        reason.reason, (ConnectTimeoutError, ReadTimeoutError)
+    )
+
+
+@dataclass
+class HostStats:
+    requests: int = 0
+    new_connections: int = 0
+    reused_connections: int = 0
+    not_modified: int = 0
+    bytes_transferred: int = 0  # byte trên đường truyền (đã nén)
+    bytes_decoded: int = 0
+    limiter_wait_seconds: float = 0.0  # chờ giới hạn tốc độ/Retry-After, không tính vào mạng
+    rejected: int = 0  # request bị từ chối ngay vì host đang down
+
+
+class HttpClient:
+    """Pooled HTTP client shared by every source, with per-host transfer counters
+
+    Requests go through a per-host rate limiter. 429/503 answers are retried after their
+    Retry-After, and hosts that keep failing are skipped for a cool-off period.
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        max_response_bytes: Optional[int] = None,
+        metrics: Optional[RunMetrics] = None,
+    ):
+        self.session = create_session(
+            pool_connections=pool_connections or config.pool_connections,
+            pool_maxsize=pool_maxsize or config.pool_maxsize,
+        )
+        # gzip/deflate, thêm br khi có cài brotli
+        self.session.headers.update(make_headers(accept_encoding=True))
+        self.max_response_bytes = max_response_bytes or config.max_response_bytes
+        self.metrics = metrics
+
+        # --replay: trả lời từ file đã ghi, không ra mạng; --record: ghi lại mọi response
+        if config.replay_dir:
+            replay_adapter = ReplayAdapter(FixtureStore(config.replay_dir))
+            self.session.mount("http://", replay_adapter)
+            self.session.mount("https://", replay_adapter)
+        self.recorder = FixtureStore(config.record_dir) if config.record_dir else None
+        # Phát lại không ra mạng nên không cần giới hạn tốc độ
+        self.limiter = (
+            None
+            if config.replay_dir
+            else HostRateLimiter(
+                config.host_rates,
+                config.default_host_rate,
+                max_wait=config.max_retry_after,
+                failure_threshold=config.breaker_failures,
+                cool_off=config.breaker_cool_off,
+                # Kết nối + chờ header, mỗi bước tối đa timeout giây
+                probe_timeout=2 * config.timeout,
+            )
+        )
+
+        self._lock = threading.Lock()
+        self._stats: Dict[str, HostStats] = {}
+        self._seen_connections: "weakref.WeakSet" = weakref.WeakSet()
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        deadline: Optional[float] = None,
+    ) -> requests.Response:
+        """GET url, reading the body as a stream and refusing bodies over the byte cap
+
+        With a deadline (a time.monotonic() value), waits and timeouts are capped by the
+        time left, and DeadlineExceededError is raised once it has passed.
+        """
+        fetch = self.metrics.fetch(url) if self.metrics is not None else None
+        host = urlsplit(url).netloc
+        waited = 0.0
+        polite_retries = 0
+        try:
+            for attempt in range(config.max_retries + 1):
+                waited += self._acquire(url, deadline)
+                response = self._send(url, headers, deadline)
+                if response.status_code not in (429, 503) or self.limiter is None:
+                    break
+
+                # Host yêu cầu chậm lại: mọi request tới host cùng chờ theo Retry-After
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = config.retry_delay * 2**attempt
+                self.limiter.defer(url, delay)
+                if attempt == config.max_retries or delay > config.max_retry_after:
+                    break
+                response.close()
+                polite_retries += 1
+        except requests.exceptions.RequestException as e:
+            if fetch is not None:
+                fetch.error = str(e)
+                fetch.limiter_wait_seconds = waited
+            with self._lock:
+                stats = self._stats.setdefault(host, HostStats())
+                stats.limiter_wait_seconds += waited
+                if isinstance(e, HostUnavailableError):
+                    stats.rejected += 1
+            raise
+        reused = self._track_connection(response)
+
+        download_start = time.perf_counter()
+        try:
+            chunks = []
+            size = 0
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                size += len(chunk)
+                if size > self.max_response_bytes:
+                    raise ResponseTooLargeError(
+                        f"Response from {url} exceeds {self.max_response_bytes} bytes",
+                        response=response,
+                    )
+                chunks.append(chunk)
+            response._content = b"".join(chunks)
+            wire_bytes = response.raw.tell() if hasattr(response.raw, "tell") else size
+        except requests.exceptions.RequestException as e:
+            if fetch is not None:
+                fetch.error = str(e)
+            raise
+        finally:
+            response.close()
+
+        if self.recorder is not None:
+            self.recorder.record(url, response)
+
+        if fetch is not None:
+            # elapsed: từ lúc gửi request đến khi nhận xong header (TTFB)
+            fetch.status = response.status_code
+            fetch.retries = polite_retries + len(
+                getattr(getattr(response.raw, "retries", None), "history", ())
+            )
+            fetch.limiter_wait_seconds = waited
+            fetch.new_connection = not reused
+            fetch.ttfb_seconds = response.elapsed.total_seconds()
+            fetch.download_seconds = time.perf_counter() - download_start
+            fetch.bytes_transferred = wire_bytes
+            fetch.bytes_decoded = size
+
+        with self._lock:
+            stats = self._stats.setdefault(host, HostStats())
+            stats.requests += 1
+            stats.limiter_wait_seconds += waited
+            if reused:
+                stats.reused_connections += 1
+            else:
+                stats.new_connections += 1
+            if response.status_code == 304:
+                stats.not_modified += 1
+            stats.bytes_transferred += wire_bytes
+            stats.bytes_decoded += size
+
+        return response
+
+    def _acquire(self, url: str, deadline: Optional[float]) -> float:
+        return self.limiter.acquire(url, deadline) if self.limiter is not None else 0.0
+
+    def _send(
+        self, url: str, headers: Optional[Dict[str, str]], deadline: Optional[float]
+    ) -> requests.Response:
+        """One request (urllib3 still retries 5xx); feeds the circuit breaker of the host
+
+        With a deadline, urllib3 does not retry timeouts and stops retrying at the deadline.
+        """
+        timeout = float(config.timeout)
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                raise DeadlineExceededError(f"Run deadline reached before requesting {url}")
+        try:
+            with request_deadline(deadline):
+                response = self.session.get(url, headers=headers, timeout=timeout, stream=True)
+        except requests.exceptions.RequestException as e:
+            # Hết giờ vì hạn chót của lượt chạy thì không phải lỗi của host
+            if not is_timeout(e) or timeout >= config.timeout:
+                self._record_result(url, failed=True)
+            raise
+        self._record_result(url, failed=response.status_code >= 500)
+        return response
+
+    def _record_result(self, url: str, failed: bool) -> None:
+        if self.limiter is None:
+            return
+        if not failed:
+            self.limiter.record_success(url)
+        elif self.limiter.record_failure(url):
+            logging.getLogger(__name__).warning(
+                f"{urlsplit(url).netloc} marked down for {config.breaker_cool_off:g}s "
+                f"after {config.breaker_failures} failed request(s)"
+            )
+
+    def _track_connection(self, response: requests.Response) -> bool:
+        """Whether the connection that served response was already used before"""
+        connection = getattr(response.raw, "connection", None)
+        if connection is None:
+            return False
+
+        with self._lock:
+            if connection in self._seen_connections:
+                return True
+            self._seen_connections.add(connection)
+        return False
+
+    def get_stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {host: asdict(stats) for host, stats in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def close(self) -> None:
+        self.session.close()
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Dict
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
 
@@ -26,8 +26,16 @@ class CrawlerConfig:
     standard_keywords: Dict[str, List[str]] = None
     clc_keywords: List[str] = None
 
+    # Keyword ASCII ngắn ("IT", "AI", "CLC") chỉ khớp nguyên từ, phân biệt hoa thường, trên
+    # văn bản gốc; keyword dài hơn so khớp không phân biệt dấu
+    keyword_boundary_max_length: int = 3
+    keyword_fold_diacritics: bool = True
+
     ctda_section_titles: List[str] = None
 
+    # Engine parse HTML cho từng nguồn: "lxml" (XPath trên lxml.html) hoặc "bs4" (BeautifulSoup)
+    html_engines: Dict[str, str] = field(default_factory=dict)
+
     # Section titles cho các chương trình
     standard_section_titles: Dict[str, str] = None
     program_type: ProgramType = ProgramType.APCS
@@ -36,7 +44,94 @@ class CrawlerConfig:
     max_retries: int = 3
     retry_delay: float = 1.0
 
+    # Connection pool dùng chung cho mọi nguồn
+    pool_connections: int = 10  # số host giữ pool
+    pool_maxsize: int = 10  # số kết nối giữ lại cho mỗi host
+    max_response_bytes: int = 10 * 1024 * 1024
+
+    # Giới hạn tốc độ theo host (token bucket): (request/giây, burst); host khác dùng mặc định
+    host_rates: Dict[str, Tuple[float, int]] = field(default_factory=dict)
+    default_host_rate: Tuple[float, int] = (2.0, 4)
+    # 429/503: chờ theo Retry-After nếu không quá max_retry_after giây, lâu hơn thì bỏ qua host
+    max_retry_after: float = 30.0
+    # Circuit breaker: sau breaker_failures lỗi liên tiếp, host bị coi là down trong cool-off
+    breaker_failures: int = 3
+    breaker_cool_off: float = 300.0
+
+    # Số item tối đa đọc từ mỗi feed (None = tất cả)
+    feed_max_items: Optional[int] = None
+
+    # Crawl các nguồn song song; max_workers=1 tương đương chạy tuần tự
+    max_workers: int = 6
+    run_deadline: float = 60.0
+    # Parse trang trong parse_processes process riêng (0 = parse ngay trong thread tải);
+    # tối đa parse_queue_size trang chờ parse, 0 = gấp đôi số process
+    parse_processes: int = 0
+    parse_queue_size: int = 0
+
+    # Trạng thái lưu giữa các lượt chạy (ETag, item đã parse, ...)
+    state_dir: str = ".crawler-state"
+    conditional_requests: bool = True
+    validator_file: str = "validators.json"
+    # Parse tăng dần: dừng ở item mới nhất của lần trước và ghép item mới vào đầu danh sách cũ;
+    # cứ sau incremental_full_parse_every lần thì parse lại toàn bộ trang
+    incremental_parse: bool = True
+    incremental_full_parse_every: int = 24
+    # Tải toàn văn bài viết trong feed để lọc keyword trên nội dung thay vì chỉ tiêu đề/mô tả;
+    # văn bản trích xuất được cache trên đĩa theo hash nội dung, xóa bớt theo LRU
+    fetch_articles: bool = False
+    article_workers: int = 4
+    article_max_fetch_per_run: int = 20  # trang chưa cache tải mỗi feed mỗi lượt
+    article_cache_dir: str = "articles"
+    article_cache_max_bytes: int = 50 * 1024 * 1024
+    # Bài đã cache quá lâu được kiểm tra lại bằng If-None-Match (304 = dùng văn bản đã có)
+    article_revalidate_after: float = 7 * 24 * 3600
+    # Lịch sử item (SQLite) để biết tin nào mới giữa các lượt chạy
+    item_store: bool = True
+    item_store_file: str = "items.sqlite3"
+
+    # Chế độ daemon: chu kỳ poll (giây) của từng nguồn, jitter và back-off khi lỗi
+    poll_intervals: Dict[str, float] = field(default_factory=dict)
+    poll_jitter: float = 0.1  # ±10% chu kỳ
+    poll_max_backoff: float = 6 * 3600
+    # Poll thích ứng: chu kỳ đề xuất = adaptive_poll_fraction × thời gian trung bình giữa hai
+    # lần nguồn thay đổi (EWMA), trong khoảng [poll_intervals, adaptive_max_interval]
+    schedule_file: str = "schedule.json"
+    adaptive_poll_fraction: float = 0.5
+    adaptive_ewma_alpha: float = 0.3
+    adaptive_max_interval: float = 24 * 3600
+    poll_due_slack: float = 300
+
+    # Backfill: mẫu URL các trang lưu trữ của từng nguồn ({page} bắt đầu từ 1) và cách parse
+    # ("feed" cho RSS/Atom, "fit" cho bảng tin FIT)
+    archive_pages: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    backfill_workers: int = 4
+    backfill_host_interval: float = 1.0  # giây tối thiểu giữa hai request tới cùng host
+    backfill_max_pages: Optional[int] = None  # mỗi nguồn, None = đến trang cuối
+    backfill_file: str = "backfill.json"
+
+    # Ghi lại response thô vào thư mục / phát lại từ thư mục thay vì truy cập mạng
+    record_dir: Optional[str] = None
+    replay_dir: Optional[str] = None
+
+    # Tóm tắt lượt chạy (JSON, trong state_dir) và file Prometheus text format (tùy chọn)
+    metrics_file: str = "metrics.json"
+    prometheus_file: Optional[str] = None
+
     output_file: str = "NEWS-APCS.md"
+    # Định dạng ghi thêm cạnh NEWS-*.md từ cùng một lượt duyệt báo cáo: "json", "ndjson", "atom"
+    output_formats: List[str] = field(default_factory=list)
+    # Số item tối đa mỗi section trong NEWS-*.md (None = tất cả), bỏ bớt tin cũ
+    report_max_items_per_section: Optional[int] = None
+    # Gộp tin đăng lại ở nhiều nguồn (tiêu đề khác chút ở tiền tố "[CTĐA]", dấu câu, dấu thanh)
+    # thành một mục có link tới mọi nguồn: MinHash trên shingle dedup_shingle_size ký tự của
+    # tiêu đề, LSH dedup_bands band × dedup_rows hàng, trùng khi cùng các số (năm, học kỳ,
+    # đợt) và Jaccard >= dedup_threshold. Tắt mặc định: tin cùng một nguồn không bao giờ gộp
+    report_dedup: bool = False
+    dedup_threshold: float = 0.6
+    dedup_shingle_size: int = 5
+    dedup_bands: int = 10
+    dedup_rows: int = 4
     timezone: str = "Asia/Ho_Chi_Minh"
 
     user_agent: str = (
@@ -59,6 +154,35 @@ class CrawlerConfig:
                 "Accounting & Finance",
             ]
 
+        if not self.poll_intervals:
+            self.poll_intervals = {
+                "ctda": 1800,
+                "fit": 1800,
+                "hcmus": 900,
+                "old_hcmus": 1800,
+                "main_feed": 900,
+            }
+
+        if not self.host_rates:
+            self.host_rates = {
+                "hcmus.edu.vn": (2.0, 4),  # feed sinh viên + feed chính
+                "old.hcmus.edu.vn": (1.0, 2),
+                "www.ctda.hcmus.edu.vn": (1.0, 2),
+                "www.fit.hcmus.edu.vn": (1.0, 2),
+            }
+
+        if not self.archive_pages:
+            # Cả hcmus.edu.vn và ctda là WordPress: feed có phân trang qua ?paged=N
+            self.archive_pages = {
+                "hcmus": (f"{self.hcmus_url}?paged={{page}}", "feed"),
+                "main_feed": (f"{self.main_feed_url}?paged={{page}}", "feed"),
+                "ctda": (f"{self.ctda_url}feed/?paged={{page}}", "feed"),
+                "fit": (f"{self.fit_url}?page={{page}}", "fit"),
+            }
+
+        if not self.html_engines:
+            self.html_engines = {"ctda": "lxml", "fit": "lxml", "old_hcmus": "lxml"}
+
         if self.standard_section_titles is None:
             self.standard_section_titles = {
                 "course_info": "Thông tin môn học",
@@ -157,14 +281,14 @@ class CrawlerConfig:
         if self.headers is None:
             self.headers = {"User-Agent": self.user_agent}
 
-    def get_output_filename(self) -> str:
+    def get_output_filename(self, program_type: Optional[ProgramType] = None) -> str:
         """Get output filename based on program type"""
         filename_map = {
             ProgramType.APCS: "NEWS-APCS.md",
             ProgramType.STANDARD: "NEWS-STANDARD.md",
             ProgramType.CLC: "NEWS-CLC.md",
         }
-        return filename_map.get(self.program_type, self.output_file)
+        return filename_map.get(program_type or self.program_type, self.output_file)
 
 
 config = CrawlerConfig()
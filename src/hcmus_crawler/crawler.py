@@ -1,65 +1,190 @@
-from bs4 import BeautifulSoup as bs
-import requests
-import re
+import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 from zoneinfo import ZoneInfo
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+import json
 import logging
+import sqlite3
+import threading
+import time
 
+from .cache import ValidatorStore
 from .config import config, ProgramType
-from .models import NewsItem, NewsSection, CrawlerReport
-from .utils import setup_logging, create_session, safe_request, clean_text, normalize_url
+from .dedup import Duplicates, collapse_duplicates
+from .matcher import KeywordMatcher
+from .metrics import RunMetrics, to_prometheus
+from .schedule import PollSchedule, sections_digest
+from .models import NewsItem, NewsSection, CrawlerReport, SaveStatus
+from .store import ItemStore
+from .utils import setup_logging, safe_request
+
+# requests, lxml và bs4 chỉ được import khi một nguồn thật sự cần tải/parse (khởi động nhanh)
+if TYPE_CHECKING:
+    import requests
+
+    from .articles import ArticleFetcher
+    from .client import HttpClient
+    from .parsepool import ParsePool
+
+# Các section của từng chương trình, theo thứ tự trong báo cáo
+PROGRAM_SECTIONS: Dict[ProgramType, List[str]] = {
+    ProgramType.APCS: ["ctda", "fit", "hcmus", "old_hcmus"],
+    ProgramType.STANDARD: [
+        "standard_course_info",
+        "standard_talented_bachelor",
+        "standard_ai",
+        "standard_course_chain",
+        "hcmus",  # General student info
+        "old_hcmus",  # Exam announcements
+    ],
+    ProgramType.CLC: ["clc", "hcmus", "old_hcmus"],
+}
+
+
+def get_section_keys(program_types: List[ProgramType]) -> List[str]:
+    """Union of the sections of several programs, in report order"""
+    section_keys = []
+    for program_type in program_types:
+        for key in PROGRAM_SECTIONS[program_type]:
+            if key not in section_keys:
+                section_keys.append(key)
+    return section_keys
+
+
+def get_source_sections(section_keys: List[str]) -> Dict[str, List[str]]:
+    """Group section keys by the source they are crawled from (one poll per source)"""
+    sources: Dict[str, List[str]] = {}
+    for key in section_keys:
+        if key.startswith("standard_") or key == "clc":
+            source = "main_feed"
+        else:
+            source = key
+        sources.setdefault(source, []).append(key)
+    return sources
 
 
 class NewsCrawler:
-
     def __init__(self, program_type: ProgramType = ProgramType.APCS):
         self.logger = setup_logging()
-        self.session = create_session()
-        self.report_errors = []
+        # Đo thời gian/counter theo từng giai đoạn (fetch, parse, lọc, ghi báo cáo)
+        self.metrics = RunMetrics()
+        self._client: Optional["HttpClient"] = None
+        self._client_lock = threading.Lock()
+        self.report_errors: List[str] = []
         self.program_type = program_type
-        # Update config program type
-        config.program_type = program_type
+        # Cache feed theo URL trong một lượt crawl
+        self._feed_cache: Dict[str, Optional[List[NewsItem]]] = {}
+        self._feed_locks: Dict[str, threading.Lock] = {}
+        self._feed_locks_guard = threading.Lock()
+        self._feed_matches: Dict[str, List[FrozenSet[str]]] = {}
+        # Hạn chót (time.monotonic) của lượt crawl mà thread worker hiện tại đang chạy
+        self._run = threading.local()
+        # Một matcher cho mọi bộ keyword, mỗi item chỉ quét một lần
+        keyword_sets = {f"standard_{key}": kws for key, kws in config.standard_keywords.items()}
+        keyword_sets["clc"] = config.clc_keywords
+        self.keyword_matcher = KeywordMatcher(
+            keyword_sets,
+            boundary_max_length=config.keyword_boundary_max_length,
+            fold=config.keyword_fold_diacritics,
+        )
+        # ETag/Last-Modified và item đã parse được giữ lại giữa các lượt chạy
+        self.validators = (
+            ValidatorStore(os.path.join(config.state_dir, config.validator_file), self.logger)
+            # Khi ghi fixture cần body đầy đủ, không dùng 304
+            if config.conditional_requests and not config.record_dir
+            else None
+        )
+        self.item_store = self._open_item_store() if config.item_store else None
+        # Toàn văn bài viết cho bộ lọc keyword (tùy chọn)
+        self.articles = self._open_articles() if config.fetch_articles else None
+        # Parse trong process pool khi crawl nhiều trang (CPU-bound, không bị GIL giới hạn)
+        self.parse_pool = self._open_parse_pool() if config.parse_processes > 0 else None
+        # Lịch sử thay đổi của từng nguồn, dùng cho --due-only và daemon
+        self.schedule = PollSchedule(
+            os.path.join(config.state_dir, config.schedule_file), self.logger
+        )
+        self.skipped_sources: List[str] = []
+        self._stored_urls: Set[str] = set()
+        self.new_item_count = 0
+
+    @property
+    def client(self) -> "HttpClient":
+        """Shared HTTP client, created on first use"""
+        with self._client_lock:
+            if self._client is None:
+                from .client import HttpClient
+
+                self._client = HttpClient(metrics=self.metrics)
+            return self._client
+
+    @property
+    def session(self) -> "requests.Session":
+        return self.client.session
+
+    def close(self) -> None:
+        """Close the HTTP client if one was created, and stop the parse processes"""
+        with self._client_lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+
+    def _open_parse_pool(self) -> "ParsePool":
+        from .parsepool import ParsePool
+
+        return ParsePool(config.parse_processes, config.parse_queue_size or None)
+
+    def submit_parse(
+        self,
+        kind: str,
+        content: bytes,
+        previous: Optional[List[NewsItem]] = None,
+        timeout: Optional[float] = None,
+    ) -> "Future[List[NewsItem]]":
+        """Parse a page body in the parse pool, or right away in this thread without one
+
+        timeout bounds the wait for a free slot in the parse pool (ParsePool.submit).
+        """
+        if self.parse_pool is not None:
+            return self.parse_pool.submit(kind, content, previous, timeout)
+
+        from .parsepool import parse_page
+
+        future: Future = Future()
+        try:
+            future.set_result(parse_page(kind, content, previous))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _open_articles(self) -> "ArticleFetcher":
+        from .articles import ArticleCache, ArticleFetcher
+
+        cache = ArticleCache(
+            os.path.join(config.state_dir, config.article_cache_dir),
+            config.article_cache_max_bytes,
+            self.logger,
+        )
+        return ArticleFetcher(self.client, cache, self.logger)
+
+    def _open_item_store(self) -> Optional[ItemStore]:
+        try:
+            return ItemStore(os.path.join(config.state_dir, config.item_store_file), self.logger)
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"Item store disabled: {str(e)}")
+            return None
 
     def crawl_ctda(self) -> NewsSection:
         try:
-            page = requests.get(config.ctda_url, headers=config.headers, timeout=config.timeout)
-            soup = bs(page.content, features="lxml")
-            sections = soup.find_all(class_="display-posts-listing")[:4]
-
-            all_items = []
-            for i, section in enumerate(sections):
-                if i >= len(config.ctda_section_titles):
-                    break
-
-                try:
-                    news_elements = section.find_all(class_="listing-item")
-                    for element in news_elements:
-                        try:
-                            link_element = element.contents[0]
-                            title = clean_text(link_element.text)
-                            url = link_element.attrs.get("href", "")
-                            date = (
-                                clean_text(element.contents[-1].text)
-                                if len(element.contents) > 1
-                                else ""
-                            )
-
-                            if title and url:
-                                all_items.append(
-                                    NewsItem(
-                                        title=title,
-                                        url=url,
-                                        date=date,
-                                        category=config.ctda_section_titles[i],
-                                    )
-                                )
-                        except (IndexError, KeyError, AttributeError):
-                            continue
-                except Exception:
-                    continue
-
-            return NewsSection("APCS", all_items)
+            items = self._fetch_items(config.ctda_url, "ctda")
+
+            if items is None:
+                return NewsSection("APCS", [], "Failed to load APCS news")
+
+            return NewsSection("APCS", items)
 
         except Exception as e:
             self.logger.warning(f"Error crawling CTDA: {str(e)}")
@@ -67,26 +192,10 @@ class NewsCrawler:
 
     def crawl_fit(self) -> NewsSection:
         try:
-            page = requests.get(config.fit_url, headers=config.headers, timeout=config.timeout)
-            soup = bs(page.content, features="lxml")
-            news_raw = soup.select("#dnn_ctr989_ModuleContent > table")
-
-            items = []
-            for news in news_raw:
-                try:
-                    day = news.select_one("tr:first-child > .day_month").text.strip()
-                    month = news.select_one("tr:last-child > .day_month").text.strip()
-                    year = news.select_one(".post_year").text.strip()
-                    title = news.select_one("a").text.strip()
-                    href = news.select_one("a").attrs["href"]
-
-                    if title and href:
-                        full_url = f"https://www.fit.hcmus.edu.vn/vn/{href}"
-                        date = f"{day}-{month}-{year}"
-                        items.append(NewsItem(title=title, url=full_url, date=date))
-
-                except (AttributeError, KeyError):
-                    continue
+            items = self._fetch_items(config.fit_url, "fit")
+
+            if items is None:
+                return NewsSection("FIT", [], "Failed to load FIT news")
 
             return NewsSection("FIT", items)
 
@@ -96,70 +205,23 @@ class NewsCrawler:
 
     def crawl_hcmus(self) -> NewsSection:
         try:
-            page = safe_request(self.session, config.hcmus_url, self.logger)
+            items = self._fetch_feed(config.hcmus_url)
 
-            if not page:
+            if items is None:
                 return NewsSection("Student Information", [], "Failed to load HCMUS news")
 
-            soup = bs(page.content, features="xml")
-            items_elements = soup.find_all("item")
-
-            items = []
-            for item_element in items_elements:
-                try:
-                    title_element = item_element.find("title")
-                    link_element = item_element.find("link")
-                    pub_date_element = item_element.find("pubDate")
-
-                    if not all([title_element, link_element, pub_date_element]):
-                        continue
-
-                    title = clean_text(title_element.text)
-                    link = clean_text(link_element.text)
-                    pub_date = clean_text(pub_date_element.text)
-
-                    if title and link and pub_date:
-                        try:
-                            date_obj = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %z")
-                            formatted_date = date_obj.strftime("%d/%m/%Y")
-                        except ValueError:
-                            formatted_date = pub_date
-
-                        items.append(NewsItem(title=title, url=link, date=formatted_date))
-
-                except (AttributeError, ValueError):
-                    continue
-
-            return NewsSection("Student Information", items)
+            return NewsSection("Student Information", list(items))
 
         except Exception as e:
             return NewsSection("Student Information", [], f"Error loading HCMUS news: {str(e)}")
 
     def crawl_old_hcmus(self) -> NewsSection:
         try:
-            page = requests.get(
-                config.old_hcmus_url, headers=config.headers, timeout=config.timeout
-            )
-            soup = bs(page.content, features="lxml")
-
-            ctkt_elements = soup.find_all(class_="feed-link")
-            items = []
-            rule_position = [5, 10, 13]
-
-            for i, news_element in enumerate(ctkt_elements):
-                try:
-                    title_text = re.sub(r"(\t|\n)", "", news_element.text)
-                    title = title_text.strip()
-
-                    link_match = re.findall('http.*" ', str(news_element))
-                    link = link_match[0][:-2] if link_match else ""  # [:-2] để loại bỏ '" '
-
-                    if title and link:
-                        category = "Important" if i in rule_position else None
-                        items.append(NewsItem(title=title, url=link, date="", category=category))
+            # Category theo vị trí trên trang nên luôn parse toàn bộ
+            items = self._fetch_items(config.old_hcmus_url, "old_hcmus", incremental=False)
 
-                except (AttributeError, TypeError, IndexError):
-                    continue
+            if items is None:
+                return NewsSection("Exam Announcements", [], "Failed to load exam announcements")
 
             return NewsSection("Exam Announcements", items)
 
@@ -169,58 +231,115 @@ class NewsCrawler:
                 "Exam Announcements", [], f"Error loading exam announcements: {str(e)}"
             )
 
+    def _fetch_items(
+        self, url: str, kind: str, incremental: bool = True
+    ) -> Optional[List[NewsItem]]:
+        """Conditionally fetch url and parse it as kind, reusing stored items when unchanged
+
+        With incremental, the parser stops at the newest previously stored item and merges
+        the new items in front of the stored ones.
+        """
+        # Nguồn chưa đến hạn poll (--due-only): dùng item đã lưu, không gửi request
+        if url in self._stored_urls and self.validators is not None:
+            stored_items = self.validators.stored_items(url)
+            if stored_items is not None:
+                return stored_items
+
+        headers = self.validators.request_headers(url) if self.validators is not None else None
+        page = safe_request(
+            self.client, url, self.logger, headers=headers, deadline=self._deadline()
+        )
+        if not page or self._past_deadline():
+            return None
+
+        fetch = self.metrics.fetch(url)
+        if self.validators is not None:
+            # 304 hoặc nội dung không đổi: dùng lại item đã parse lần trước
+            cached_items = self.validators.lookup(url, page)
+            if cached_items is not None:
+                self.logger.debug(f"Unchanged, reusing {len(cached_items)} parsed items: {url}")
+                fetch.cached = True
+                fetch.items_parsed = len(cached_items)
+                return cached_items
+
+        previous = None
+        if incremental and config.incremental_parse and self.validators is not None:
+            previous = self.validators.previous_items(url, config.incremental_full_parse_every)
+
+        # Với parse pool, thời gian parse gồm cả thời gian chờ trong hàng đợi
+        start = time.perf_counter()
+        try:
+            future = self.submit_parse(kind, page.content, previous, self._time_left())
+            items = future.result(self._time_left())
+        except FutureTimeoutError:
+            from .ratelimit import DeadlineExceededError
+
+            raise DeadlineExceededError(f"Run deadline reached while parsing {url}") from None
+        fetch.parse_seconds = time.perf_counter() - start
+        fetch.items_parsed = len(items)
+        fetch.incremental = bool(previous)
+
+        # Lượt chạy đã kết thúc (và đã lưu validator): kết quả trễ không được ghi vào đâu
+        if self._past_deadline():
+            return None
+        if self.validators is not None:
+            self.validators.update(url, page, items, partial=bool(previous))
+        return items
+
+    def _feed_lock(self, url: str) -> threading.Lock:
+        with self._feed_locks_guard:
+            return self._feed_locks.setdefault(url, threading.Lock())
+
+    def _fetch_feed(self, url: str) -> Optional[List[NewsItem]]:
+        """Download and parse a feed once per run; later calls reuse the parsed items"""
+        # Các section cùng feed chờ nhau thay vì tải lại song song
+        with self._feed_lock(url):
+            if url not in self._feed_cache:
+                items = self._fetch_items(url, "feed")
+                if self._past_deadline():
+                    return None
+                self._feed_cache[url] = items
+            return self._feed_cache[url]
+
+    def _classify_feed(self, url: str) -> List[FrozenSet[str]]:
+        """Keyword sections matched by each item of a cached feed, computed once per run"""
+        feed_items = self._fetch_feed(url) or []
+        with self._feed_lock(url):
+            if url not in self._feed_matches:
+                # Có toàn văn thì lọc trên nội dung bài, không thì trên mô tả RSS
+                texts = (
+                    self.articles.texts((item.url for item in feed_items), self._deadline())
+                    if self.articles is not None
+                    else {}
+                )
+                matches = [
+                    self.keyword_matcher.match(
+                        f"{item.title} {texts.get(item.url, item.description)}"
+                    )
+                    for item in feed_items
+                ]
+                if self._past_deadline():
+                    return matches
+                self._feed_matches[url] = matches
+            return self._feed_matches[url]
+
     def _crawl_rss_feed(
-        self, url: str, section_title: str, keywords: List[str] = None
+        self, url: str, section_title: str, section_key: Optional[str] = None
     ) -> NewsSection:
-        """Generic method to crawl RSS feeds with optional keyword filtering"""
+        """Generic method to crawl RSS feeds, keeping items that match the section keywords"""
         try:
-            page = safe_request(self.session, url, self.logger)
+            feed_items = self._fetch_feed(url)
 
-            if not page:
+            if feed_items is None:
                 return NewsSection(section_title, [], f"Failed to load {section_title}")
 
-            soup = bs(page.content, features="xml")
-            items_elements = soup.find_all("item")
-
-            items = []
-            for item_element in items_elements:
-                try:
-                    title_element = item_element.find("title")
-                    link_element = item_element.find("link")
-                    pub_date_element = item_element.find("pubDate")
-                    description_element = item_element.find("description")
-
-                    if not all([title_element, link_element, pub_date_element]):
-                        continue
-
-                    title = clean_text(title_element.text)
-                    link = clean_text(link_element.text)
-                    pub_date = clean_text(pub_date_element.text)
-                    description = (
-                        clean_text(description_element.text) if description_element else ""
-                    )
-
-                    # Cải thiện keyword filtering cho Khoa CNTT
-                    if keywords:
-                        content_to_check = f"{title} {description}".lower()
-                        # Kiểm tra xem có chứa bất kỳ keyword nào không
-                        has_keyword = any(
-                            keyword.lower() in content_to_check for keyword in keywords
-                        )
-                        if not has_keyword:
-                            continue
-
-                    if title and link and pub_date:
-                        try:
-                            date_obj = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %z")
-                            formatted_date = date_obj.strftime("%d/%m/%Y")
-                        except ValueError:
-                            formatted_date = pub_date
+            if not section_key:
+                return NewsSection(section_title, list(feed_items))
 
-                        items.append(NewsItem(title=title, url=link, date=formatted_date))
-
-                except (AttributeError, ValueError):
-                    continue
+            # Cải thiện keyword filtering cho Khoa CNTT
+            matches = self._classify_feed(url)
+            items = [item for item, keys in zip(feed_items, matches) if section_key in keys]
+            self.metrics.section(section_title).items_parsed = len(feed_items)
 
             return NewsSection(section_title, items)
 
@@ -232,7 +351,7 @@ class NewsCrawler:
         return self._crawl_rss_feed(
             config.main_feed_url,
             config.standard_section_titles["course_info"],
-            config.standard_keywords["course_info"],
+            "standard_course_info",
         )
 
     def crawl_standard_talented_bachelor(self) -> NewsSection:
@@ -240,7 +359,7 @@ class NewsCrawler:
         return self._crawl_rss_feed(
             config.main_feed_url,
             config.standard_section_titles["talented_bachelor"],
-            config.standard_keywords["talented_bachelor"],
+            "standard_talented_bachelor",
         )
 
     def crawl_standard_ai(self) -> NewsSection:
@@ -248,7 +367,7 @@ class NewsCrawler:
         return self._crawl_rss_feed(
             config.main_feed_url,
             config.standard_section_titles["ai"],
-            config.standard_keywords["ai"],
+            "standard_ai",
         )
 
     def crawl_standard_course_chain(self) -> NewsSection:
@@ -256,65 +375,310 @@ class NewsCrawler:
         return self._crawl_rss_feed(
             config.main_feed_url,
             config.standard_section_titles["course_chain"],
-            config.standard_keywords["course_chain"],
+            "standard_course_chain",
         )
 
     def crawl_clc(self) -> NewsSection:
         """Crawl chương trình chất lượng cao (CLC)"""
-        return self._crawl_rss_feed(
-            config.main_feed_url, "Chất lượng cao (CLC)", config.clc_keywords
+        return self._crawl_rss_feed(config.main_feed_url, "Chất lượng cao (CLC)", "clc")
+
+    def _get_section_crawlers(self) -> Dict[str, Tuple[str, Callable[[], NewsSection]]]:
+        """Return section key -> (section title, crawl method) for every known section"""
+        titles = config.standard_section_titles
+        return {
+            "ctda": ("APCS", self.crawl_ctda),
+            "fit": ("FIT", self.crawl_fit),
+            "hcmus": ("Student Information", self.crawl_hcmus),
+            "old_hcmus": ("Exam Announcements", self.crawl_old_hcmus),
+            "standard_course_info": (titles["course_info"], self.crawl_standard_course_info),
+            "standard_talented_bachelor": (
+                titles["talented_bachelor"],
+                self.crawl_standard_talented_bachelor,
+            ),
+            "standard_ai": (titles["ai"], self.crawl_standard_ai),
+            "standard_course_chain": (titles["course_chain"], self.crawl_standard_course_chain),
+            "clc": ("Chất lượng cao (CLC)", self.crawl_clc),
+        }
+
+    def _get_section_sources(self) -> Dict[str, str]:
+        """Return section key -> URL the section is crawled from"""
+        sources = {
+            "ctda": config.ctda_url,
+            "fit": config.fit_url,
+            "hcmus": config.hcmus_url,
+            "old_hcmus": config.old_hcmus_url,
+            "clc": config.main_feed_url,
+        }
+        for key in config.standard_keywords:
+            sources[f"standard_{key}"] = config.main_feed_url
+        return sources
+
+    def record_items(self, sections_by_key: Dict[str, NewsSection], seen_at: datetime) -> None:
+        """Write the items of this run to the item store in one transaction"""
+        if self.item_store is None:
+            return
+
+        sources = self._get_section_sources()
+        try:
+            self.new_item_count = self.item_store.record(
+                [(key, sources[key], section) for key, section in sections_by_key.items()],
+                seen_at,
+            )
+            self.logger.info(f"Item store: {self.new_item_count} new item(s)")
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to update item store: {str(e)}")
+
+    def _run_section_crawlers(
+        self, crawlers: List[Tuple[str, Callable[[], NewsSection]]]
+    ) -> List[NewsSection]:
+        """Run section crawlers concurrently, keeping report order and the run deadline"""
+        if not crawlers:
+            return []
+
+        # Mỗi request của worker chỉ được dùng phần thời gian còn lại tới hạn chót, nên các
+        # worker trễ cũng dừng ngay sau hạn chót thay vì giữ process lại
+        deadline = time.monotonic() + config.run_deadline
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, config.max_workers), thread_name_prefix="crawler"
         )
+        futures = [
+            executor.submit(self._timed_crawl, title, crawl, deadline) for title, crawl in crawlers
+        ]
+        done, _ = wait(futures, timeout=config.run_deadline)
+        # Không chờ các nguồn chậm: báo cáo kết thúc đúng hạn chót
+        executor.shutdown(wait=False, cancel_futures=True)
 
-    def generate_report(self) -> CrawlerReport:
-        """Generate report based on program type"""
         sections = []
+        for (title, _), future in zip(crawlers, futures):
+            section_metrics = self.metrics.section(title)
+            if future not in done:
+                self.logger.warning(f"Timed out crawling {title}")
+                sections.append(
+                    NewsSection(
+                        title, [], f"Timed out after {config.run_deadline:g}s loading {title}"
+                    )
+                )
+                section_metrics.seconds = config.run_deadline
+            elif future.exception() is not None:
+                error = future.exception()
+                self.logger.warning(f"Error crawling {title}: {str(error)}")
+                sections.append(NewsSection(title, [], f"Error loading {title}: {str(error)}"))
+            else:
+                sections.append(future.result())
+
+            section_metrics.items_kept = len(sections[-1].items)
+            section_metrics.error = sections[-1].error_message
+
+        return sections
+
+    def _timed_crawl(
+        self, title: str, crawl: Callable[[], NewsSection], deadline: float
+    ) -> NewsSection:
+        self._run.deadline = deadline
+        start = time.perf_counter()
+        try:
+            return crawl()
+        finally:
+            if not self._past_deadline():
+                self.metrics.section(title).seconds = time.perf_counter() - start
+            self._run.deadline = None
+
+    def _deadline(self) -> Optional[float]:
+        """Deadline of the crawl run of the current worker thread, None outside a run"""
+        return getattr(self._run, "deadline", None)
+
+    def _past_deadline(self) -> bool:
+        deadline = self._deadline()
+        return deadline is not None and time.monotonic() >= deadline
+
+    def _time_left(self) -> Optional[float]:
+        """Seconds left before the run deadline of this worker thread, None outside a run"""
+        deadline = self._deadline()
+        return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+    def crawl_sections(self, section_keys: List[str]) -> Dict[str, NewsSection]:
+        """Crawl the given sections concurrently, refetching the feeds they are built from"""
+        sources = self._get_section_sources()
+        for key in section_keys:
+            self._feed_cache.pop(sources[key], None)
+            self._feed_matches.pop(sources[key], None)
+
+        section_crawlers = self._get_section_crawlers()
+        crawled = self._run_section_crawlers([section_crawlers[key] for key in section_keys])
+        sections_by_key = dict(zip(section_keys, crawled))
+
+        if self.validators is not None:
+            self.validators.save()
+        if self.articles is not None:
+            self.articles.cache.save()
+        self._observe_sources(sections_by_key)
+
+        return sections_by_key
+
+    def _observe_sources(self, sections_by_key: Dict[str, NewsSection]) -> None:
+        """Record in the poll schedule whether each polled source changed"""
+        sources = self._get_section_sources()
+        for source, keys in get_source_sections(list(sections_by_key)).items():
+            sections = [sections_by_key[key] for key in keys]
+            # Bỏ qua nguồn lỗi và nguồn chỉ đọc lại từ bộ nhớ đệm
+            if any(section.has_errors() for section in sections):
+                continue
+            if all(sources[key] in self._stored_urls for key in keys):
+                continue
+            if self.schedule.observe(source, sections_digest(sections)):
+                self.logger.debug(f"Source {source} changed")
+        self.schedule.save()
+
+    def build_reports(
+        self,
+        sections_by_key: Dict[str, NewsSection],
+        program_types: List[ProgramType],
+        timestamp: datetime,
+    ) -> Dict[ProgramType, CrawlerReport]:
+        """Assemble the report of each program from already crawled sections"""
+        reports = {}
+        sources = self._get_section_sources()
+        for program_type in program_types:
+            keys = PROGRAM_SECTIONS[program_type]
+            sections = [sections_by_key[key] for key in keys]
+
+            section_errors = []
+            for section in sections:
+                if section.has_errors():
+                    section_errors.append(f"{section.title}: {section.error_message}")
+
+            duplicates: Duplicates = {}
+            if config.report_dedup:
+                sections, duplicates = collapse_duplicates(
+                    sections,
+                    threshold=config.dedup_threshold,
+                    shingle_size=config.dedup_shingle_size,
+                    bands=config.dedup_bands,
+                    rows=config.dedup_rows,
+                    sources=[sources[key] for key in keys],
+                )
+
+            reports[program_type] = CrawlerReport(
+                sections=sections,
+                timestamp=timestamp,
+                errors=section_errors + self.report_errors,
+                duplicates=duplicates,
+            )
 
-        if self.program_type == ProgramType.APCS:
-            # APCS sections
-            sections = [
-                self.crawl_ctda(),
-                self.crawl_fit(),
-                self.crawl_hcmus(),
-                self.crawl_old_hcmus(),
-            ]
-        elif self.program_type == ProgramType.STANDARD:
-            # Standard program sections
-            sections = [
-                self.crawl_standard_course_info(),
-                self.crawl_standard_talented_bachelor(),
-                self.crawl_standard_ai(),
-                self.crawl_standard_course_chain(),
-                self.crawl_hcmus(),  # General student info
-                self.crawl_old_hcmus(),  # Exam announcements
-            ]
-        elif self.program_type == ProgramType.CLC:
-            # CLC sections
-            sections = [
-                self.crawl_clc(),
-                self.crawl_hcmus(),  # General student info
-                self.crawl_old_hcmus(),  # Exam announcements
-            ]
+        return reports
+
+    def generate_reports(
+        self, program_types: List[ProgramType], due_only: bool = False
+    ) -> Dict[ProgramType, CrawlerReport]:
+        """Generate reports for several programs, crawling each shared section only once
+
+        With due_only, sources whose recommended next poll is still ahead are not requested;
+        their sections are rebuilt from the items stored by the previous run.
+        """
+        self._feed_cache.clear()
+        self._feed_matches.clear()
+        if self._client is not None:
+            self._client.reset_stats()
+        self.metrics.reset()
+        self.new_item_count = 0
+
+        section_keys = get_section_keys(program_types)
+        self.skipped_sources = []
+        self._stored_urls = set()
+        if due_only:
+            source_sections = get_source_sections(section_keys)
+            due = self.schedule.due_sources(list(source_sections))
+            self.skipped_sources = [source for source in source_sections if source not in due]
+
+            sources = self._get_section_sources()
+            due_urls = {sources[key] for source in due for key in source_sections[source]}
+            self._stored_urls = {
+                sources[key] for source in self.skipped_sources for key in source_sections[source]
+            } - due_urls
+            if self.skipped_sources:
+                self.logger.info(f"Not due, using stored items: {', '.join(self.skipped_sources)}")
+
+        try:
+            sections_by_key = self.crawl_sections(section_keys)
+        finally:
+            self._stored_urls = set()
 
         timestamp = datetime.now(tz=ZoneInfo(config.timezone))
+        self.record_items(sections_by_key, timestamp)
 
-        section_errors = []
-        for section in sections:
-            if section.has_errors():
-                section_errors.append(f"{section.title}: {section.error_message}")
+        return self.build_reports(sections_by_key, program_types, timestamp)
 
-        report = CrawlerReport(
-            sections=sections, timestamp=timestamp, errors=section_errors + self.report_errors
-        )
+    def generate_report(self) -> CrawlerReport:
+        """Generate report based on program type"""
+        return self.generate_reports([self.program_type])[self.program_type]
+
+    def get_run_stats(self) -> Dict[str, Any]:
+        """Transfer counters per host, new item count and sources skipped by --due-only"""
+        return {
+            "hosts": self._client.get_stats() if self._client is not None else {},
+            "new_items": self.new_item_count,
+            "skipped_sources": list(self.skipped_sources),
+        }
 
-        return report
+    def write_metrics(self) -> dict:
+        """Write the JSON run summary (and Prometheus metrics if configured), returning it"""
+        self.metrics.finish()
+        summary = {**self.get_run_stats(), **self.metrics.to_dict()}
 
-    def save_report(self, report: CrawlerReport) -> bool:
         try:
-            output_filename = config.get_output_filename()
-            with open(output_filename, "w", encoding="utf-8") as f:
-                f.write(report.to_markdown())
-            self.logger.info(f"Report saved to {output_filename}")
-            return True
-        except IOError as e:
+            os.makedirs(config.state_dir, exist_ok=True)
+            metrics_filename = os.path.join(config.state_dir, config.metrics_file)
+            tmp_filename = f"{metrics_filename}.tmp"
+            with open(tmp_filename, "w", encoding="utf-8") as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            # Daemon ghi lại sau mỗi lượt poll: người đọc không bao giờ thấy JSON viết dở
+            os.replace(tmp_filename, metrics_filename)
+            if config.prometheus_file:
+                tmp_filename = f"{config.prometheus_file}.tmp"
+                with open(tmp_filename, "w", encoding="utf-8") as f:
+                    f.write(to_prometheus(summary))
+                # node_exporter textfile collector không được đọc file viết dở
+                os.replace(tmp_filename, config.prometheus_file)
+        except OSError as e:
+            self.logger.warning(f"Failed to write run metrics: {str(e)}")
+
+        return summary
+
+    def save_report(
+        self, report: CrawlerReport, program_type: Optional[ProgramType] = None
+    ) -> SaveStatus:
+        """Write the markdown report and config.output_formats next to it, atomically
+
+        Every file comes from one traversal of the report and is only replaced when its own
+        content changed (not just its timestamp). Returns WRITTEN when any file was written.
+        """
+        from .emitters import write_formats
+
+        program_type = program_type or self.program_type
+        start = time.perf_counter()
+        output_filename = config.get_output_filename(program_type)
+        formats = ["markdown"] + [fmt for fmt in config.output_formats if fmt != "markdown"]
+        try:
+            statuses = write_formats(
+                report,
+                program_type.value,
+                formats,
+                output_filename,
+                config.report_max_items_per_section,
+            )
+            written = [name for name, status in statuses.items() if status is SaveStatus.WRITTEN]
+            unchanged = [name for name in statuses if name not in written]
+            if unchanged:
+                self.logger.info(f"Report unchanged, skipped writing {', '.join(unchanged)}")
+            if written:
+                self.logger.info(f"Report saved to {', '.join(written)}")
+            status = SaveStatus.WRITTEN if written else SaveStatus.UNCHANGED
+        except OSError as e:
             self.logger.error(f"Failed to save report: {str(e)}")
-            return False
+            status = SaveStatus.FAILED
+
+        report_metrics = self.metrics.report(program_type.value)
+        report_metrics.status = status.value
+        report_metrics.render_write_seconds = time.perf_counter() - start
+        report_metrics.items = report.get_total_items()
+        return status
@@ -0,0 +1,145 @@
+import heapq
+import random
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from .config import config, ProgramType
+from .crawler import NewsCrawler, PROGRAM_SECTIONS, get_section_keys, get_source_sections
+from .models import NewsSection, SaveStatus
+
+
+class CrawlerDaemon:
+    """Keep one crawler alive and poll every source on its own interval
+
+    Connections, validators and the last sections of every source stay warm across polls.
+    A source that fails is retried with exponential back-off and keeps its last good
+    sections; only the reports that contain a changed section are rebuilt and saved.
+    """
+
+    def __init__(self, crawler: NewsCrawler, program_types: List[ProgramType]):
+        self.crawler = crawler
+        self.logger = crawler.logger
+        self.program_types = program_types
+        self.source_sections = get_source_sections(get_section_keys(program_types))
+
+        self.sections: Dict[str, NewsSection] = {}
+        self.failures: Dict[str, int] = {source: 0 for source in self.source_sections}
+        self._schedule: List[Tuple[float, str]] = []
+        self._stop = threading.Event()
+
+    def stop(self, *_: object) -> None:
+        """Ask the loop to finish after the current poll (usable as a signal handler)"""
+        self._stop.set()
+
+    def _next_delay(self, source: str) -> float:
+        interval = config.poll_intervals.get(source, 1800)
+        failures = self.failures[source]
+        if failures:
+            interval = min(interval * 2**failures, config.poll_max_backoff)
+        else:
+            # Chu kỳ thích ứng theo tốc độ thay đổi đã quan sát của nguồn
+            next_poll = self.crawler.schedule.next_poll(source)
+            if next_poll is not None:
+                interval = max(next_poll - time.time(), interval)
+        # Jitter để các nguồn không dồn vào cùng một thời điểm
+        return interval * (1 + random.uniform(-config.poll_jitter, config.poll_jitter))
+
+    def poll(self, sources: List[str]) -> List[str]:
+        """Crawl the sections of sources, returning the keys of sections that changed"""
+        section_keys = [key for source in sources for key in self.source_sections[source]]
+        crawled = self.crawler.crawl_sections(section_keys)
+
+        changed = []
+        for source in sources:
+            keys = self.source_sections[source]
+            failed = any(crawled[key].has_errors() for key in keys)
+            self.failures[source] = self.failures[source] + 1 if failed else 0
+
+            for key in keys:
+                section = crawled[key]
+                # Lỗi tạm thời: giữ section tốt gần nhất thay vì ghi lỗi vào báo cáo
+                if section.has_errors() and key in self.sections:
+                    previous = self.sections[key]
+                    if not previous.has_errors():
+                        continue
+                if self.sections.get(key) != section:
+                    self.sections[key] = section
+                    changed.append(key)
+
+            if failed:
+                self.logger.warning(
+                    f"Source {source} failed {self.failures[source]} time(s) in a row"
+                )
+
+        return changed
+
+    def save_changed(self, changed: List[str]) -> Dict[ProgramType, SaveStatus]:
+        """Rebuild and save only the reports that contain a changed section"""
+        affected = [
+            program_type
+            for program_type in self.program_types
+            if set(PROGRAM_SECTIONS[program_type]) & set(changed)
+        ]
+        if not affected:
+            return {}
+
+        timestamp = datetime.now(tz=ZoneInfo(config.timezone))
+        self.crawler.record_items({key: self.sections[key] for key in changed}, timestamp)
+        reports = self.crawler.build_reports(self.sections, affected, timestamp)
+        return {
+            program_type: self.crawler.save_report(report, program_type)
+            for program_type, report in reports.items()
+        }
+
+    def _poll_and_save(self, sources: List[str]) -> None:
+        self.crawler.metrics.reset()
+        changed = self.poll(sources)
+        if changed:
+            self.save_changed(changed)
+        else:
+            self.logger.info(f"No changes from {', '.join(sources)}")
+        self.crawler.write_metrics()
+
+    def run(self, max_polls: Optional[int] = None) -> None:
+        """Poll until stop() is called (or max_polls polls have run), then flush state"""
+        self.logger.info(f"Daemon started for {', '.join(self.source_sections)}")
+        try:
+            # Lượt đầu crawl mọi nguồn một lần rồi mới lập lịch riêng
+            sources = list(self.source_sections)
+            self._poll_and_save(sources)
+            now = time.monotonic()
+            for source in sources:
+                heapq.heappush(self._schedule, (now + self._next_delay(source), source))
+
+            polls = 1
+            while not self._stop.is_set() and (max_polls is None or polls < max_polls):
+                due_at, _ = self._schedule[0]
+                if self._stop.wait(max(0.0, due_at - time.monotonic())):
+                    break
+
+                # Gom mọi nguồn đã đến hạn vào một lượt poll song song
+                now = time.monotonic()
+                due = []
+                while self._schedule and self._schedule[0][0] <= now:
+                    due.append(heapq.heappop(self._schedule)[1])
+
+                self._poll_and_save(due)
+                polls += 1
+
+                now = time.monotonic()
+                for source in due:
+                    heapq.heappush(self._schedule, (now + self._next_delay(source), source))
+        finally:
+            self.flush()
+
+    def flush(self) -> None:
+        """Persist validators and the item store before exiting"""
+        if self.crawler.validators is not None:
+            self.crawler.validators.save()
+        if self.crawler.item_store is not None:
+            self.crawler.item_store.close()
+        self.crawler.close()
+        self.logger.info("Daemon stopped, state flushed")
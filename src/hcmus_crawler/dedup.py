@@ -0,0 +1,280 @@
+"""Near-duplicate titles: character shingles, MinHash signatures and LSH banding
+
+The same announcement is often reposted on several sources (FIT, the HCMUS main feed, the
+student feed) with a slightly different title: a "[CTĐA]" prefix, other punctuation,
+missing diacritics. Titles are normalized, cut into character shingles and summarized by a
+MinHash signature; titles whose signatures agree on a whole band of rows land in the same
+bucket and become candidate pairs. Only candidates are compared exactly (Jaccard similarity
+of the shingle sets), so clustering n titles costs O(n) hashing plus the candidates instead
+of n² comparisons.
+
+Similar titles with different numbers are different announcements ("lịch thi HK1" and
+"lịch thi HK2", "tuyển cộng tác viên đợt 36" and "đợt 39"), so the numbers of two titles
+must be equal before their shingles are compared.
+"""
+
+import re
+from array import array
+import zlib
+from datetime import date
+from functools import lru_cache
+from typing import AbstractSet, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence
+from typing import Set, Tuple
+
+from .matcher import fold_diacritics
+from .models import NewsItem, NewsSection
+
+# "[CTĐA] ...", "(FIT) - ...", "【HCMUS】: ..." ở đầu tiêu đề
+_TAG_PREFIX = re.compile(r"^(?:\s*[\[(【][^\])】]{0,30}[\])】]\s*[-–:|]?)+")
+_NON_WORD = re.compile(r"[\W_]+")
+# Năm, học kỳ, đợt, mã lớp ("2024", "hk1", "22ctt1") và số La Mã "học kỳ I/II" trong tiêu đề
+# đã chuẩn hóa
+_NUMBER_TOKEN = re.compile(r"\b(?:[a-z]*\d\w*|i{1,3}|iv)\b")
+
+_HASH_MASK = 0xFFFFFFFF
+
+
+def normalize_title(title: str) -> str:
+    """Title without tag prefixes, diacritics, case and punctuation
+
+    "[CTĐA] Thông báo: Học bổng 2025!" -> "thong bao hoc bong 2025"
+    """
+    title = _TAG_PREFIX.sub("", title)
+    return _NON_WORD.sub(" ", fold_diacritics(title)).strip()
+
+
+def number_tokens(text: str) -> FrozenSet[str]:
+    """Tokens of a normalized title that hold a number
+
+    "ke hoach mo hoc phan nam hoc 2024 2025" -> {"2024", "2025"}
+    """
+    return frozenset(_NUMBER_TOKEN.findall(text))
+
+
+def shingle_hashes(text: str, size: int) -> FrozenSet[int]:
+    """CRC32 of every substring of size characters (the whole text when it is shorter)"""
+    data = text.encode("utf-8")
+    if len(data) <= size:
+        return frozenset([zlib.crc32(data)]) if data else frozenset()
+    crc32 = zlib.crc32
+    return frozenset([crc32(data[i : i + size]) for i in range(len(data) - size + 1)])
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+@lru_cache(maxsize=None)
+def _probe_orders(num_hashes: int) -> Tuple[Tuple[int, ...], ...]:
+    """For every bin, the other bins in a fixed pseudo-random order"""
+    orders = []
+    for index in range(num_hashes):
+        others = [other for other in range(num_hashes) if other != index]
+        others.sort(key=lambda other: zlib.crc32(b"%d:%d" % (index, other)))
+        orders.append(tuple(others))
+    return tuple(orders)
+
+
+def minhash_signature(hashes: Iterable[int], num_hashes: int) -> Tuple[int, ...]:
+    """One-permutation MinHash: the minimum hash of each of num_hashes bins of the hash space
+
+    Every shingle hash is used once (not once per hash function): its remainder picks the
+    bin. An empty bin takes the value of the first non-empty bin in its own probe order
+    (optimal densification): the orders are the same for every title, and each empty bin
+    borrows from a different place instead of copying one neighbour.
+    """
+    # Duyệt từ lớn đến nhỏ: giá trị cuối cùng ghi vào mỗi bin là giá trị nhỏ nhất
+    bins = {h % num_hashes: h for h in sorted(hashes, reverse=True)}
+    if len(bins) == num_hashes:
+        return tuple(map(bins.__getitem__, range(num_hashes)))
+    if not bins:
+        return (_HASH_MASK,) * num_hashes
+
+    probes = _probe_orders(num_hashes)
+    signature = []
+    for index in range(num_hashes):
+        source = index
+        if source not in bins:
+            source = next(other for other in probes[index] if other in bins)
+        signature.append(bins[source])
+    return tuple(signature)
+
+
+def find_clusters(
+    titles: Sequence[str],
+    threshold: float = 0.6,
+    shingle_size: int = 5,
+    bands: int = 10,
+    rows: int = 4,
+    groups: Optional[Sequence[AbstractSet[Hashable]]] = None,
+) -> List[List[int]]:
+    """Clusters of near-duplicate titles, as sorted lists of indexes into titles
+
+    Two titles are duplicates when they hold the same numbers and the Jaccard similarity of
+    their normalized shingle sets is at least threshold; clusters are the connected
+    components of that relation. With groups (the groups of each title), a cluster never
+    holds two titles of the same group. Only clusters with two titles or more are returned,
+    ordered by their first index. With
+    bands x rows hash bins, a pair of similarity s becomes a candidate with probability
+    1 - (1 - s^rows)^bands (about 0.75 at s = 0.6 and 0.98 at s = 0.8 for 10 x 4).
+    """
+    num_hashes = bands * rows
+    width = array("I").itemsize * rows  # số byte của một band trong chữ ký
+    normalized = [normalize_title(title) for title in titles]
+
+    # Khóa band là bytes (không bị GC theo dõi như tuple); bucket chỉ thành list khi có
+    # title thứ hai, còn lại chỉ giữ index đầu tiên
+    first_in_bucket: List[Dict[bytes, int]] = [{} for _ in range(bands)]
+    collisions: Dict[Tuple[int, int], List[int]] = {}
+    for index, text in enumerate(normalized):
+        if not text:
+            continue
+        signature = minhash_signature(shingle_hashes(text, shingle_size), num_hashes)
+        packed = array("I", signature).tobytes()
+        for band, bucket in enumerate(first_in_bucket):
+            first = bucket.setdefault(packed[band * width : (band + 1) * width], index)
+            if first != index:
+                collisions.setdefault((band, first), [first]).append(index)
+
+    parent = list(range(len(titles)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    # Nhóm của mỗi cụm, lưu tại gốc của cụm
+    cluster_groups: List[Set[Hashable]] = [set(group) for group in groups or ()]
+
+    def can_merge(a: int, b: int) -> bool:
+        return not cluster_groups or cluster_groups[a].isdisjoint(cluster_groups[b])
+
+    # Shingle set chỉ giữ cho các title là ứng viên, không phải cho cả n title
+    shingles: Dict[int, FrozenSet[int]] = {}
+    numbers: Dict[int, FrozenSet[str]] = {}
+    checked = set()
+
+    def similar(a: int, b: int) -> bool:
+        if normalized[a] == normalized[b]:
+            return True
+        for index in (a, b):
+            if index not in numbers:
+                numbers[index] = number_tokens(normalized[index])
+        if numbers[a] != numbers[b]:
+            return False
+        for index in (a, b):
+            if index not in shingles:
+                shingles[index] = shingle_hashes(normalized[index], shingle_size)
+        return jaccard(shingles[a], shingles[b]) >= threshold
+
+    for members in collisions.values():
+        # So mỗi title với một đại diện của từng cụm đã gặp trong bucket: bucket của một
+        # cụm lớn chỉ tốn số phần tử lần so sánh, không phải bình phương
+        roots: List[int] = []
+        for index in members:
+            merged = False
+            for other in roots:
+                other_root, root = find(other), find(index)
+                if other_root == root:
+                    merged = True
+                    continue
+                pair = (other, index)
+                if pair in checked or not can_merge(other_root, root):
+                    continue
+                checked.add(pair)
+                if similar(other, index):
+                    parent[other_root] = root
+                    if cluster_groups:
+                        cluster_groups[root] |= cluster_groups[other_root]
+                    merged = True
+            if not merged:
+                roots.append(index)
+
+    clusters: Dict[int, List[int]] = {}
+    for index in range(len(titles)):
+        root = find(index)
+        if root != index:
+            clusters.setdefault(root, [root]).append(index)
+    return sorted(sorted(members) for members in clusters.values())
+
+
+# URL của mục giữ lại -> (section, URL) của các bản đăng lại đã gộp vào mục đó
+Duplicates = Dict[str, List[Tuple[str, str]]]
+
+
+def collapse_duplicates(
+    sections: List[NewsSection],
+    threshold: float = 0.6,
+    shingle_size: int = 5,
+    bands: int = 10,
+    rows: int = 4,
+    sources: Optional[Sequence[Hashable]] = None,
+) -> Tuple[List[NewsSection], Duplicates]:
+    """Keep one item of each near-duplicate cluster across sources
+
+    sources gives the source each section is crawled from (by default every section is its
+    own source). Different items of one source are different announcements: only items of
+    different sources are clustered, while items with the same URL always belong to the
+    same cluster. The newest item of a cluster (the first in report order among equally
+    dated ones) is kept in its section; the others are removed from theirs and listed, with
+    their section title, under the URL of the kept item. The given sections are not
+    modified (they are shared between the reports of several programs).
+    """
+    if sources is None:
+        sources = range(len(sections))
+    entries = [
+        (section, item, source)
+        for section, source in zip(sections, sources)
+        for item in section.items
+    ]
+    first_by_url: Dict[str, int] = {}
+    url_sources: Dict[str, Set[Hashable]] = {}
+    for position, (_, item, source) in enumerate(entries):
+        first_by_url.setdefault(item.url, position)
+        url_sources.setdefault(item.url, set()).add(source)
+    unique = list(first_by_url.values())
+
+    def newest(member: int) -> Tuple[date, int]:
+        published = entries[unique[member]][1].published_date()
+        return published or date.min, -member
+
+    kept_position = {position: position for position in unique}
+    clusters = find_clusters(
+        [entries[position][1].title for position in unique],
+        threshold,
+        shingle_size,
+        bands,
+        rows,
+        groups=[url_sources[entries[position][1].url] for position in unique],
+    )
+    for members in clusters:
+        kept = unique[max(members, key=newest)]
+        for member in members:
+            kept_position[unique[member]] = kept
+
+    duplicates: Duplicates = {}
+    kept_items: Dict[int, List[NewsItem]] = {id(section): [] for section in sections}
+    for position, (section, item, _) in enumerate(entries):
+        kept = kept_position[first_by_url[item.url]]
+        if kept == position:
+            kept_items[id(section)].append(item)
+            continue
+        kept_section, kept_item, _ = entries[kept]
+        if (section.title, item.url) == (kept_section.title, kept_item.url):
+            continue
+        links = duplicates.setdefault(kept_item.url, [])
+        if (section.title, item.url) not in links:
+            links.append((section.title, item.url))
+
+    if len(entries) == sum(len(items) for items in kept_items.values()):
+        return sections, duplicates
+    collapsed = []
+    for section in sections:
+        items = kept_items[id(section)]
+        merged = len(section.items) - len(items)
+        collapsed.append(NewsSection(section.title, items, section.error_message, merged))
+    return collapsed, duplicates
@@ -0,0 +1,304 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import IO, Dict, List, Optional, Set, Tuple, Type
+from xml.sax.saxutils import escape, quoteattr
+
+from .models import (
+    TIMESTAMP_LINE_PREFIX,
+    CrawlerReport,
+    NewsItem,
+    NewsSection,
+    SaveStatus,
+    markdown_item,
+)
+
+
+def _json(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _item_dict(item: NewsItem, report: CrawlerReport) -> dict:
+    record: Dict[str, object] = {
+        "title": item.title,
+        "url": item.url,
+        "date": item.date,
+        "category": item.category,
+        "description": item.description,
+    }
+    reposts = report.duplicates.get(item.url)
+    if reposts:
+        record["also"] = [{"section": title, "url": url} for title, url in reposts]
+    return record
+
+
+def item_datetime(item: NewsItem, default: datetime) -> datetime:
+    """Publication date of item at midnight in the timezone of default, or default"""
+    published = item.published_date()
+    if published is None:
+        return default
+    return datetime(published.year, published.month, published.day, tzinfo=default.tzinfo)
+
+
+class DigestWriter:
+    """Text file that keeps a digest of what is written, except its volatile lines
+
+    Volatile lines (the generation time) change on every run without the content changing.
+    They are written with write_volatile(), as whole lines, and their numbers are kept so
+    that the previous file can be digested without the same lines.
+    """
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.volatile_lines: Set[int] = set()
+        self._line = 0
+
+    def write(self, text: str) -> None:
+        self.f.write(text)
+        self.digest.update(text.encode("utf-8"))
+        self._line += text.count("\n")
+
+    def write_volatile(self, text: str) -> None:
+        self.f.write(text)
+        lines = text.count("\n")
+        self.volatile_lines.update(range(self._line, self._line + lines))
+        self._line += lines
+
+    def same_as(self, filename: str) -> bool:
+        """Whether the file holds the same content, its own volatile lines aside"""
+        digest = hashlib.sha256()
+        try:
+            with open(filename, "r", encoding="utf-8") as f:
+                for number, line in enumerate(f):
+                    if number not in self.volatile_lines:
+                        digest.update(line.encode("utf-8"))
+        except (OSError, UnicodeDecodeError):
+            return False
+        return digest.digest() == self.digest.digest()
+
+
+class ReportEmitter:
+    """Writes one output format while the report is traversed once for every format"""
+
+    extension = ""
+
+    def __init__(self, f: DigestWriter, program: str, report: CrawlerReport):
+        self.f = f
+        self.program = program
+        self.report = report
+
+    def begin(self) -> None:
+        pass
+
+    def section(self, section: NewsSection, shown: List[NewsItem]) -> None:
+        pass
+
+    def item(self, section: NewsSection, item: NewsItem) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+class MarkdownEmitter(ReportEmitter):
+    """The markdown report (NEWS-*.md), the same text as CrawlerReport.iter_markdown()"""
+
+    extension = ".md"
+
+    def begin(self) -> None:
+        self._trailer = ""
+        for chunk in self.report.iter_markdown_header():
+            if chunk.startswith(TIMESTAMP_LINE_PREFIX):
+                self.f.write_volatile(chunk)
+            else:
+                self.f.write(chunk)
+
+    def section(self, section: NewsSection, shown: List[NewsItem]) -> None:
+        self.f.write(self._trailer)
+        self.f.write(section.markdown_heading())
+        self._category: Optional[str] = None
+        self._trailer = "" if section.error_message else section.markdown_trailer(len(shown))
+
+    def item(self, section: NewsSection, item: NewsItem) -> None:
+        if section.error_message:
+            return
+        if item.category and item.category != self._category:
+            self.f.write(f"### {item.category}\n\n")
+            self._category = item.category
+        self.f.write(markdown_item(item, self.report.duplicates.get(item.url)))
+
+    def end(self) -> None:
+        self.f.write(self._trailer)
+
+
+class JsonEmitter(ReportEmitter):
+    """Compact JSON document: program, timestamp, errors and sections with their items"""
+
+    extension = ".json"
+
+    def begin(self) -> None:
+        self._sections = 0
+        self._items = 0
+        # generated_at trên một dòng riêng: đổi mỗi lượt, không tính vào digest
+        self.f.write(f'{{"program":{_json(self.program)},\n')
+        generated_at = self.report.timestamp.isoformat(timespec="seconds")
+        self.f.write_volatile(f'"generated_at":{_json(generated_at)},\n')
+        self.f.write(f'"errors":{_json(self.report.errors)},"sections":[')
+
+    def section(self, section: NewsSection, shown: List[NewsItem]) -> None:
+        if self._sections:
+            self.f.write("]},")
+        self._sections += 1
+        self._items = 0
+        self.f.write(
+            f'{{"title":{_json(section.title)},"error":{_json(section.error_message)},'
+            f'"item_count":{section.item_count()},"items":['
+        )
+
+    def item(self, section: NewsSection, item: NewsItem) -> None:
+        if self._items:
+            self.f.write(",")
+        self._items += 1
+        self.f.write(_json(_item_dict(item, self.report)))
+
+    def end(self) -> None:
+        self.f.write("]}]}\n" if self._sections else "]}\n")
+
+
+class NdjsonEmitter(ReportEmitter):
+    """One JSON object per item and line, streamable by line-oriented consumers"""
+
+    extension = ".ndjson"
+
+    def item(self, section: NewsSection, item: NewsItem) -> None:
+        record = {
+            "program": self.program,
+            "section": section.title,
+            **_item_dict(item, self.report),
+        }
+        self.f.write(f"{_json(record)}\n")
+
+
+class AtomEmitter(ReportEmitter):
+    """Atom feed merging every section of the program, one entry per URL"""
+
+    extension = ".atom"
+
+    def begin(self) -> None:
+        # URL -> (item, các section chứa item); cùng bài có thể nằm trong nhiều section
+        self._entries: Dict[str, Tuple[NewsItem, List[str]]] = {}
+
+    def item(self, section: NewsSection, item: NewsItem) -> None:
+        entry = self._entries.setdefault(item.url, (item, []))
+        if section.title not in entry[1]:
+            entry[1].append(section.title)
+
+    def end(self) -> None:
+        updated = self.report.timestamp.isoformat(timespec="seconds")
+        write = self.f.write
+        write('<?xml version="1.0" encoding="utf-8"?>\n')
+        write('<feed xmlns="http://www.w3.org/2005/Atom">\n')
+        write(f"  <id>tag:hcmus-crawler,2025:{escape(self.program)}</id>\n")
+        write(f"  <title>HCMUS News - {escape(self.program.upper())}</title>\n")
+        self.f.write_volatile(f"  <updated>{updated}</updated>\n")
+        write("  <author><name>HCMUS News Crawler</name></author>\n")
+        for item, sections in self._entries.values():
+            published = item_datetime(item, self.report.timestamp).isoformat(timespec="seconds")
+            write("  <entry>\n")
+            write(f"    <id>{escape(item.url)}</id>\n")
+            write(f"    <title>{escape(item.title)}</title>\n")
+            write(f"    <link href={quoteattr(item.url)}/>\n")
+            # Bản đăng lại đã gộp: link tới URL khác, section của nó thành category
+            reposts = self.report.duplicates.get(item.url, [])
+            for url in dict.fromkeys(url for _, url in reposts if url != item.url):
+                write(f'    <link rel="related" href={quoteattr(url)}/>\n')
+            # Tin không có ngày lấy thời điểm tạo báo cáo: đổi mỗi lượt
+            if item.published_date() is None:
+                self.f.write_volatile(f"    <updated>{published}</updated>\n")
+            else:
+                write(f"    <updated>{published}</updated>\n")
+            terms = sections + [title for title, _ in reposts if title not in sections]
+            for term in dict.fromkeys(terms + ([item.category] if item.category else [])):
+                write(f"    <category term={quoteattr(term)}/>\n")
+            if item.description:
+                write(f'    <summary type="html">{escape(item.description)}</summary>\n')
+            write("  </entry>\n")
+        write("</feed>\n")
+
+
+EMITTERS: Dict[str, Type[ReportEmitter]] = {
+    "markdown": MarkdownEmitter,
+    "json": JsonEmitter,
+    "ndjson": NdjsonEmitter,
+    "atom": AtomEmitter,
+}
+
+
+def output_filename(markdown_filename: str, output_format: str) -> str:
+    """NEWS-APCS.md -> NEWS-APCS.md / .json / .ndjson / .atom"""
+    return os.path.splitext(markdown_filename)[0] + EMITTERS[output_format].extension
+
+
+def write_formats(
+    report: CrawlerReport,
+    program: str,
+    formats: List[str],
+    markdown_filename: str,
+    max_items_per_section: Optional[int] = None,
+) -> Dict[str, SaveStatus]:
+    """Write the report in every format from a single traversal; returns the status of each file
+
+    Each file is written to a temporary file first. It replaces the previous file only after
+    the whole traversal succeeded, and only when its own digest changed (volatile lines such
+    as the generation time aside): a change seen only by the JSON (a description, the reposts
+    of an item) still rewrites the JSON even when the markdown is unchanged. Raises OSError.
+    """
+    filenames = [output_filename(markdown_filename, output_format) for output_format in formats]
+    files: List[IO[str]] = []
+    writers: List[DigestWriter] = []
+    try:
+        for filename in filenames:
+            files.append(open(f"{filename}.tmp", "w", encoding="utf-8"))
+            writers.append(DigestWriter(files[-1]))
+        emitters = [
+            EMITTERS[output_format](writer, program, report)
+            for output_format, writer in zip(formats, writers)
+        ]
+
+        for emitter in emitters:
+            emitter.begin()
+        for section in report.sections:
+            shown = (
+                section.items
+                if max_items_per_section is None
+                else section.items[:max_items_per_section]
+            )
+            for emitter in emitters:
+                emitter.section(section, shown)
+            for item in shown:
+                for emitter in emitters:
+                    emitter.item(section, item)
+        for emitter in emitters:
+            emitter.end()
+        for f in files:
+            f.close()
+
+        statuses: Dict[str, SaveStatus] = {}
+        for filename, writer in zip(filenames, writers):
+            if writer.same_as(filename):
+                os.remove(f"{filename}.tmp")
+                statuses[filename] = SaveStatus.UNCHANGED
+            else:
+                os.replace(f"{filename}.tmp", filename)
+                statuses[filename] = SaveStatus.WRITTEN
+        return statuses
+    except BaseException:
+        for f, filename in zip(files, filenames):
+            try:
+                f.close()
+                os.remove(f"{filename}.tmp")
+            except OSError:
+                pass
+        raise
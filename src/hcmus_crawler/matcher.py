@@ -0,0 +1,139 @@
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+
+_COMBINING_MARKS = re.compile("[\u0300-\u036f]")
+
+# Ranh giới từ coi "_" là dấu phân cách: "CTTT_Thông báo" vẫn có từ "Thông báo"
+_WORD_START = r"(?<![^\W_])"
+_WORD_END = r"(?![^\W_])"
+
+
+def fold_diacritics(text: str) -> str:
+    """Lowercase text and strip Vietnamese diacritics: "Học bổng" -> "hoc bong" """
+    text = text.lower()
+    if text.isascii():
+        return text
+    text = unicodedata.normalize("NFD", text)
+    return _COMBINING_MARKS.sub("", text).replace("đ", "d")
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for a keyword trie; at each position it matches the longest keyword"""
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in node.items() if char]
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+
+    if "" not in node:
+        return body
+    # Cuối keyword: keyword ngắn cần kết thúc ở ranh giới từ
+    end = _WORD_END if node[""] else ""
+    if not branches:
+        return end
+    return f"(?:{body}|{end})" if end else f"(?:{body})?"
+
+
+def _compile(
+    keys_by_keyword: Dict[str, Set[str]], boundary_max_length: int, overlapping: bool = True
+) -> Tuple[Optional[Pattern[str]], Dict[str, FrozenSet[str]]]:
+    """Trie regex of the keywords and, for every keyword it can return, the keys it stands for
+
+    Without overlapping, matches are consumed: only for keywords that begin and end at a
+    word boundary, which cannot overlap.
+    """
+    if not keys_by_keyword:
+        return None, {}
+
+    trie: dict = {}
+    for keyword in keys_by_keyword:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = len(keyword) <= boundary_max_length
+
+    if overlapping:
+        # Lookahead không "ăn" ký tự nên keyword chồng lấn nhau vẫn được tìm thấy
+        regex = re.compile(rf"{_WORD_START}(?=({_trie_pattern(trie)}))")
+    else:
+        # Mở đầu bằng ký tự đầu của keyword (ranh giới từ kiểm tra ngay sau nó) để re chỉ
+        # thử khớp ở những vị trí có ký tự đó
+        branches = [
+            rf"{re.escape(char)}(?<![^\W_].){_trie_pattern(child)}" for char, child in trie.items()
+        ]
+        regex = re.compile(f"({'|'.join(branches)})")
+
+    # Keyword ngắn là tiền tố của keyword dài hơn bị che khuất tại cùng vị trí,
+    # nên gộp trước các key của mọi keyword nằm trong nó
+    keys_by_match: Dict[str, FrozenSet[str]] = {}
+    for keyword in keys_by_keyword:
+        keys = set(keys_by_keyword[keyword])
+        for other in keys_by_keyword:
+            if other != keyword and re.search(
+                _keyword_pattern(other, boundary_max_length), keyword
+            ):
+                keys |= keys_by_keyword[other]
+        keys_by_match[keyword] = frozenset(keys)
+    return regex, keys_by_match
+
+
+def _keyword_pattern(keyword: str, boundary_max_length: int) -> str:
+    if len(keyword) <= boundary_max_length:
+        return rf"{_WORD_START}{re.escape(keyword)}{_WORD_END}"
+    return rf"{_WORD_START}{re.escape(keyword)}"
+
+
+class KeywordMatcher:
+    """Match text against several keyword sets at once with compiled trie regexes
+
+    Every keyword set is identified by a key (e.g. a section key). match() scans the text
+    and returns the keys of all sets with at least one keyword in the text. Keywords start
+    at a word boundary ("_" counts as a separator). ASCII keywords up to boundary_max_length
+    characters ("IT", "AI", "CLC") are acronyms: they match whole words, case-sensitively,
+    in the text as written, since folding would turn "ít" and "Ái" into "it" and "ai".
+    Longer keywords match the folded (or lowercased) text.
+    """
+
+    def __init__(
+        self,
+        keyword_sets: Dict[str, List[str]],
+        boundary_max_length: int = 3,
+        fold: bool = True,
+    ):
+        self.fold = fold
+        self.boundary_max_length = boundary_max_length
+
+        acronyms: Dict[str, Set[str]] = {}
+        words: Dict[str, Set[str]] = {}
+        for key, keywords in keyword_sets.items():
+            for keyword in keywords:
+                keyword = keyword.strip()
+                if keyword.isascii() and len(keyword) <= boundary_max_length:
+                    if keyword:
+                        acronyms.setdefault(keyword, set()).add(key)
+                    continue
+                normalized = self._normalize(keyword).strip()
+                if normalized:
+                    words.setdefault(normalized, set()).add(key)
+
+        self._acronym_regex, self._keys_by_acronym = _compile(
+            acronyms, boundary_max_length, overlapping=False
+        )
+        self._regex, self._keys_by_match = _compile(words, boundary_max_length)
+
+    def _normalize(self, text: str) -> str:
+        return fold_diacritics(text) if self.fold else text.lower()
+
+    def match(self, text: str) -> FrozenSet[str]:
+        """Keys of every keyword set that has a keyword in text"""
+        if not text:
+            return frozenset()
+
+        matched: Set[str] = set()
+        if self._acronym_regex is not None:
+            # NFC: "AÍ" ở dạng tổ hợp là "AI" + dấu sắc, không được khớp "AI"
+            written = text if text.isascii() else unicodedata.normalize("NFC", text)
+            for found in set(self._acronym_regex.findall(written)):
+                matched |= self._keys_by_acronym[found]
+        if self._regex is not None:
+            for found in set(self._regex.findall(self._normalize(text))):
+                matched |= self._keys_by_match[found]
+        return frozenset(matched)
@@ -0,0 +1,187 @@
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass
+class FetchMetrics:
+    status: Optional[int] = None
+    retries: int = 0
+    new_connection: bool = False  # kết nối mới: ttfb gồm cả DNS/TCP/TLS
+    limiter_wait_seconds: float = 0.0  # chờ giới hạn tốc độ theo host, trước khi gửi request
+    ttfb_seconds: float = 0.0
+    download_seconds: float = 0.0
+    bytes_transferred: int = 0
+    bytes_decoded: int = 0
+    error: Optional[str] = None
+    # Parse
+    cached: bool = False  # 304 hoặc nội dung không đổi, không cần parse
+    parse_seconds: float = 0.0
+    items_parsed: int = 0
+    incremental: bool = False  # chỉ parse phần mới, ghép với item đã lưu
+
+
+@dataclass
+class SectionMetrics:
+    seconds: float = 0.0
+    items_parsed: Optional[int] = None  # trước khi lọc keyword (None: không lọc)
+    items_kept: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class ReportMetrics:
+    status: str = ""
+    render_write_seconds: float = 0.0
+    items: int = 0
+
+
+@dataclass
+class RunMetrics:
+    """Per-stage timings and counters of one crawl run, cheap enough to keep always on"""
+
+    started_at: float = field(default_factory=time.time)
+    fetches: Dict[str, FetchMetrics] = field(default_factory=dict)
+    sections: Dict[str, SectionMetrics] = field(default_factory=dict)
+    reports: Dict[str, ReportMetrics] = field(default_factory=dict)
+    run_seconds: float = 0.0
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started_at = time.time()
+            self._start = time.perf_counter()
+            self.fetches.clear()
+            self.sections.clear()
+            self.reports.clear()
+            self.run_seconds = 0.0
+
+    def fetch(self, url: str) -> FetchMetrics:
+        with self._lock:
+            return self.fetches.setdefault(url, FetchMetrics())
+
+    def section(self, title: str) -> SectionMetrics:
+        with self._lock:
+            return self.sections.setdefault(title, SectionMetrics())
+
+    def report(self, program: str) -> ReportMetrics:
+        with self._lock:
+            return self.reports.setdefault(program, ReportMetrics())
+
+    def finish(self) -> None:
+        self.run_seconds = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "run_seconds": self.run_seconds,
+                "fetches": {url: asdict(m) for url, m in self.fetches.items()},
+                "sections": {title: asdict(m) for title, m in self.sections.items()},
+                "reports": {program: asdict(m) for program, m in self.reports.items()},
+            }
+
+
+def _label(value: object) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def to_prometheus(summary: dict, prefix: str = "hcmus_crawler") -> str:
+    """Render a run summary (RunMetrics.to_dict() plus host stats) in Prometheus text format"""
+    metrics: Dict[str, Tuple[str, List[str]]] = {}
+
+    def add(name: str, help_text: str, labels: Dict[str, object], value: Optional[float]) -> None:
+        if value is None:
+            return
+        label_text = ",".join(f'{key}="{_label(val)}"' for key, val in labels.items())
+        series = f"{prefix}_{name}{{{label_text}}}" if label_text else f"{prefix}_{name}"
+        sample = f"{series} {float(value)!r}"
+        metrics.setdefault(name, (help_text, []))[1].append(sample)
+
+    add("run_seconds", "Wall time of the last run", {}, summary.get("run_seconds"))
+    add("run_started_timestamp_seconds", "Start of the last run", {}, summary.get("started_at"))
+    add("new_items", "Items seen for the first time in the last run", {}, summary.get("new_items"))
+
+    for url, fetch in summary.get("fetches", {}).items():
+        labels = {"url": url}
+        add("http_status", "HTTP status of the last response", labels, fetch["status"])
+        add("http_retries", "Retries before the last response", labels, fetch["retries"])
+        add("http_error", "1 when the request failed", labels, 1 if fetch["error"] else 0)
+        for phase in ("limiter_wait", "ttfb", "download"):
+            add(
+                "fetch_seconds",
+                "Fetch time per phase (limiter_wait is spent before the request is sent; "
+                "ttfb includes DNS/connect on new connections)",
+                {"url": url, "phase": phase},
+                fetch[f"{phase}_seconds"],
+            )
+        add("response_bytes", "Bytes on the wire", labels, fetch["bytes_transferred"])
+        add("parse_seconds", "Time spent parsing the response", labels, fetch["parse_seconds"])
+        add("parse_cached", "1 when stored items were reused", labels, int(fetch["cached"]))
+        add(
+            "parse_incremental",
+            "1 when only the items above the last seen one were parsed",
+            labels,
+            int(fetch["incremental"]),
+        )
+
+    for title, section in summary.get("sections", {}).items():
+        labels = {"section": title}
+        add("section_seconds", "Wall time of each section crawl", labels, section["seconds"])
+        for stage in ("parsed", "kept"):
+            add(
+                "section_items",
+                "Items parsed from the source and kept by the keyword filter",
+                {"section": title, "stage": stage},
+                section[f"items_{stage}"],
+            )
+        add("section_error", "1 when the section failed", labels, 1 if section["error"] else 0)
+
+    for program, report in summary.get("reports", {}).items():
+        labels = {"program": program}
+        add(
+            "report_seconds",
+            "Time to render and write the report",
+            labels,
+            report["render_write_seconds"],
+        )
+        add("report_items", "Items in the report", labels, report["items"])
+        add(
+            "report_written",
+            "1 when the report file was rewritten",
+            labels,
+            int(report["status"] == "written"),
+        )
+
+    for host, stats in summary.get("hosts", {}).items():
+        labels = {"host": host}
+        add("host_requests", "Requests per host", labels, stats["requests"])
+        add(
+            "host_reused_connections",
+            "Requests on reused connections",
+            labels,
+            stats["reused_connections"],
+        )
+        add(
+            "host_limiter_wait_seconds",
+            "Time requests waited for the per-host rate limiter and Retry-After",
+            labels,
+            stats["limiter_wait_seconds"],
+        )
+        add(
+            "host_rejected",
+            "Requests failed fast while the host was marked down",
+            labels,
+            stats["rejected"],
+        )
+
+    lines = []
+    for name, (help_text, samples) in metrics.items():
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
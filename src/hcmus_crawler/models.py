@@ -1,55 +1,133 @@
-from dataclasses import dataclass
-from typing import List, Optional
-from datetime import datetime
+import re
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import date as calendar_date, datetime
 
+# Ngày trên các trang nguồn: dd/mm/YYYY (feed, CTĐA) hoặc dd-mm-YYYY (FIT)
+_ITEM_DATE = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})")
 
-@dataclass
+# Dòng thời gian cập nhật, thay đổi mỗi lượt nên không tính vào digest nội dung
+TIMESTAMP_LINE_PREFIX = "*Last updated: "
+
+
+class SaveStatus(Enum):
+    WRITTEN = "written"
+    UNCHANGED = "unchanged"  # nội dung giống file cũ, không ghi lại
+    FAILED = "failed"
+
+    def __bool__(self) -> bool:
+        # save_report() từng trả về bool: chỉ FAILED là False
+        return self is not SaveStatus.FAILED
+
+
+# __slots__ cho dataclass cần Python 3.10+; bản cũ hơn vẫn dùng __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class NewsItem:
     title: str
     url: str
     date: str
     category: Optional[str] = None
+    description: Optional[str] = None
 
     def __post_init__(self):
         self.title = self.title.strip()
         self.url = self.url.strip()
-        self.date = self.date.strip()
+        # Ngày và category lặp lại rất nhiều giữa các item: intern để dùng chung một chuỗi
+        self.date = sys.intern(self.date.strip())
         if self.category:
-            self.category = self.category.strip()
+            self.category = sys.intern(self.category.strip())
+        if self.description:
+            self.description = self.description.strip()
 
     def is_valid(self) -> bool:
         return bool(self.title and self.url and self.date)
 
+    def published_date(self) -> Optional[calendar_date]:
+        """Publication date parsed from the date text, None when it has none"""
+        match = _ITEM_DATE.search(self.date)
+        if match is None:
+            return None
+        day, month, year = (int(part) for part in match.groups())
+        try:
+            return calendar_date(year, month, day)
+        except ValueError:
+            return None
+
+
+def markdown_item(item: NewsItem, reposts: Optional[List[Tuple[str, str]]] = None) -> str:
+    """Markdown line of an item, followed by the (section title, URL) of its reposts"""
+    date_part = f"**{item.date}**: " if item.date else ""
+    if not reposts:
+        return f"• {date_part}[{item.title}]({item.url})\n\n"
+    # Cùng URL (section lọc keyword từ cùng feed) chỉ ghi tên section
+    links = ", ".join(title if url == item.url else f"[{title}]({url})" for title, url in reposts)
+    return f"• {date_part}[{item.title}]({item.url}) *(also: {links})*\n\n"
+
 
 @dataclass
 class NewsSection:
     title: str
     items: List[NewsItem]
     error_message: Optional[str] = None
+    # Số item đã gộp vào một mục trùng ở section khác (dedup.collapse_duplicates)
+    merged: int = 0
 
     def __post_init__(self):
         self.title = self.title.strip()
-        self.items = [item for item in self.items if item.is_valid()]
-
-    def to_markdown(self) -> str:
+        # Lọc tại chỗ, không tạo list mới
+        items = self.items
+        kept = 0
+        for item in items:
+            if item.is_valid():
+                items[kept] = item
+                kept += 1
+        del items[kept:]
+
+    def to_markdown(self, max_items: Optional[int] = None) -> str:
+        return "".join(self.iter_markdown(max_items))
+
+    def iter_markdown(
+        self,
+        max_items: Optional[int] = None,
+        duplicates: Optional[Dict[str, List[Tuple[str, str]]]] = None,
+    ) -> Iterator[str]:
+        """Yield the section markdown in chunks, showing at most max_items items
+
+        duplicates maps the URL of an item to the (section title, URL) of its reposts, which
+        are listed after the item.
+        """
+        yield self.markdown_heading()
         if self.error_message:
-            return f"## {self.title}\n\n*{self.error_message}*\n\n"
+            return
 
-        if not self.items:
-            return f"## {self.title}\n\n*No news items found*\n\n"
-
-        result = f"## {self.title}\n\n"
         current_category = None
-
-        for item in self.items:
+        shown = self.items if max_items is None else self.items[:max_items]
+        for item in shown:
             if item.category and item.category != current_category:
-                result += f"### {item.category}\n\n"
+                yield f"### {item.category}\n\n"
                 current_category = item.category
+            yield markdown_item(item, duplicates.get(item.url) if duplicates else None)
+        yield self.markdown_trailer(len(shown))
 
-            date_part = f"**{item.date}**: " if item.date else ""
-            result += f"• {date_part}[{item.title}]({item.url})\n\n"
+    def markdown_heading(self) -> str:
+        """Section heading, with the error or the reason when there are no items to list"""
+        if self.error_message:
+            return f"## {self.title}\n\n*{self.error_message}*\n\n"
+        if not self.items and self.merged:
+            return f"## {self.title}\n\n*{self.merged} items listed in other sections*\n\n"
+        if not self.items:
+            return f"## {self.title}\n\n*No news items found*\n\n"
+        return f"## {self.title}\n\n"
 
-        return result
+    def markdown_trailer(self, shown: int) -> str:
+        """Note after the first shown items of the section, "" when all of them are shown"""
+        hidden = len(self.items) - shown
+        return f"*{hidden} older items not shown*\n\n" if hidden > 0 else ""
 
     def has_errors(self) -> bool:
         return self.error_message is not None
@@ -63,26 +141,34 @@ class CrawlerReport:
     sections: List[NewsSection]
     timestamp: datetime
     errors: List[str] = None
+    # URL của mục giữ lại -> (section, URL) các bản đăng lại đã gộp vào mục đó (dedup.py)
+    duplicates: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
 
     def __post_init__(self):
         if self.errors is None:
             self.errors = []
 
-    def to_markdown(self) -> str:
-        report = "# 🎓 HCMUS News Update\n\n"
-        report += f'*Last updated: **{self.timestamp.strftime("%Y-%m-%d at %H:%M %Z")}***\n\n'
-        report += "---\n\n"
-
-        if self.errors:
-            report += "## ⚠️ Errors\n\n"
-            for error in self.errors:
-                report += f"• {error}\n"
-            report += "\n"
+    def to_markdown(self, max_items_per_section: Optional[int] = None) -> str:
+        return "".join(self.iter_markdown(max_items_per_section))
 
+    def iter_markdown(self, max_items_per_section: Optional[int] = None) -> Iterator[str]:
+        """Yield the report markdown in chunks, for writelines() without building one string"""
+        yield from self.iter_markdown_header()
         for section in self.sections:
-            report += section.to_markdown()
+            yield from section.iter_markdown(max_items_per_section, self.duplicates)
 
-        return report
+    def iter_markdown_header(self) -> Iterator[str]:
+        """Title, timestamp and errors of the markdown report, before the sections"""
+        yield "# 🎓 HCMUS News Update\n\n"
+        # Dòng timestamp là một chunk riêng, đổi mỗi lượt nên không tính vào digest nội dung
+        yield f'{TIMESTAMP_LINE_PREFIX}**{self.timestamp.strftime("%Y-%m-%d at %H:%M %Z")}***\n'
+        yield "\n---\n\n"
+
+        if self.errors:
+            yield "## ⚠️ Errors\n\n"
+            for error in self.errors:
+                yield f"• {error}\n"
+            yield "\n"
 
     def get_total_items(self) -> int:
         return sum(section.item_count() for section in self.sections)
@@ -0,0 +1,132 @@
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import config
+from .models import NewsItem
+
+# Item gửi qua lại giữa các process: (title, url, date, category, description)
+ItemRow = Tuple[str, str, str, Optional[str], Optional[str]]
+
+
+def parse_options(kind: str) -> Dict[str, Any]:
+    """Settings a parser of kind needs, read from config in the crawling process"""
+    if kind == "feed":
+        return {"max_items": config.feed_max_items}
+    options: Dict[str, Any] = {"engine": config.html_engines.get(kind, "lxml")}
+    if kind == "ctda":
+        options["section_titles"] = list(config.ctda_section_titles)
+    return options
+
+
+def parse_page(
+    kind: str,
+    content: bytes,
+    previous: Optional[List[NewsItem]] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> List[NewsItem]:
+    """Parse a page of kind ("feed", "ctda", "fit" or "old_hcmus") into NewsItems
+
+    With previous, the parser stops at the newest previously parsed item and merges the new
+    items in front of the old ones (incremental parsing; not supported by old_hcmus).
+    """
+    from .parsers import get_html_parser, parse_feed
+
+    if options is None:
+        options = parse_options(kind)
+    if kind == "feed":
+        return parse_feed(content, max_items=options["max_items"], previous=previous)
+
+    parser = get_html_parser(kind, options["engine"])
+    if kind == "ctda":
+        return parser(content, options["section_titles"], previous)
+    return parser(content, previous) if previous else parser(content)
+
+
+def to_rows(items: List[NewsItem]) -> List[ItemRow]:
+    return [(item.title, item.url, item.date, item.category, item.description) for item in items]
+
+
+def from_rows(rows: List[ItemRow]) -> List[NewsItem]:
+    return [NewsItem(*row) for row in rows]
+
+
+def _parse_rows(
+    kind: str, options: Dict[str, Any], content: bytes, previous: Optional[List[ItemRow]]
+) -> List[ItemRow]:
+    """Entry point of the worker processes: bytes in, compact tuples out"""
+    return to_rows(parse_page(kind, content, from_rows(previous) if previous else None, options))
+
+
+class ParsePool:
+    """Parse pages in worker processes, with at most max_pending pages queued or parsing
+
+    Parsing is CPU-bound and holds the GIL, so fetch threads hand the raw body to a process
+    pool instead. submit() blocks while max_pending pages are waiting, which keeps the fetch
+    threads from running ahead of the parsers and piling up page bodies in memory.
+    """
+
+    def __init__(self, processes: int, max_pending: Optional[int] = None):
+        self.processes = max(1, processes)
+        self.max_pending = max_pending or 2 * self.processes
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn thay vì fork: fork khi các thread tải đang giữ lock có thể treo process con
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(
+        self,
+        kind: str,
+        content: bytes,
+        previous: Optional[List[NewsItem]] = None,
+        timeout: Optional[float] = None,
+    ) -> "Future[List[NewsItem]]":
+        """Queue a page for parsing, blocking while the queue is full
+
+        Raises concurrent.futures.TimeoutError when no slot frees up within timeout seconds.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise FutureTimeoutError(f"Parse queue still full after {timeout:g}s")
+        try:
+            rows_future = self._pool().submit(
+                _parse_rows,
+                kind,
+                parse_options(kind),
+                content,
+                to_rows(previous) if previous else None,
+            )
+        except BaseException:
+            self._slots.release()
+            raise
+
+        result: Future = Future()
+
+        def done(future: Future) -> None:
+            self._slots.release()
+            if future.cancelled():
+                result.cancel()
+                return
+            error = future.exception()
+            if error is not None:
+                result.set_exception(error)
+            else:
+                result.set_result(from_rows(future.result()))
+
+        rows_future.add_done_callback(done)
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
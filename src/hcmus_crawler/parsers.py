@@ -0,0 +1,529 @@
+import re
+from datetime import datetime
+from io import BytesIO
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+from typing import Union
+
+from lxml import etree
+
+from .models import NewsItem
+from .utils import clean_text
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, Tag
+
+_ENTRY_TAGS = ("{*}item", "{*}entry")
+
+
+class FeedEntry(NamedTuple):
+    title: str
+    link: str
+    pub_date: str
+    description: str
+    atom: bool = False
+
+
+def _local_name(element: etree._Element) -> str:
+    return etree.QName(element).localname if isinstance(element.tag, str) else ""
+
+
+def _text(element: Optional[etree._Element]) -> str:
+    return clean_text("".join(element.itertext())) if element is not None else ""
+
+
+def _atom_link(entry: etree._Element) -> str:
+    links = [child for child in entry if _local_name(child) == "link"]
+    for link in links:
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return str(link.get("href"))
+    return _text(links[0]) if links else ""
+
+
+def _parse_entry(entry: etree._Element) -> Optional[FeedEntry]:
+    children = {}
+    for child in entry:
+        name = _local_name(child)
+        if name and name not in children:
+            children[name] = child
+
+    if _local_name(entry) == "entry":
+        # Atom
+        pub_date = children.get("published", children.get("updated"))
+        description = children.get("summary", children.get("content"))
+        if "title" not in children or pub_date is None:
+            return None
+        return FeedEntry(
+            _text(children["title"]),
+            clean_text(_atom_link(entry)),
+            _text(pub_date),
+            _text(description),
+            atom=True,
+        )
+
+    # RSS 2.0 / RSS 1.0
+    if not all(name in children for name in ("title", "link", "pubDate")):
+        return None
+    return FeedEntry(
+        _text(children["title"]),
+        _text(children["link"]),
+        _text(children["pubDate"]),
+        _text(children.get("description")),
+    )
+
+
+def iter_feed_entries(content: bytes, max_items: Optional[int] = None) -> Iterator[FeedEntry]:
+    """Stream <item>/<entry> records out of an RSS or Atom document
+
+    Processed elements are cleared as soon as they are read. Iteration stops after max_items
+    entries; the caller stops earlier by not consuming the rest (see merge_new_items).
+    """
+    context = etree.iterparse(
+        BytesIO(content),
+        events=("end",),
+        tag=_ENTRY_TAGS,
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+
+    count = 0
+    try:
+        for _, element in context:
+            entry = _parse_entry(element)
+
+            # Giải phóng phần cây đã xử lý
+            element.clear()
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+            if entry is None:
+                continue
+
+            yield entry
+            count += 1
+            if max_items is not None and count >= max_items:
+                return
+    except etree.XMLSyntaxError:
+        # recover=True vẫn có thể bỏ cuộc với tài liệu rỗng hoặc hỏng nặng
+        return
+    finally:
+        del context
+
+
+def format_feed_date(pub_date: str, atom: bool = False) -> str:
+    """RFC 822 (RSS) or ISO 8601 (Atom) date -> dd/mm/YYYY, unchanged when unparseable"""
+    try:
+        if atom:
+            date_obj = datetime.fromisoformat(pub_date.replace("Z", "+00:00"))
+        else:
+            date_obj = datetime.strptime(pub_date, "%a, %d %b %Y %H:%M:%S %z")
+    except ValueError:
+        return pub_date
+    return date_obj.strftime("%d/%m/%Y")
+
+
+def iter_feed_items(content: bytes, max_items: Optional[int] = None) -> Iterator[NewsItem]:
+    """NewsItems of an RSS/Atom document, keeping the description for filtering"""
+    for entry in iter_feed_entries(content, max_items=max_items):
+        if entry.title and entry.link and entry.pub_date:
+            yield NewsItem(
+                title=entry.title,
+                url=entry.link,
+                date=format_feed_date(entry.pub_date, entry.atom),
+                description=entry.description,
+            )
+
+
+def parse_feed(
+    content: bytes,
+    max_items: Optional[int] = None,
+    previous: Optional[List[NewsItem]] = None,
+) -> List[NewsItem]:
+    """Parse an RSS/Atom document into NewsItems (incrementally when previous is given)"""
+    return merge_new_items(iter_feed_items(content, max_items), previous)
+
+
+def merge_new_items(
+    items: Iterable[NewsItem], previous: Optional[List[NewsItem]] = None
+) -> List[NewsItem]:
+    """Consume newest-first items up to the high-water mark, the newest item of previous
+
+    Items are read lazily, so only the new ones are built. They are merged in front of previous,
+    keeping the list at least as long as before; when the mark (same URL and date) is not found
+    the page was reshuffled and the fully read list is returned instead.
+    """
+    if not previous:
+        return list(items)
+
+    mark = previous[0]
+    new_items: List[NewsItem] = []
+    for item in items:
+        if item.url == mark.url and item.date == mark.date:
+            new_urls = {new_item.url for new_item in new_items}
+            # Tin cũ được đẩy lên đầu: bỏ bản cũ của nó trong danh sách trước
+            kept = [old_item for old_item in previous if old_item.url not in new_urls]
+            return (new_items + kept)[: max(len(previous), len(new_items))]
+        new_items.append(item)
+    return new_items
+
+
+def _group_by_category(items: Optional[List[NewsItem]]) -> Dict[Optional[str], List[NewsItem]]:
+    groups: Dict[Optional[str], List[NewsItem]] = {}
+    for item in items or ():
+        groups.setdefault(item.category, []).append(item)
+    return groups
+
+
+# --- HTML sources ---------------------------------------------------------------------------
+#
+# Mỗi nguồn HTML có hai engine cho kết quả giống hệt nhau:
+#   "bs4"  - BeautifulSoup trên lxml (cách làm ban đầu)
+#   "lxml" - XPath biên dịch sẵn chạy thẳng trên cây lxml.html
+# Các hàm _soup_* bên dưới mô phỏng đúng ngữ nghĩa của BeautifulSoup (Tag.text, Tag.contents)
+# để hai engine luôn ra cùng một danh sách NewsItem.
+
+FIT_BASE_URL = "https://www.fit.hcmus.edu.vn/vn/"
+
+# Chuỗi nằm trong các tag này không thuộc Tag.text của BeautifulSoup
+_SOUP_HIDDEN_TEXT_TAGS = frozenset(["script", "style", "template", "rt", "rp"])
+# BeautifulSoup giữ nguyên khoảng trắng trong các tag này, nơi khác thu về " " hoặc "\n"
+_SOUP_PRESERVE_WHITESPACE_TAGS = frozenset(["pre", "textarea"])
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+_CHARSET_DECLARATION = re.compile(rb"<meta[^>]+charset|^\s*<\?xml[^>]+encoding", re.I)
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_CTDA_SECTIONS = etree.XPath(f"//*[{_has_class('display-posts-listing')}]")
+_CTDA_ITEMS = etree.XPath(f".//*[{_has_class('listing-item')}]")
+_FIT_TABLES = etree.XPath("//*[@id='dnn_ctr989_ModuleContent']/table")
+_FIT_DAY = etree.XPath(f".//tr[not(preceding-sibling::*)]/*[{_has_class('day_month')}]")
+_FIT_MONTH = etree.XPath(f".//tr[not(following-sibling::*)]/*[{_has_class('day_month')}]")
+_FIT_YEAR = etree.XPath(f".//*[{_has_class('post_year')}]")
+_FIT_LINK = etree.XPath(".//a")
+_OLD_HCMUS_LINKS = etree.XPath(f"//*[{_has_class('feed-link')}]")
+# Link của một tin: href của thẻ <a> đầu tiên có href bên trong phần tử feed-link
+_OLD_HCMUS_LINK = etree.XPath(".//a/@href", smart_strings=False)
+
+
+def _parse_html(content: bytes) -> Optional[etree._Element]:
+    """Parse an HTML document the way BeautifulSoup's lxml builder decodes it"""
+    encoding = None
+    if not _CHARSET_DECLARATION.search(content[:2048]):
+        # Không khai báo charset: BeautifulSoup đoán UTF-8, libxml2 lại mặc định Latin-1
+        try:
+            content.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError:
+            encoding = "windows-1252"
+    parser = etree.HTMLParser(encoding=encoding, recover=True)
+    try:
+        return etree.fromstring(content, parser) if content.strip() else None
+    except etree.XMLSyntaxError:
+        return None
+
+
+def _soup_string(text: str, preserve: bool) -> str:
+    if preserve or text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _soup_text(element: etree._Element, preserve: bool = False) -> str:
+    """Equivalent of BeautifulSoup's Tag.text for an lxml element"""
+    parts: List[str] = []
+
+    def walk(node: etree._Element, hidden: bool, preserve: bool) -> None:
+        # Chuỗi của chính <script>/<style> vẫn tính khi gọi .text trên tag đó
+        hidden = hidden or (node is not element and node.tag in _SOUP_HIDDEN_TEXT_TAGS)
+        preserve = preserve or node.tag in _SOUP_PRESERVE_WHITESPACE_TAGS
+        if node.text and not hidden:
+            parts.append(_soup_string(node.text, preserve))
+        for child in node:
+            if isinstance(child.tag, str):
+                walk(child, hidden, preserve)
+            if child.tail and not hidden:
+                parts.append(_soup_string(child.tail, preserve))
+
+    walk(element, False, preserve)
+    return "".join(parts)
+
+
+def _soup_contents(element: etree._Element) -> list:
+    """Child nodes as in BeautifulSoup's Tag.contents: elements, comments and text strings"""
+    contents: list = []
+    if element.text:
+        contents.append(element.text)
+    for child in element:
+        contents.append(child)
+        if child.tail:
+            contents.append(child.tail)
+    return contents
+
+
+def _soup_node_text(node: Union[str, etree._Element], preserve: bool = False) -> str:
+    if isinstance(node, str):
+        return _soup_string(node, preserve)
+    if not isinstance(node.tag, str):
+        return ""  # comment / processing instruction
+    return _soup_text(node, preserve=preserve)
+
+
+def _soup(content: bytes) -> "BeautifulSoup":
+    # BeautifulSoup chỉ được import khi engine "bs4" được dùng
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(content, features="lxml")
+
+
+def _iter_ctda_items_bs4(section: "Tag", category: str) -> Iterator[NewsItem]:
+    for element in section.find_all(class_="listing-item"):
+        try:
+            link_element = element.contents[0]
+            title = clean_text(link_element.text)
+            url = link_element.attrs.get("href", "")
+            date = clean_text(element.contents[-1].text) if len(element.contents) > 1 else ""
+
+            if title and url:
+                yield NewsItem(title=title, url=url, date=date, category=category)
+        except (IndexError, KeyError, AttributeError):
+            continue
+
+
+def parse_ctda_bs4(
+    content: bytes, section_titles: List[str], previous: Optional[List[NewsItem]] = None
+) -> List[NewsItem]:
+    soup = _soup(content)
+    sections = soup.find_all(class_="display-posts-listing")[:4]
+    # Mỗi section mới nhất trước, có high-water mark riêng
+    previous_by_category = _group_by_category(previous)
+
+    all_items = []
+    for i, section in enumerate(sections):
+        if i >= len(section_titles):
+            break
+
+        try:
+            all_items.extend(
+                merge_new_items(
+                    _iter_ctda_items_bs4(section, section_titles[i]),
+                    previous_by_category.get(section_titles[i]),
+                )
+            )
+        except Exception:
+            continue
+
+    return all_items
+
+
+def _iter_ctda_items_lxml(section: etree._Element, category: str) -> Iterator[NewsItem]:
+    for element in _CTDA_ITEMS(section):
+        contents = _soup_contents(element)
+        # Phần tử đầu tiên phải là tag (text/comment không có href)
+        if not contents or isinstance(contents[0], str) or not isinstance(contents[0].tag, str):
+            continue
+
+        link_element = contents[0]
+        title = clean_text(_soup_text(link_element))
+        url = link_element.get("href", "")
+        date = clean_text(_soup_node_text(contents[-1])) if len(contents) > 1 else ""
+
+        if title and url:
+            yield NewsItem(title=title, url=url, date=date, category=category)
+
+
+def parse_ctda_lxml(
+    content: bytes, section_titles: List[str], previous: Optional[List[NewsItem]] = None
+) -> List[NewsItem]:
+    root = _parse_html(content)
+    if root is None:
+        return []
+
+    previous_by_category = _group_by_category(previous)
+    all_items = []
+    for i, section in enumerate(_CTDA_SECTIONS(root)[:4]):
+        if i >= len(section_titles):
+            break
+
+        all_items.extend(
+            merge_new_items(
+                _iter_ctda_items_lxml(section, section_titles[i]),
+                previous_by_category.get(section_titles[i]),
+            )
+        )
+
+    return all_items
+
+
+def _iter_fit_items_bs4(soup: "BeautifulSoup") -> Iterator[NewsItem]:
+    for news in soup.select("#dnn_ctr989_ModuleContent > table"):
+        try:
+            day = news.select_one("tr:first-child > .day_month").text.strip()
+            month = news.select_one("tr:last-child > .day_month").text.strip()
+            year = news.select_one(".post_year").text.strip()
+            title = news.select_one("a").text.strip()
+            href = news.select_one("a").attrs["href"]
+
+            if title and href:
+                full_url = f"{FIT_BASE_URL}{href}"
+                date = f"{day}-{month}-{year}"
+                yield NewsItem(title=title, url=full_url, date=date)
+
+        except (AttributeError, KeyError):
+            continue
+
+
+def parse_fit_bs4(content: bytes, previous: Optional[List[NewsItem]] = None) -> List[NewsItem]:
+    soup = _soup(content)
+    return merge_new_items(_iter_fit_items_bs4(soup), previous)
+
+
+def _iter_fit_items_lxml(root: etree._Element) -> Iterator[NewsItem]:
+    for news in _FIT_TABLES(root):
+        days, months, years, links = (
+            _FIT_DAY(news),
+            _FIT_MONTH(news),
+            _FIT_YEAR(news),
+            _FIT_LINK(news),
+        )
+        if not (days and months and years and links) or links[0].get("href") is None:
+            continue
+
+        title = _soup_text(links[0]).strip()
+        href = links[0].get("href")
+
+        if title and href:
+            day = _soup_text(days[0]).strip()
+            month = _soup_text(months[0]).strip()
+            year = _soup_text(years[0]).strip()
+            yield NewsItem(title=title, url=f"{FIT_BASE_URL}{href}", date=f"{day}-{month}-{year}")
+
+
+def parse_fit_lxml(content: bytes, previous: Optional[List[NewsItem]] = None) -> List[NewsItem]:
+    root = _parse_html(content)
+    if root is None:
+        return []
+    return merge_new_items(_iter_fit_items_lxml(root), previous)
+
+
+def parse_old_hcmus_bs4(content: bytes) -> List[NewsItem]:
+    soup = _soup(content)
+
+    ctkt_elements = soup.find_all(class_="feed-link")
+    items = []
+    rule_position = [5, 10, 13]
+
+    for i, news_element in enumerate(ctkt_elements):
+        try:
+            title_text = re.sub(r"(\t|\n)", "", news_element.text)
+            title = title_text.strip()
+
+            anchor = news_element.find("a", href=True)
+            link = str(anchor["href"]).strip() if anchor is not None else ""
+
+            if title and link:
+                category = "Important" if i in rule_position else None
+                items.append(NewsItem(title=title, url=link, date="", category=category))
+
+        except (AttributeError, TypeError, IndexError):
+            continue
+
+    return items
+
+
+def parse_old_hcmus_lxml(content: bytes) -> List[NewsItem]:
+    root = _parse_html(content)
+    if root is None:
+        return []
+
+    items = []
+    rule_position = [5, 10, 13]
+
+    for i, news_element in enumerate(_OLD_HCMUS_LINKS(root)):
+        title = re.sub(r"(\t|\n)", "", _soup_text(news_element)).strip()
+        if not title:
+            continue
+
+        hrefs = _OLD_HCMUS_LINK(news_element)
+        link = hrefs[0].strip() if hrefs else ""
+
+        if link:
+            category = "Important" if i in rule_position else None
+            items.append(NewsItem(title=title, url=link, date="", category=category))
+
+    return items
+
+
+HTML_PARSERS: Dict[str, Dict[str, Callable[..., List[NewsItem]]]] = {
+    "ctda": {"bs4": parse_ctda_bs4, "lxml": parse_ctda_lxml},
+    "fit": {"bs4": parse_fit_bs4, "lxml": parse_fit_lxml},
+    "old_hcmus": {"bs4": parse_old_hcmus_bs4, "lxml": parse_old_hcmus_lxml},
+}
+
+
+def get_html_parser(source: str, engine: str) -> Callable[..., List[NewsItem]]:
+    try:
+        return HTML_PARSERS[source][engine]
+    except KeyError:
+        raise ValueError(f"Unknown HTML engine {engine!r} for source {source!r}")
+
+
+# --- Article pages -------------------------------------------------------------------------
+
+_ARTICLE_NOISE = etree.XPath(
+    "//script|//style|//noscript|//template|//nav|//header|//footer|//aside|//form|//iframe"
+    f"|//*[{_has_class('sharedaddy')}]|//*[{_has_class('related-posts')}]"
+)
+# WordPress và các theme thường gặp đánh dấu phần nội dung chính
+_ARTICLE_BODIES = etree.XPath(
+    f"//*[@itemprop='articleBody']|//*[{_has_class('entry-content')}]"
+    f"|//*[{_has_class('post-content')}]|//*[{_has_class('td-post-content')}]|//article"
+)
+_PARAGRAPHS = etree.XPath(".//p")
+
+
+def _remove_keeping_tail(element: etree._Element) -> None:
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or "") + element.tail
+        else:
+            parent.text = (parent.text or "") + element.tail
+    parent.remove(element)
+
+
+def _block_text(element: etree._Element) -> str:
+    return clean_text(" ".join(element.itertext()))
+
+
+def extract_article_text(content: bytes) -> str:
+    """Main text of an article page, without navigation, sidebars and scripts
+
+    Uses the marked-up article body when the page has one, otherwise the element holding
+    the most paragraph text.
+    """
+    root = _parse_html(content)
+    if root is None:
+        return ""
+
+    for element in _ARTICLE_NOISE(root):
+        _remove_keeping_tail(element)
+
+    bodies = _ARTICLE_BODIES(root)
+    if bodies:
+        return max((_block_text(body) for body in bodies), key=len)
+
+    # Không có thẻ đánh dấu: chọn khối cha có nhiều chữ trong <p> nhất
+    paragraph_text: Dict[object, int] = {}
+    for paragraph in _PARAGRAPHS(root):
+        parent = paragraph.getparent()
+        paragraph_text[parent] = paragraph_text.get(parent, 0) + len(_block_text(paragraph))
+    if not paragraph_text:
+        return _block_text(root)
+    return _block_text(max(paragraph_text, key=paragraph_text.__getitem__))
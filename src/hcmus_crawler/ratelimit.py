@@ -0,0 +1,150 @@
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# (request/giây, burst)
+Rate = Tuple[float, int]
+
+
+class HostUnavailableError(requests.exceptions.ConnectionError):
+    """Host is marked down by the circuit breaker, or asked to wait longer than allowed"""
+
+
+class DeadlineExceededError(requests.exceptions.Timeout):
+    """The run deadline passed before the request could be sent"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class _HostState:
+    tat: float = 0.0  # thời điểm lý thuyết của request kế tiếp (GCRA)
+    blocked_until: float = 0.0  # Retry-After
+    failures: int = 0  # lỗi liên tiếp
+    open_until: float = 0.0  # circuit breaker; khác 0 cho tới khi có request thành công
+    probe_until: float = 0.0  # half-open: request thử đang chạy, request khác bị từ chối
+
+
+class HostRateLimiter:
+    """Per-host token bucket with Retry-After deferral and a circuit breaker (thread-safe)
+
+    Each host gets rates[host] (requests per second, burst; a rate of 0 means no limit) or
+    default. The bucket is kept in GCRA form: a request reserves the next slot before
+    sleeping, so concurrent threads queue behind each other instead of bursting.
+
+    After failure_threshold consecutive failures the host is marked down for cool_off
+    seconds and acquire() fails fast. Then a single probe request is let through (half-open)
+    while the others keep failing fast: its success closes the circuit, its failure opens it
+    again. A probe that reports no result frees the slot probe_timeout seconds after it was
+    sent. The state lives in memory, so it only spans the requests of one process.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, Rate]] = None,
+        default: Rate = (1.0, 1),
+        max_wait: Optional[float] = None,
+        failure_threshold: int = 3,
+        cool_off: float = 300.0,
+        probe_timeout: float = 60.0,
+    ):
+        self.rates = rates or {}
+        self.default = default
+        self.max_wait = max_wait
+        self.failure_threshold = failure_threshold
+        self.cool_off = cool_off
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, url: str) -> Tuple[str, _HostState]:
+        host = urlsplit(url).netloc
+        return host, self._hosts.setdefault(host, _HostState())
+
+    def acquire(self, url: str, deadline: Optional[float] = None) -> float:
+        """Block until a request to the host of url may be sent; returns the seconds waited
+
+        Raises HostUnavailableError when the host is down or the wait would exceed max_wait,
+        and DeadlineExceededError when the request could only be sent after deadline (a
+        time.monotonic() value).
+        """
+        with self._lock:
+            host, state = self._state(url)
+            now = time.monotonic()
+            if state.open_until > now:
+                raise HostUnavailableError(
+                    f"{host} is marked down for another {state.open_until - now:.0f}s "
+                    f"after {state.failures} failed request(s)"
+                )
+            if state.probe_until > now:
+                raise HostUnavailableError(
+                    f"{host} is marked down until a probe request succeeds "
+                    f"after {state.failures} failed request(s)"
+                )
+
+            start = max(now, state.blocked_until)
+            if self.max_wait is not None and start - now > self.max_wait:
+                raise HostUnavailableError(
+                    f"{host} asked to retry after {start - now:.0f}s (limit {self.max_wait:g}s)"
+                )
+
+            rate, burst = self.rates.get(host, self.default)
+            interval = 1 / rate if rate > 0 else 0.0
+            # Giữ chỗ trước rồi mới ngủ để các thread khác xếp hàng phía sau
+            tat = max(state.tat, start)
+            send_at = max(start, tat - (max(burst, 1) - 1) * interval)
+            if deadline is not None and send_at >= deadline:
+                raise DeadlineExceededError(f"Run deadline reached before a request to {host}")
+            state.tat = tat + interval
+            if state.open_until:
+                # Hết cool-off: request này là request thử duy nhất
+                state.probe_until = send_at + self.probe_timeout
+
+        delay = send_at - now
+        if delay > 0:
+            time.sleep(delay)
+        return max(delay, 0.0)
+
+    def defer(self, url: str, seconds: float) -> None:
+        """Hold every request to the host of url for seconds (Retry-After)"""
+        with self._lock:
+            _, state = self._state(url)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + seconds)
+
+    def record_success(self, url: str) -> None:
+        with self._lock:
+            _, state = self._state(url)
+            state.failures = 0
+            state.open_until = 0.0
+            state.probe_until = 0.0
+
+    def record_failure(self, url: str) -> bool:
+        """Count a failed request; returns True when this opened the circuit of the host"""
+        with self._lock:
+            _, state = self._state(url)
+            state.failures += 1
+            state.probe_until = 0.0
+            if state.failures < self.failure_threshold:
+                return False
+            state.open_until = time.monotonic() + self.cool_off
+            return True
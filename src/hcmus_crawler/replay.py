@@ -0,0 +1,116 @@
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from typing import Dict, Mapping, Optional, Tuple, Union
+
+import requests
+from requests.adapters import BaseAdapter
+from urllib3 import HTTPResponse
+
+INDEX_FILE = "index.json"
+
+# Body được lưu ở dạng đã giải nén nên bỏ các header mô tả cách truyền
+_TRANSPORT_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def _body_filename(url: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", url.lower().split("://", 1)[-1]).strip("-")[:60]
+    return f"{slug}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}.body"
+
+
+class FixtureStore:
+    """Directory of recorded responses: index.json (url -> status, headers, body file) + bodies"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._index: Dict[str, dict] = {}
+        try:
+            with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            pass
+
+    def get(self, url: str) -> Optional[dict]:
+        """Recorded status, headers and body of url, or None"""
+        with self._lock:
+            entry = self._index.get(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.directory, entry["body"]), "rb") as f:
+            body = f.read()
+        return {"status": entry["status"], "headers": entry["headers"], "body": body}
+
+    def record(self, url: str, response: requests.Response) -> None:
+        """Save a fully read response; 304s are skipped so the recorded body stays usable"""
+        if response.status_code == 304:
+            return
+
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in _TRANSPORT_HEADERS
+        }
+        filename = _body_filename(url)
+
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, filename), "wb") as f:
+                f.write(response.content)
+            self._index[url] = {
+                "status": response.status_code,
+                "headers": headers,
+                "body": filename,
+            }
+            tmp_path = os.path.join(self.directory, f"{INDEX_FILE}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, ensure_ascii=False, indent=2, sort_keys=True)
+            os.replace(tmp_path, os.path.join(self.directory, INDEX_FILE))
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that answers every request from a FixtureStore, never the network"""
+
+    def __init__(self, store: FixtureStore):
+        super().__init__()
+        self.store = store
+
+    def send(
+        self,
+        request: requests.PreparedRequest,
+        stream: bool = False,
+        timeout: Union[None, float, Tuple[Optional[float], Optional[float]]] = None,
+        verify: Union[bool, str] = True,
+        cert: Union[None, str, Tuple[str, str]] = None,
+        proxies: Optional[Mapping[str, str]] = None,
+    ) -> requests.Response:
+        url = request.url or ""
+        recorded = self.store.get(url)
+        if recorded is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for {url} in {self.store.directory}",
+                request=request,
+            )
+
+        raw = HTTPResponse(
+            body=io.BytesIO(recorded["body"]),
+            headers=recorded["headers"],
+            status=recorded["status"],
+            preload_content=False,
+            decode_content=False,
+        )
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = requests.structures.CaseInsensitiveDict(recorded["headers"])
+        response.raw = raw
+        response.reason = raw.reason or ""
+        response.url = url
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self) -> None:
+        pass
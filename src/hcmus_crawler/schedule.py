@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .cache import content_hash
+from .config import config
+from .models import NewsSection
+
+
+def sections_digest(sections: Iterable[NewsSection]) -> str:
+    """Digest of the items of a source, used to tell whether it changed since the last poll"""
+    lines = [
+        f"{item.url}\t{item.title}\t{item.date}" for section in sections for item in section.items
+    ]
+    return content_hash("\n".join(lines).encode("utf-8"))
+
+
+class PollSchedule:
+    """Per-source change history and recommended next-poll times, kept in a JSON state file
+
+    For every source it records when it was last checked and last changed, and a moving
+    average (EWMA) of the time between changes. The recommended poll interval is a fraction
+    of that estimate, clamped between config.poll_intervals[source] and
+    config.adaptive_max_interval; a source that has been quiet for longer than its estimate
+    is treated as changing that slowly.
+    """
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._sources: Dict[str, dict] = {}
+        self.load()
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._sources = json.load(f).get("sources", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable poll schedule {self.path}: {str(e)}")
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"updated_at": time.time(), "sources": self._sources}
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save poll schedule: {str(e)}")
+
+    def observe(self, source: str, digest: str, now: Optional[float] = None) -> bool:
+        """Record a successful poll of source; returns whether its content changed"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._sources.setdefault(source, {})
+            changed = entry.get("digest") != digest
+
+            if changed:
+                last_changed = entry.get("last_changed")
+                if last_changed is not None:
+                    observed = now - last_changed
+                    previous = entry.get("mean_change_interval")
+                    alpha = config.adaptive_ewma_alpha
+                    entry["mean_change_interval"] = (
+                        observed if previous is None else alpha * observed + (1 - alpha) * previous
+                    )
+                    entry["changes"] = entry.get("changes", 0) + 1
+                entry["last_changed"] = now
+                entry["digest"] = digest
+
+            entry["last_checked"] = now
+            entry["checks"] = entry.get("checks", 0) + 1
+            entry["next_poll"] = now + self._recommended_interval(source, entry, now)
+            return changed
+
+    def _recommended_interval(self, source: str, entry: dict, now: float) -> float:
+        min_interval = config.poll_intervals.get(source, 1800)
+        # Nguồn im lặng lâu hơn ước lượng: coi như nó thay đổi chậm cỡ đó
+        estimate: float = max(entry.get("mean_change_interval") or 0.0, now - entry["last_changed"])
+        interval = estimate * config.adaptive_poll_fraction
+        return max(min_interval, min(interval, config.adaptive_max_interval))
+
+    def next_poll(self, source: str) -> Optional[float]:
+        with self._lock:
+            return self._sources.get(source, {}).get("next_poll")
+
+    def is_due(self, source: str, now: Optional[float] = None) -> bool:
+        """Whether source should be polled now; unknown sources are always due"""
+        next_poll = self.next_poll(source)
+        now = time.time() if now is None else now
+        # Cron không chạy đúng giây: nguồn sắp đến hạn cũng được tính là đến hạn
+        return next_poll is None or next_poll <= now + config.poll_due_slack
+
+    def due_sources(self, sources: List[str], now: Optional[float] = None) -> List[str]:
+        return [source for source in sources if self.is_due(source, now)]
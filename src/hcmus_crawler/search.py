@@ -0,0 +1,95 @@
+"""`search` subcommand: full-text search over the item history"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from typing import List, Optional
+
+from .config import config
+from .store import ItemStore, check_date_bound
+
+
+def _date_bound(value: str) -> str:
+    try:
+        return check_date_bound(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main(argv: Optional[List[str]] = None, prog: str = "hcmus-crawler search") -> int:
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description="Tìm trong mọi tin đã crawl (tiêu đề, mô tả, nguồn), không phân biệt dấu "
+        "và hoa thường",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""Ví dụ:
+  python -m hcmus_crawler search "học bổng" --since 2025-01
+  python -m hcmus_crawler search lich thi --section old_hcmus --newest
+""",
+    )
+    parser.add_argument("query", nargs="+", help="Các từ cần tìm (tất cả phải khớp)")
+    parser.add_argument(
+        "--since", type=_date_bound, metavar="DATE", help="Đăng từ ngày (YYYY, YYYY-MM, YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--until", type=_date_bound, metavar="DATE", help="Đăng đến hết ngày/tháng/năm"
+    )
+    parser.add_argument("--category", help="Chỉ tin thuộc category này (ví dụ: Student Support)")
+    parser.add_argument(
+        "--section", help="Chỉ tin thuộc section này (ctda, fit, hcmus, old_hcmus, clc, standard_*)"
+    )
+    parser.add_argument(
+        "-n", "--limit", type=int, default=20, help="Số kết quả tối đa (mặc định: 20)"
+    )
+    parser.add_argument(
+        "--newest", action="store_true", help="Sắp xếp theo ngày đăng thay vì độ liên quan"
+    )
+    parser.add_argument("--json", action="store_true", help="In mỗi kết quả một dòng JSON")
+    args = parser.parse_args(argv)
+
+    path = os.path.join(config.state_dir, config.item_store_file)
+    if not os.path.exists(path):
+        print(f"Chưa có lịch sử tin ({path}): hãy chạy crawler trước")
+        return 1
+
+    start = time.perf_counter()
+    store = ItemStore(path)
+    try:
+        results = store.search(
+            " ".join(args.query),
+            since=args.since,
+            until=args.until,
+            category=args.category,
+            section=args.section,
+            limit=args.limit,
+            newest_first=args.newest,
+        )
+    except sqlite3.Error as e:
+        print(f"Lỗi: {str(e)}")
+        return 1
+    finally:
+        store.close()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for result in results:
+        item = result.item
+        if args.json:
+            record = {
+                "title": item.title,
+                "url": item.url,
+                "date": item.date,
+                "category": item.category,
+                "source": result.source,
+                "sections": result.sections,
+                "first_seen": result.first_seen.isoformat(timespec="seconds"),
+            }
+            print(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        else:
+            where = ", ".join(result.sections) or result.source
+            print(f"{item.date or '-':>10}  {item.title}  [{where}]\n            {item.url}")
+
+    if not args.json:
+        print(f"\n{len(results)} kết quả ({elapsed_ms:.1f} ms)")
+    return 0
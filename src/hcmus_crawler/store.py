@@ -0,0 +1,390 @@
+import hashlib
+import html
+import logging
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .matcher import fold_diacritics
+from .models import NewsItem, NewsSection
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    url_hash    TEXT PRIMARY KEY,
+    url         TEXT NOT NULL,
+    title       TEXT NOT NULL,
+    date        TEXT NOT NULL,
+    category    TEXT,
+    description TEXT,
+    source      TEXT NOT NULL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS items_first_seen ON items (first_seen);
+CREATE TABLE IF NOT EXISTS memberships (
+    url_hash TEXT NOT NULL,
+    section  TEXT NOT NULL,
+    PRIMARY KEY (url_hash, section)
+) WITHOUT ROWID;
+"""
+
+_INSERT_ITEM = """
+INSERT INTO items (url_hash, url, title, date, category, description, source,
+                   first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_UPSERT_ITEM = (
+    _INSERT_ITEM
+    + """ON CONFLICT (url_hash) DO UPDATE SET
+    title = excluded.title,
+    date = excluded.date,
+    category = excluded.category,
+    description = COALESCE(excluded.description, items.description),
+    last_seen = excluded.last_seen
+"""
+)
+_INSERT_NEW_ITEM = _INSERT_ITEM + "ON CONFLICT (url_hash) DO NOTHING\n"
+
+# Chỉ mục toàn văn: văn bản đã bỏ dấu (matcher.fold_diacritics) để "hoc bong" khớp "Học bổng";
+# published là ngày đăng YYYY-MM-DD (hoặc ngày thấy lần đầu) để lọc theo thời gian.
+# Không đánh chỉ mục nguồn: URL nguồn chỉ thêm các từ như "hcmus", "edu", "feed" vào mọi tin
+# (lọc theo nguồn dùng --section)
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE items_fts USING fts5(
+    url_hash UNINDEXED,
+    published UNINDEXED,
+    title,
+    description,
+    tokenize = 'unicode61'
+)
+"""
+_FTS_COLUMNS = ["url_hash", "published", "title", "description"]
+_INSERT_FTS = "INSERT INTO items_fts (url_hash, published, title, description) VALUES (?, ?, ?, ?)"
+_SELECT_FTS_ROW = "SELECT url_hash, url, title, date, category, description, first_seen FROM items"
+# Trọng số bm25 theo cột: tiêu đề quan trọng hơn mô tả
+_FTS_RANK = "bm25(items_fts, 0, 0, 10.0, 2.0)"
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_QUERY_TOKEN = re.compile(r"\w+")
+_DATE_BOUND = re.compile(r"\d{4}(-\d{2}(-\d{2})?)?")
+# Giới hạn số tham số của một câu SQL (SQLITE_MAX_VARIABLE_NUMBER cũ là 999)
+_SQL_CHUNK = 500
+
+# Tham số theo dõi chiến dịch, không làm thay đổi bài viết
+_TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+
+def canonical_url(url: str) -> str:
+    """Normalize url for deduplication: lowercase host, no fragment/tracking, no trailing slash"""
+    parts = urlsplit(url.strip())
+    query = urlencode(
+        sorted(
+            (key, value)
+            for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not key.lower().startswith(_TRACKING_PARAMS)
+        )
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()
+
+
+def search_text(text: Optional[str]) -> str:
+    """Text as indexed for search: no HTML tags or entities, lowercase, no diacritics"""
+    if not text:
+        return ""
+    return fold_diacritics(html.unescape(_HTML_TAG.sub(" ", text)))
+
+
+def fts_query(query: str) -> Optional[str]:
+    """FTS5 query matching every word of query (the last one as a prefix), None if no words
+
+    "Học bổng" -> "hoc" "bong"*; words are quoted so FTS5 operators in user input are literal.
+    """
+    tokens = _QUERY_TOKEN.findall(search_text(query))
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def check_date_bound(value: str) -> str:
+    """Validate a YYYY, YYYY-MM or YYYY-MM-DD search bound"""
+    if not _DATE_BOUND.fullmatch(value):
+        raise ValueError(f"Invalid date {value!r}, expected YYYY, YYYY-MM or YYYY-MM-DD")
+    return value
+
+
+@dataclass
+class StoredItem:
+    item: NewsItem
+    source: str
+    sections: List[str]
+    first_seen: datetime
+    last_seen: datetime
+
+
+class ItemStore:
+    """SQLite history of every crawled item, deduplicated by normalized URL hash"""
+
+    def __init__(self, path: str, logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL: đọc (truy vấn delta) không chặn lượt ghi của lượt crawl
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self.searchable = self._create_search_index()
+
+    def _create_search_index(self) -> bool:
+        """Create the full-text index, indexing existing items once; False without FTS5
+
+        An index with other columns (one made by an older version) is rebuilt.
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'items_fts'"
+        ).fetchone()
+        if exists:
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(items_fts)")]
+            if columns == _FTS_COLUMNS:
+                return True
+            self.logger.info("Rebuilding the full-text index")
+
+        try:
+            with self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS items_fts")
+                self._conn.execute(FTS_SCHEMA)
+                rows = self._conn.execute(_SELECT_FTS_ROW)
+                self._conn.executemany(_INSERT_FTS, [self._fts_row(*row) for row in rows])
+        except sqlite3.OperationalError as e:
+            # SQLite build không có FTS5: vẫn lưu lịch sử, chỉ không tìm kiếm được
+            self.logger.warning(f"Full-text search disabled: {str(e)}")
+            return False
+        return True
+
+    @staticmethod
+    def _fts_row(
+        key: str,
+        url: str,
+        title: str,
+        date: str,
+        category: Optional[str],
+        description: Optional[str],
+        first_seen: float,
+    ) -> tuple:
+        item = NewsItem(title=title, url=url, date=date, category=category)
+        published = item.published_date() or datetime.fromtimestamp(first_seen, timezone.utc)
+        return (
+            key,
+            published.strftime("%Y-%m-%d"),
+            search_text(title),
+            search_text(description),
+        )
+
+    def record(
+        self,
+        sections: Iterable[Tuple[str, str, NewsSection]],
+        seen_at: Optional[datetime] = None,
+        touch_existing: bool = True,
+    ) -> int:
+        """Upsert the items of (section key, source, section) triples in one transaction
+
+        With touch_existing=False (archive backfill) known items are left as they are.
+        Returns the number of items seen for the first time.
+        """
+        seen = (seen_at or datetime.now(timezone.utc)).timestamp()
+
+        rows: Dict[str, tuple] = {}
+        memberships = set()
+        for section_key, source, section in sections:
+            for item in section.items:
+                key = url_hash(item.url)
+                # Cùng bài ở nhiều section: giữ bản đầu tiên, ghi thêm membership
+                rows.setdefault(
+                    key,
+                    (
+                        key,
+                        item.url,
+                        item.title,
+                        item.date,
+                        item.category,
+                        item.description,
+                        source,
+                        seen,
+                        seen,
+                    ),
+                )
+                memberships.add((key, section_key))
+
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            known = self._known_items(list(rows))
+            self._conn.executemany(
+                _UPSERT_ITEM if touch_existing else _INSERT_NEW_ITEM, rows.values()
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO memberships (url_hash, section) VALUES (?, ?)",
+                memberships,
+            )
+            if self.searchable:
+                self._index(rows, known, touch_existing)
+
+        return len(rows) - len(known)
+
+    def _known_items(self, keys: List[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """url_hash -> (title, description) of the keys already in the store"""
+        known = {}
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start : start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for key, title, description in self._conn.execute(
+                "SELECT url_hash, title, description FROM items"
+                f" WHERE url_hash IN ({placeholders})",
+                chunk,
+            ):
+                known[key] = (title, description)
+        return known
+
+    def _index(
+        self,
+        rows: Dict[str, tuple],
+        known: Dict[str, Tuple[str, Optional[str]]],
+        touch_existing: bool,
+    ) -> None:
+        """Index new items, and known items whose title or description was updated"""
+        changed = []
+        if touch_existing:
+            for key, (title, description) in known.items():
+                row = rows[key]
+                if row[2] != title or (row[5] is not None and row[5] != description):
+                    changed.append(key)
+        self._conn.executemany("DELETE FROM items_fts WHERE url_hash = ?", [(k,) for k in changed])
+
+        keys = [key for key in rows if key not in known] + changed
+        indexed: List[tuple] = []
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start : start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            indexed.extend(
+                self._conn.execute(f"{_SELECT_FTS_ROW} WHERE url_hash IN ({placeholders})", chunk)
+            )
+        self._conn.executemany(_INSERT_FTS, [self._fts_row(*row) for row in indexed])
+
+    def items_since(self, since: datetime, section: Optional[str] = None) -> List[StoredItem]:
+        """Items first seen at or after since, oldest first, optionally limited to one section"""
+        query = (
+            "SELECT i.url_hash, i.url, i.title, i.date, i.category, i.description, i.source,"
+            " i.first_seen, i.last_seen, group_concat(m.section)"
+            " FROM items i LEFT JOIN memberships m ON m.url_hash = i.url_hash"
+            " WHERE i.first_seen >= ?"
+        )
+        params: list = [since.timestamp()]
+        if section:
+            query += " AND i.url_hash IN (SELECT url_hash FROM memberships WHERE section = ?)"
+            params.append(section)
+        query += " GROUP BY i.url_hash ORDER BY i.first_seen, i.url"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [self._stored_item(row) for row in rows]
+
+    def search(
+        self,
+        query: str,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        category: Optional[str] = None,
+        section: Optional[str] = None,
+        limit: int = 20,
+        newest_first: bool = False,
+    ) -> List[StoredItem]:
+        """Items matching every word of query in their title or description
+
+        Diacritics and case are ignored. since/until are inclusive YYYY[-MM[-DD]] bounds on the
+        publication date (the first-seen date for items without one); category is matched
+        case-insensitively, section against the section keys. Results are ranked by
+        relevance, or by date with newest_first.
+        """
+        if not self.searchable:
+            raise sqlite3.OperationalError("Full-text search needs SQLite with FTS5")
+        match = fts_query(query)
+        if match is None:
+            return []
+
+        # Xếp hạng và giới hạn trên chỉ mục trước, rồi mới đọc bảng items cho các kết quả trả về
+        conditions = ["items_fts MATCH ?"]
+        params: list = [match]
+        if since:
+            conditions.append("f.published >= ?")
+            params.append(check_date_bound(since))
+        if until:
+            conditions.append("substr(f.published, 1, length(?)) <= ?")
+            params.extend([check_date_bound(until)] * 2)
+        if category:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM items c WHERE c.url_hash = f.url_hash"
+                " AND c.category = ? COLLATE NOCASE)"
+            )
+            params.append(category)
+        if section:
+            conditions.append(
+                "EXISTS (SELECT 1 FROM memberships m WHERE m.url_hash = f.url_hash"
+                " AND m.section = ?)"
+            )
+            params.append(section)
+        # Mới nhất trước: không cần tính bm25, cùng ngày thì tin được ghi sau đứng trước
+        score = "0" if newest_first else _FTS_RANK
+        order = "f.published DESC, rid DESC" if newest_first else "score"
+        params.append(limit)
+
+        ranked = (
+            f"SELECT f.url_hash, f.rowid AS rid, {score} AS score FROM items_fts f"
+            f" WHERE {' AND '.join(conditions)} ORDER BY {order} LIMIT ?"
+        )
+        with self._lock:
+            keys = [row[0] for row in self._conn.execute(ranked, params)]
+            rows = self._conn.execute(
+                "SELECT i.url_hash, i.url, i.title, i.date, i.category, i.description, i.source,"
+                " i.first_seen, i.last_seen,"
+                " (SELECT group_concat(m.section) FROM memberships m WHERE m.url_hash = i.url_hash)"
+                f" FROM items i WHERE i.url_hash IN ({','.join('?' * len(keys))})",
+                keys,
+            ).fetchall()
+
+        by_key = {row[0]: row for row in rows}
+        return [self._stored_item(by_key[key]) for key in keys if key in by_key]
+
+    @staticmethod
+    def _stored_item(row: tuple) -> StoredItem:
+        _, url, title, date, category, description, source, first_seen, last_seen, sections = row
+        return StoredItem(
+            item=NewsItem(
+                title=title, url=url, date=date, category=category, description=description
+            ),
+            source=source,
+            sections=sorted(sections.split(",")) if sections else [],
+            first_seen=datetime.fromtimestamp(first_seen, timezone.utc),
+            last_seen=datetime.fromtimestamp(last_seen, timezone.utc),
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
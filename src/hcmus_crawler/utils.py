@@ -1,32 +1,114 @@
 import logging
+import threading
 import time
-import requests
-from typing import Optional
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from contextlib import contextmanager
+from functools import lru_cache
+from types import TracebackType
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, cast
 
 from .config import config
 
+if TYPE_CHECKING:
+    import requests
+    from urllib3.connectionpool import ConnectionPool
+    from urllib3.response import BaseHTTPResponse
+
+    from .client import HttpClient
+
 
 def setup_logging() -> logging.Logger:
     logging.basicConfig(
         level=getattr(logging, config.log_level),
         format=config.log_format,
-        handlers=[logging.StreamHandler(), logging.FileHandler("crawler.log", encoding="utf-8")],
+        # delay=True: file log chỉ được mở khi có bản ghi đầu tiên
+        handlers=[
+            logging.StreamHandler(),
+            logging.FileHandler(config.log_file, encoding="utf-8", delay=True),
+        ],
     )
     return logging.getLogger(__name__)
 
 
-def create_session() -> requests.Session:
+# Hạn chót (time.monotonic()) của request đang gửi trên mỗi thread, xem request_deadline
+_request_deadline = threading.local()
+
+
+@contextmanager
+def request_deadline(deadline: Optional[float]) -> Iterator[None]:
+    """Limit the urllib3 retries of the requests sent by this thread to deadline"""
+    previous = getattr(_request_deadline, "value", None)
+    _request_deadline.value = deadline
+    try:
+        yield
+    finally:
+        _request_deadline.value = previous
+
+
+@lru_cache(maxsize=None)
+def _deadline_retry_class() -> type:
+    from urllib3.exceptions import MaxRetryError, ResponseError
+    from urllib3.util.retry import Retry
+
+    class DeadlineRetry(Retry):
+        """Retry that stops at the deadline of the request (request_deadline)
+
+        With a deadline, connect and read errors are not retried (each retry would wait a
+        whole timeout again), and other retries stop when their backoff ends past it.
+        """
+
+        def increment(
+            self,
+            method: Optional[str] = None,
+            url: Optional[str] = None,
+            response: Optional["BaseHTTPResponse"] = None,
+            error: Optional[Exception] = None,
+            _pool: Optional["ConnectionPool"] = None,
+            _stacktrace: Optional[TracebackType] = None,
+        ) -> "DeadlineRetry":
+            retry = super().increment(method, url, response, error, _pool, _stacktrace)
+            deadline = getattr(_request_deadline, "value", None)
+            if deadline is None:
+                return retry
+
+            # urlopen luôn truyền pool đang dùng
+            pool = cast("ConnectionPool", _pool)
+            if error is not None and (
+                self._is_connection_error(error) or self._is_read_error(error)
+            ):
+                raise MaxRetryError(pool, url, error) from error
+            if time.monotonic() + retry.get_backoff_time() >= deadline:
+                status = response.status if response is not None else 0
+                reason = error or ResponseError(
+                    ResponseError.SPECIFIC_ERROR.format(status_code=status)
+                )
+                raise MaxRetryError(pool, url, reason)
+            return retry
+
+    return DeadlineRetry
+
+
+def create_session(
+    pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None
+) -> "requests.Session":
+    # requests/urllib3 chỉ được import khi thật sự tạo session
+    import requests
+    from requests.adapters import HTTPAdapter
+
     session = requests.Session()
 
-    retry_strategy = Retry(
+    retry_strategy = _deadline_retry_class()(
         total=config.max_retries,
         backoff_factor=config.retry_delay,
-        status_forcelist=[429, 500, 502, 503, 504],
+        # 429/503 do HttpClient xử lý theo Retry-After (urllib3 sẽ ngủ bao lâu cũng được)
+        status_forcelist=[500, 502, 504],
+        respect_retry_after_header=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections or config.pool_connections,
+        pool_maxsize=pool_maxsize or config.pool_maxsize,
+        max_retries=retry_strategy,
+    )
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -36,13 +118,20 @@ def create_session() -> requests.Session:
 
 
 def safe_request(
-    session: requests.Session, url: str, logger: logging.Logger
-) -> Optional[requests.Response]:
+    client: "HttpClient",
+    url: str,
+    logger: logging.Logger,
+    headers: Optional[Dict[str, str]] = None,
+    deadline: Optional[float] = None,
+) -> Optional["requests.Response"]:
+    import requests
+
     try:
-        response = session.get(url, timeout=config.timeout)
+        response = client.get(url, headers=headers, deadline=deadline)
         response.raise_for_status()
         return response
-    except requests.exceptions.RequestException:
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Request failed for {url}: {str(e)}")
         return None
 
 
@@ -0,0 +1,144 @@
+import itertools
+import os
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from hcmus_crawler import articles
+from hcmus_crawler.articles import ArticleCache, ArticleFetcher
+from hcmus_crawler.cache import content_hash
+from hcmus_crawler.config import config
+
+URL = "https://hcmus.edu.vn/tin/1"
+
+
+def page(text: str) -> bytes:
+    return f"<html><body><article><p>{text}</p></article></body></html>".encode()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Injected time.time() of the cache; advance with clock[0] += seconds"""
+    now = [1_760_000_000.0]
+    ticks = itertools.count()
+    # Mỗi lần gọi nhích thêm 1 ms để thứ tự LRU không phụ thuộc độ phân giải đồng hồ
+    monkeypatch.setattr(articles.time, "time", lambda: now[0] + next(ticks) / 1000)
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ArticleCache(str(tmp_path / "articles"), max_bytes=25)
+
+
+def put(cache: ArticleCache, url: str, text: str) -> str:
+    digest = content_hash(text.encode())
+    cache.put(url, digest, None, text)
+    return digest
+
+
+def test_least_recently_used_texts_are_evicted(cache):
+    first = put(cache, "https://hcmus.edu.vn/tin/1", "a" * 10)
+    second = put(cache, "https://hcmus.edu.vn/tin/2", "b" * 10)
+    assert cache.get("https://hcmus.edu.vn/tin/1") == "a" * 10
+
+    # 30 byte > 25: bỏ văn bản dùng lâu nhất (tin 2), giữ tin 1 vừa đọc
+    put(cache, "https://hcmus.edu.vn/tin/3", "c" * 10)
+    assert cache.get("https://hcmus.edu.vn/tin/2") is None
+    assert not os.path.exists(cache._blob_path(second))
+    assert cache.get("https://hcmus.edu.vn/tin/1") == "a" * 10
+    assert cache.get("https://hcmus.edu.vn/tin/3") == "c" * 10
+    assert os.path.exists(cache._blob_path(first))
+
+
+def test_eviction_survives_a_restart(cache):
+    put(cache, "https://hcmus.edu.vn/tin/1", "a" * 20)
+    put(cache, "https://hcmus.edu.vn/tin/2", "b" * 20)
+    cache.save()
+
+    reloaded = ArticleCache(cache.directory, cache.max_bytes)
+    assert reloaded.get("https://hcmus.edu.vn/tin/1") is None
+    assert reloaded.get("https://hcmus.edu.vn/tin/2") == "b" * 20
+
+
+class StubClient:
+    """Answers one article page with an ETag, and 304 to a matching If-None-Match"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.requests: List[Optional[Dict[str, str]]] = []
+
+    def get(self, url, headers=None, deadline=None) -> requests.Response:
+        self.requests.append(headers)
+        response = requests.Response()
+        response.url = url
+        etag = f'"{content_hash(self.body)}"'
+        response.headers["ETag"] = etag
+        if headers and headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = self.body
+        return response
+
+
+def new_fetcher(tmp_path, client: StubClient) -> ArticleFetcher:
+    cache = ArticleCache(str(tmp_path / "articles"), 10**6)
+    return ArticleFetcher(client, cache)  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def extractions(monkeypatch) -> List[bytes]:
+    extracted: List[bytes] = []
+    extract_article_text = articles.extract_article_text
+
+    def counting_extract(content):
+        extracted.append(content)
+        return extract_article_text(content)
+
+    monkeypatch.setattr(articles, "extract_article_text", counting_extract)
+    return extracted
+
+
+def test_stale_article_is_revalidated_with_its_etag(tmp_path, clock, extractions, monkeypatch):
+    monkeypatch.setattr(config, "article_revalidate_after", 3600)
+    client = StubClient(page("Học bổng"))
+    fetcher = new_fetcher(tmp_path, client)
+
+    assert fetcher.texts([URL]) == {URL: "Học bổng"}
+    assert client.requests == [None]
+
+    # Còn mới: không gửi request
+    clock[0] += 1800
+    assert fetcher.texts([URL]) == {URL: "Học bổng"}
+    assert len(client.requests) == 1
+
+    # Quá hạn: gửi If-None-Match, 304 là cache hit
+    clock[0] += 3600
+    assert fetcher.texts([URL]) == {URL: "Học bổng"}
+    assert client.requests[-1] == {"If-None-Match": f'"{content_hash(client.body)}"'}
+    assert len(extractions) == 1
+    assert not fetcher.cache.is_stale(URL)
+
+    # Trang đã đổi: tải lại và trích xuất văn bản mới
+    clock[0] += 7200
+    client.body = page("Học bổng 2026")
+    assert fetcher.texts([URL]) == {URL: "Học bổng 2026"}
+    assert len(extractions) == 2
+
+
+def test_failed_revalidation_keeps_the_cached_text(tmp_path, clock, monkeypatch):
+    monkeypatch.setattr(config, "article_revalidate_after", 3600)
+    client = StubClient(page("Học bổng"))
+    fetcher = new_fetcher(tmp_path, client)
+    fetcher.texts([URL])
+
+    def unreachable(url, headers=None, deadline=None):
+        raise requests.exceptions.ConnectionError("Connection refused")
+
+    client.get = unreachable  # type: ignore[method-assign]
+    clock[0] += 7200
+    assert fetcher.texts([URL]) == {URL: "Học bổng"}
+    assert fetcher.cache.is_stale(URL)
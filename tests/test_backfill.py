@@ -0,0 +1,163 @@
+import dataclasses
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from hcmus_crawler.backfill import ArchiveBackfill
+from hcmus_crawler.config import config
+from hcmus_crawler.crawler import NewsCrawler
+from hcmus_crawler.models import NewsItem, NewsSection
+from hcmus_crawler.replay import FixtureStore
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def rss(*numbers: int) -> bytes:
+    items = "".join(
+        f"<item><title>Tin {n}</title><link>https://ctda.hcmus.edu.vn/{n}</link>"
+        f"<pubDate>{n % 28 + 1:02d} Oct 2025 08:00:00 +0700</pubDate></item>"
+        for n in numbers
+    )
+    return f'<?xml version="1.0"?><rss><channel>{items}</channel></rss>'.encode()
+
+
+def page_url(page: int) -> str:
+    template, _ = config.archive_pages["ctda"]
+    return template.format(page=page)
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path, monkeypatch):
+    """Run in tmp_path, with config restored after the test"""
+    monkeypatch.chdir(tmp_path)
+    for option in dataclasses.fields(config):
+        monkeypatch.setattr(config, option.name, getattr(config, option.name))
+    config.item_store = True
+    config.backfill_host_interval = 0.0
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Write the archive pages {page: body, or None for a 404} as replay fixtures"""
+    config.replay_dir = str(tmp_path / "fixtures")
+
+    def record(pages: Dict[int, Optional[bytes]]) -> None:
+        store = FixtureStore(config.replay_dir)
+        for page, body in pages.items():
+            response = requests.Response()
+            response.status_code = 404 if body is None else 200
+            response._content = b"" if body is None else body
+            store.record(page_url(page), response)
+
+    return record
+
+
+def new_backfill(**kwargs) -> ArchiveBackfill:
+    return ArchiveBackfill(NewsCrawler(), ["ctda"], workers=1, **kwargs)
+
+
+def run(backfill: ArchiveBackfill):
+    try:
+        return backfill.run()
+    finally:
+        backfill.crawler.close()
+        backfill.crawler.item_store.close()
+
+
+def stored_urls(since: datetime = T0) -> List[str]:
+    crawler = NewsCrawler()
+    try:
+        return sorted(stored.item.url for stored in crawler.item_store.items_since(since))
+    finally:
+        crawler.item_store.close()
+
+
+@pytest.mark.parametrize(
+    "end",
+    [None, rss(), rss(6, 5, 4)],
+    ids=["404", "empty page", "repeated page"],
+)
+def test_archive_ends_at_the_first_missing_page(archive, end):
+    archive({1: rss(9, 8, 7), 2: rss(6, 5, 4), 3: end})
+    backfill = new_backfill()
+    stats = run(backfill)
+
+    assert stats.pages_fetched == 3
+    assert stats.pages_failed == 0
+    assert stats.items == stats.new_items == 6
+    assert backfill.cursor.last_page("ctda") == 2
+    assert len(stored_urls()) == 6
+
+
+def test_listing_that_ignores_the_page_ends_at_page_one(archive):
+    archive({1: rss(9, 8, 7), 2: rss(9, 8, 7)})
+    backfill = new_backfill()
+    stats = run(backfill)
+    assert stats.new_items == 3
+    assert backfill.cursor.last_page("ctda") == 1
+
+
+def test_interrupted_backfill_resumes(archive):
+    archive({1: rss(9, 8, 7), 2: rss(6, 5, 4), 3: rss(3, 2, 1), 4: None})
+    backfill = new_backfill()
+    finish_page = backfill._finish_page
+
+    def finish_page_and_stop(*args):
+        finish_page(*args)
+        backfill.stop()  # như SIGTERM sau trang đầu
+
+    backfill._finish_page = finish_page_and_stop  # type: ignore[method-assign]
+    stats = run(backfill)
+    assert (stats.pages_fetched, stats.new_items) == (1, 3)
+    assert backfill.cursor.last_page("ctda") is None
+
+    # Lượt sau đọc con trỏ đã lưu: không tải lại trang 1
+    stats = run(new_backfill())
+    assert (stats.pages_skipped, stats.pages_fetched, stats.new_items) == (1, 3, 6)
+    assert len(stored_urls()) == 9
+
+    # Đã xong hết: không tải trang nào nữa
+    stats = run(new_backfill())
+    assert (stats.pages_skipped, stats.pages_fetched) == (3, 0)
+
+
+def test_restart_forgets_the_progress(archive):
+    archive({1: rss(9, 8, 7), 2: None})
+    run(new_backfill())
+
+    backfill = new_backfill()
+    backfill.restart()
+    stats = run(backfill)
+    assert (stats.pages_skipped, stats.pages_fetched, stats.new_items) == (0, 2, 0)
+
+
+def test_max_pages_leaves_the_rest_for_later(archive):
+    archive({1: rss(9, 8, 7), 2: rss(6, 5, 4), 3: None})
+    stats = run(new_backfill(max_pages=1))
+    assert (stats.pages_fetched, stats.new_items) == (1, 3)
+
+    stats = run(new_backfill())
+    assert (stats.pages_skipped, stats.pages_fetched, stats.new_items) == (1, 2, 3)
+
+
+def test_backfilled_items_keep_their_last_seen(archive):
+    crawler = NewsCrawler()
+    seen = NewsItem("Tin 8", "https://ctda.hcmus.edu.vn/8", "09/10/2025")
+    crawler.item_store.record([("ctda", "ctda", NewsSection("ctda", [seen]))], T0)
+    crawler.item_store.close()
+
+    archive({1: rss(9, 8, 7), 2: None})
+    stats = run(new_backfill())
+    assert (stats.items, stats.new_items) == (3, 2)
+
+    crawler = NewsCrawler()
+    try:
+        stored = {item.item.url: item for item in crawler.item_store.items_since(T0)}
+    finally:
+        crawler.item_store.close()
+    assert sorted(stored) == [f"https://ctda.hcmus.edu.vn/{n}" for n in (7, 8, 9)]
+    # Backfill không làm tin cũ trông như vừa thấy lại
+    assert stored[seen.url].last_seen == stored[seen.url].first_seen == T0
+    assert stored["https://ctda.hcmus.edu.vn/9"].first_seen > T0
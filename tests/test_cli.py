@@ -0,0 +1,29 @@
+import pytest
+
+from hcmus_crawler.cli import build_parser
+
+
+@pytest.fixture
+def parser():
+    return build_parser(description="test", prog="hcmus_crawler")
+
+
+def test_defaults(parser):
+    args = parser.parse_args([])
+    assert args.program == "apcs"
+    assert args.max_items is None
+
+
+@pytest.mark.parametrize("option", ["--max-items", "--workers", "--backfill-pages"])
+def test_counts_accept_positive_values(parser, option):
+    args = parser.parse_args([option, "3"])
+    assert getattr(args, option[2:].replace("-", "_")) == 3
+
+
+@pytest.mark.parametrize("option", ["--max-items", "--workers", "--backfill-pages"])
+@pytest.mark.parametrize("value", ["0", "-1", "many"])
+def test_counts_reject_other_values(parser, capsys, option, value):
+    with pytest.raises(SystemExit) as exit_info:
+        parser.parse_args([option, value])
+    assert exit_info.value.code == 2
+    assert option in capsys.readouterr().err
@@ -0,0 +1,67 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from hcmus_crawler.client import HttpClient
+from hcmus_crawler.config import config
+from hcmus_crawler.ratelimit import HostUnavailableError
+
+
+@pytest.fixture
+def slow_url():
+    """URL of a local server that answers only after 5 s"""
+    release = threading.Event()
+
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            release.wait(5)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/feed/"
+    release.set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(config, "default_host_rate", (0.0, 1))
+    monkeypatch.setattr(config, "host_rates", {})
+    monkeypatch.setattr(config, "max_retries", 3)
+    monkeypatch.setattr(config, "retry_delay", 0.0)
+    client = HttpClient()
+    yield client
+    client.close()
+
+
+def test_deadline_timeouts_are_not_retried_nor_host_failures(slow_url, client):
+    for _ in range(config.breaker_failures):
+        start = time.monotonic()
+        with pytest.raises(requests.exceptions.RequestException):
+            client.get(slow_url, deadline=start + 0.3)
+        # Một lần chờ, không thử lại thêm max_retries lần
+        assert time.monotonic() - start < 1.0
+
+    # Host không bị đánh dấu down
+    client.limiter.acquire(slow_url)
+
+
+def test_retried_timeouts_count_against_the_host(slow_url, client, monkeypatch):
+    monkeypatch.setattr(config, "timeout", 0.1)
+    monkeypatch.setattr(config, "max_retries", 1)
+    for _ in range(config.breaker_failures):
+        # urllib3 thử lại rồi bỏ cuộc: ConnectionError(MaxRetryError(ReadTimeoutError))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.get(slow_url)
+    with pytest.raises(HostUnavailableError):
+        client.get(slow_url)
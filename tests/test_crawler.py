@@ -0,0 +1,243 @@
+import dataclasses
+import json
+import os
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import pytest
+import requests
+
+from hcmus_crawler import crawler as crawler_module
+from hcmus_crawler import parsepool, parsers
+from hcmus_crawler.cli import build_parser, config_from_args
+from hcmus_crawler.config import ProgramType, config
+from hcmus_crawler.crawler import NewsCrawler
+from hcmus_crawler.ratelimit import DeadlineExceededError
+
+URL = "https://hcmus.edu.vn/feed/"
+
+
+def rss(*numbers: int) -> bytes:
+    items = "".join(
+        f"<item><title>Tin {n}</title><link>https://hcmus.edu.vn/{n}</link>"
+        f"<pubDate>{n:02d} Oct 2025 08:00:00 +0700</pubDate></item>"
+        for n in numbers
+    )
+    return f'<?xml version="1.0"?><rss><channel>{items}</channel></rss>'.encode()
+
+
+class StubClient:
+    """HttpClient answering from a dict of bodies, with ETag and 304 like a server"""
+
+    def __init__(self, pages: Dict[str, bytes], etag: bool = True):
+        self.pages = pages
+        self.etag = etag
+        self.requests: List[Optional[Dict[str, str]]] = []
+
+    def get(self, url, headers=None, deadline=None) -> requests.Response:
+        self.requests.append(headers)
+        response = requests.Response()
+        response.url = url
+        etag = f'"{hash(self.pages[url])}"'
+        if self.etag and headers and headers.get("If-None-Match") == etag:
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = self.pages[url]
+        if self.etag:
+            response.headers["ETag"] = etag
+        return response
+
+    def get_stats(self) -> Dict[str, dict]:
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path, monkeypatch):
+    """Run in tmp_path, with config restored after the test"""
+    monkeypatch.chdir(tmp_path)
+    for option in dataclasses.fields(config):
+        monkeypatch.setattr(config, option.name, getattr(config, option.name))
+    config.item_store = False
+    config.output_formats = []
+
+
+@pytest.fixture
+def parses(monkeypatch) -> List[str]:
+    """Kinds of the pages parsed during the test"""
+    kinds: List[str] = []
+    parse_page = parsepool.parse_page
+
+    def counting_parse_page(kind, *args, **kwargs):
+        kinds.append(kind)
+        return parse_page(kind, *args, **kwargs)
+
+    monkeypatch.setattr(parsepool, "parse_page", counting_parse_page)
+    return kinds
+
+
+def new_crawler(pages: Dict[str, bytes], etag: bool = True) -> NewsCrawler:
+    crawler = NewsCrawler(ProgramType.APCS)
+    crawler._client = StubClient(pages, etag)
+    return crawler
+
+
+@pytest.fixture
+def crawler():
+    crawler = new_crawler({URL: rss(3, 2, 1)})
+    yield crawler
+    crawler.close()
+
+
+class HungPool:
+    def submit(self, kind, content, previous=None, timeout=None) -> Future:
+        return Future()
+
+    def close(self) -> None:
+        pass
+
+
+def test_hung_parse_stops_at_the_run_deadline(crawler):
+    crawler.parse_pool = HungPool()
+    crawler._run.deadline = time.monotonic() + 0.2
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        crawler._fetch_items(URL, "feed")
+    assert time.monotonic() - start < 1.0
+
+
+def urls(items) -> List[str]:
+    return [item.url for item in items]
+
+
+def test_not_modified_reuses_the_stored_items(crawler, parses):
+    first = crawler._fetch_items(URL, "feed")
+    assert urls(first) == [f"https://hcmus.edu.vn/{n}" for n in (3, 2, 1)]
+    assert crawler._client.requests == [{}]
+
+    assert crawler._fetch_items(URL, "feed") == first
+    assert crawler._client.requests[-1] == {"If-None-Match": f'"{hash(rss(3, 2, 1))}"'}
+    assert parses == ["feed"]
+    assert crawler.metrics.fetch(URL).cached
+
+
+def test_unchanged_body_without_validators_is_not_parsed(parses):
+    crawler = new_crawler({URL: rss(3, 2, 1)}, etag=False)
+    first = crawler._fetch_items(URL, "feed")
+    assert crawler._fetch_items(URL, "feed") == first
+    assert crawler._client.requests == [{}, {}]
+    assert parses == ["feed"]
+
+    crawler._client.pages[URL] = rss(4, 3, 2, 1)
+    assert urls(crawler._fetch_items(URL, "feed"))[0] == "https://hcmus.edu.vn/4"
+    assert parses == ["feed", "feed"]
+
+
+def test_validators_survive_the_run(crawler, parses):
+    first = crawler._fetch_items(URL, "feed")
+    crawler.validators.save()
+
+    later = new_crawler(dict(crawler._client.pages))
+    assert later._fetch_items(URL, "feed") == first
+    assert later._client.requests[-1]
+    assert parses == ["feed"]
+
+
+def test_no_cache_bypasses_the_store(parses):
+    config_from_args(build_parser(description="test", prog="test").parse_args(["--no-cache"]))
+    crawler = new_crawler({URL: rss(3, 2, 1)})
+    assert crawler.validators is None
+
+    crawler._fetch_items(URL, "feed")
+    crawler._fetch_items(URL, "feed")
+    assert crawler._client.requests == [None, None]
+    assert parses == ["feed", "feed"]
+
+
+@pytest.fixture
+def feed_reads(monkeypatch) -> List[str]:
+    """URLs of the feed items built by the parser, in order"""
+    built: List[str] = []
+    iter_feed_items = parsers.iter_feed_items
+
+    def counting_iter_feed_items(*args, **kwargs):
+        for item in iter_feed_items(*args, **kwargs):
+            built.append(item.url)
+            yield item
+
+    monkeypatch.setattr(parsers, "iter_feed_items", counting_iter_feed_items)
+    return built
+
+
+def fetch(crawler: NewsCrawler, *numbers: int) -> List[str]:
+    """Fetch the feed once it lists numbers; returns the URLs of the items"""
+    crawler._client.pages[URL] = rss(*numbers)
+    return urls(crawler._fetch_items(URL, "feed"))
+
+
+def news_urls(*numbers: int) -> List[str]:
+    return [f"https://hcmus.edu.vn/{n}" for n in numbers]
+
+
+def test_incremental_parse_stops_at_the_mark(feed_reads):
+    crawler = new_crawler({}, etag=False)
+    assert fetch(crawler, 5, 4, 3, 2, 1) == news_urls(5, 4, 3, 2, 1)
+    assert not crawler.metrics.fetch(URL).incremental
+    feed_reads.clear()
+
+    assert fetch(crawler, 7, 6, 5, 4, 3) == news_urls(7, 6, 5, 4, 3)
+    assert crawler.metrics.fetch(URL).incremental
+    # Dừng ở mốc (tin 5), không đọc các tin cũ phía sau
+    assert feed_reads == news_urls(7, 6, 5)
+
+
+def test_missing_mark_falls_back_to_the_full_page(feed_reads):
+    crawler = new_crawler({}, etag=False)
+    fetch(crawler, 5, 4, 3, 2, 1)
+    feed_reads.clear()
+
+    # Tin mới nhất lần trước đã bị gỡ: đọc hết trang, không giữ tin cũ
+    assert fetch(crawler, 8, 7, 6, 4, 3) == news_urls(8, 7, 6, 4, 3)
+    assert feed_reads == news_urls(8, 7, 6, 4, 3)
+
+
+def test_full_parse_every_n_incremental_parses():
+    config.incremental_full_parse_every = 2
+    crawler = new_crawler({}, etag=False)
+    incremental = []
+    for newest in range(5, 10):
+        fetch(crawler, *range(newest, newest - 5, -1))
+        incremental.append(crawler.metrics.fetch(URL).incremental)
+    assert incremental == [False, True, True, False, True]
+
+
+def test_incremental_parse_can_be_turned_off(feed_reads):
+    config.incremental_parse = False
+    crawler = new_crawler({}, etag=False)
+    fetch(crawler, 5, 4, 3, 2, 1)
+    feed_reads.clear()
+    assert fetch(crawler, 6, 5, 4, 3, 2) == news_urls(6, 5, 4, 3, 2)
+    assert len(feed_reads) == 5
+
+
+def test_metrics_file_is_replaced_whole(crawler, monkeypatch):
+    metrics_filename = os.path.join(config.state_dir, config.metrics_file)
+    crawler.write_metrics()
+    with open(metrics_filename, encoding="utf-8") as f:
+        previous = f.read()
+    assert json.loads(previous)["hosts"] == {}
+
+    def failing_dump(data, f, **kwargs):
+        f.write('{"hosts": ')
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(crawler_module.json, "dump", failing_dump)
+    crawler.write_metrics()
+    # Lần ghi lỗi giữa chừng không làm hỏng file cũ
+    with open(metrics_filename, encoding="utf-8") as f:
+        assert f.read() == previous
@@ -0,0 +1,119 @@
+import dataclasses
+from typing import Dict, List
+
+import pytest
+
+from hcmus_crawler.config import ProgramType, config
+from hcmus_crawler.crawler import NewsCrawler
+from hcmus_crawler.daemon import CrawlerDaemon
+from hcmus_crawler.models import NewsItem, NewsSection
+
+
+@pytest.fixture(autouse=True)
+def state(tmp_path, monkeypatch):
+    """Run in tmp_path, with config restored after the test"""
+    monkeypatch.chdir(tmp_path)
+    for option in dataclasses.fields(config):
+        monkeypatch.setattr(config, option.name, getattr(config, option.name))
+    config.item_store = False
+    config.output_formats = []
+    config.poll_jitter = 0.0
+
+
+def good(key: str, number: int = 1) -> NewsSection:
+    item = NewsItem(f"Tin {number}", f"https://hcmus.edu.vn/{key}/{number}", "01/10/2025")
+    return NewsSection(key, [item])
+
+
+def failed(key: str) -> NewsSection:
+    return NewsSection(key, [], error_message="Connection refused")
+
+
+@pytest.fixture
+def daemon():
+    crawler = NewsCrawler(ProgramType.APCS)
+    daemon = CrawlerDaemon(crawler, [ProgramType.APCS])
+    yield daemon
+    crawler.close()
+
+
+def answer(daemon: CrawlerDaemon, sections: Dict[str, NewsSection]) -> List[List[str]]:
+    """Make the crawler return sections; returns the keys requested on every poll"""
+    requested: List[List[str]] = []
+
+    def crawl_sections(section_keys):
+        requested.append(section_keys)
+        return {key: sections[key] for key in section_keys}
+
+    daemon.crawler.crawl_sections = crawl_sections  # type: ignore[method-assign]
+    return requested
+
+
+def test_back_off_doubles_up_to_the_cap(daemon):
+    config.poll_intervals = {**config.poll_intervals, "ctda": 1800}
+    config.poll_max_backoff = 4 * 3600
+    delays = []
+    for failures in range(6):
+        daemon.failures["ctda"] = failures
+        delays.append(daemon._next_delay("ctda"))
+    assert delays == [1800, 3600, 7200, 14400, 14400, 14400]
+
+
+def test_failing_source_backs_off_and_recovers(daemon):
+    config.poll_intervals = {**config.poll_intervals, "ctda": 1800}
+    config.poll_max_backoff = 3 * 3600
+    sections = {key: good(key) for key in daemon.source_sections}
+    answer(daemon, sections)
+    daemon.poll(list(daemon.source_sections))
+
+    sections["ctda"] = failed("ctda")
+    for _ in range(4):
+        daemon.poll(["ctda"])
+    assert daemon.failures["ctda"] == 4
+    assert daemon._next_delay("ctda") == 3 * 3600
+    # Các nguồn khác không bị ảnh hưởng
+    assert daemon.failures["fit"] == 0
+
+    sections["ctda"] = good("ctda")
+    daemon.poll(["ctda"])
+    assert daemon.failures["ctda"] == 0
+    assert daemon._next_delay("ctda") == 1800
+
+
+def test_failing_source_keeps_its_last_good_section(daemon):
+    sections = {key: good(key) for key in daemon.source_sections}
+    answer(daemon, sections)
+    assert daemon.poll(list(daemon.source_sections)) == list(daemon.source_sections)
+
+    sections["ctda"] = failed("ctda")
+    sections["fit"] = good("fit", 2)
+    assert daemon.poll(["ctda", "fit"]) == ["fit"]
+    assert daemon.sections["ctda"] == good("ctda")
+    assert daemon.sections["fit"] == good("fit", 2)
+
+
+def test_source_without_a_good_section_reports_its_error(daemon):
+    sections = {key: good(key) for key in daemon.source_sections}
+    sections["ctda"] = failed("ctda")
+    answer(daemon, sections)
+    assert "ctda" in daemon.poll(list(daemon.source_sections))
+    assert daemon.sections["ctda"].has_errors()
+
+    sections["ctda"] = good("ctda")
+    assert daemon.poll(["ctda"]) == ["ctda"]
+    assert not daemon.sections["ctda"].has_errors()
+
+
+def test_failed_poll_does_not_rewrite_the_report(daemon):
+    sections = {key: good(key) for key in daemon.source_sections}
+    answer(daemon, sections)
+    daemon._poll_and_save(list(daemon.source_sections))
+    filename = config.get_output_filename(ProgramType.APCS)
+    with open(filename, encoding="utf-8") as f:
+        report = f.read()
+    assert "Tin 1" in report
+
+    sections["ctda"] = failed("ctda")
+    assert daemon.save_changed(daemon.poll(["ctda"])) == {}
+    with open(filename, encoding="utf-8") as f:
+        assert f.read() == report
@@ -0,0 +1,127 @@
+import pytest
+
+from hcmus_crawler.dedup import collapse_duplicates, find_clusters, normalize_title, number_tokens
+from hcmus_crawler.models import NewsItem, NewsSection
+
+# Tiêu đề thật: giống nhau gần hết nhưng là các thông báo khác nhau
+DIFFERENT_ANNOUNCEMENTS = [
+    [
+        "Thông báo kết quả chính thức Điểm rèn luyện sinh viên HK1/2024-2025",
+        "Thông báo kết quả chính thức Điểm rèn luyện sinh viên HK2/2024-2025",
+    ],
+    [
+        "Thông báo lịch thi học kỳ I năm học 2025-2026",
+        "Thông báo lịch thi học kỳ II năm học 2025-2026",
+    ],
+    [
+        "Thông báo lịch học bù môn Cấu trúc dữ liệu và giải thuật lớp 22CTT1",
+        "Thông báo lịch học bù môn Cấu trúc dữ liệu và giải thuật lớp 22CTT2",
+    ],
+    [
+        "Chương trình học bổng Vallet dành cho sinh viên năm 2024",
+        "Chương trình học bổng Vallet dành cho sinh viên năm 2025",
+    ],
+    [
+        "[CTĐA] Thông báo nộp đề cương đề tài tốt nghiệp Khóa 2021- Đợt 1 (bảo vệ tháng 04/2026)",
+        "[CTĐA] Thông báo nộp đề cương đề tài tốt nghiệp Khóa 2021- Đợt 2 (bảo vệ tháng 04/2026)",
+    ],
+    [
+        "[CTĐA] Kế hoạch mở học phần năm học 2023-2024 (dự kiến)",
+        "[CTĐA] Kế hoạch mở học phần năm học 2024-2025 (dự kiến)",
+        "[CTĐA] Kế hoạch mở học phần năm học 2025-2026 (dự kiến)",
+    ],
+    [
+        "Khoa Công nghệ Thông tin tuyển cộng tác viên đợt 36",
+        "Khoa Công nghệ Thông tin tuyển cộng tác viên đợt 39",
+        "Khoa Công nghệ Thông tin tuyển cộng tác viên đợt 50",
+        "Khoa Công nghệ Thông tin tuyển cộng tác viên đợt 51",
+    ],
+    [
+        "Thông báo về quy định đóng học phí học kỳ 1 năm học: 2024-2025",
+        "Thông báo về quy định đóng học phí học kỳ 1 năm học: 2025-2026",
+    ],
+]
+
+REPOSTS = [
+    "[CTĐA] Kế hoạch mở học phần năm học 2024-2025 (dự kiến)",
+    "Ke hoach mo hoc phan nam hoc 2024 - 2025 (du kien)",
+    "KẾ HOẠCH MỞ HỌC PHẦN NĂM HỌC 2024-2025 (DỰ KIẾN)!",
+]
+
+
+def news(title: str, number: int, date: str = "01/10/2025") -> NewsItem:
+    return NewsItem(title, f"https://hcmus.edu.vn/tin/{number}", date)
+
+
+def test_normalize_title():
+    assert normalize_title("[CTĐA] Thông báo: Học bổng 2025!") == "thong bao hoc bong 2025"
+    assert normalize_title("(FIT) - Lịch thi HK1/2024-2025") == "lich thi hk1 2024 2025"
+
+
+def test_number_tokens():
+    assert number_tokens(normalize_title("Lịch thi HK1 lớp 22CTT1 năm 2025")) == {
+        "hk1",
+        "22ctt1",
+        "2025",
+    }
+    assert number_tokens(normalize_title("Lịch thi học kỳ II")) == {"ii"}
+    assert number_tokens(normalize_title("Thông báo học bổng")) == frozenset()
+
+
+@pytest.mark.parametrize("titles", DIFFERENT_ANNOUNCEMENTS)
+def test_different_numbers_never_cluster(titles):
+    # Một ngưỡng thấp cũng không gộp: số khác nhau là đủ
+    assert find_clusters(titles, threshold=0.3) == []
+
+
+def test_reposts_cluster():
+    titles = ["Học bổng Vallet 2025"] + REPOSTS + ["Thông báo nghỉ lễ"]
+    assert find_clusters(titles) == [[1, 2, 3]]
+
+
+def test_groups_never_share_a_cluster():
+    assert find_clusters(REPOSTS, groups=[{"ctda"}, {"fit"}, {"ctda"}]) == [[0, 1]]
+    assert find_clusters(REPOSTS, groups=[{"ctda"}] * 3) == []
+
+
+def test_collapse_keeps_the_newest_repost():
+    ctda = NewsSection("CTĐA", [news(REPOSTS[0], 1, "01/09/2025"), news("Lịch thi", 2)])
+    fit = NewsSection("FIT", [news(REPOSTS[1], 3, "05/09/2025")])
+    collapsed, duplicates = collapse_duplicates([ctda, fit])
+
+    assert [item.url for item in collapsed[0].items] == [news("", 2).url]
+    assert collapsed[0].merged == 1
+    assert collapsed[1].items == fit.items
+    assert duplicates == {news("", 3).url: [("CTĐA", news("", 1).url)]}
+    # Không sửa các section đầu vào
+    assert len(ctda.items) == 2
+
+
+def test_collapse_same_date_keeps_report_order():
+    sections = [
+        NewsSection("CTĐA", [news(REPOSTS[0], 1)]),
+        NewsSection("FIT", [news(REPOSTS[1], 2)]),
+    ]
+    collapsed, duplicates = collapse_duplicates(sections)
+    assert [len(section.items) for section in collapsed] == [1, 0]
+    assert duplicates == {news("", 1).url: [("FIT", news("", 2).url)]}
+
+
+def test_collapse_never_merges_within_a_source():
+    # Một section FIT dài: các tin giống nhau của cùng một nguồn vẫn giữ hết
+    fit = NewsSection("FIT", [news(title, n) for n, title in enumerate(REPOSTS)])
+    assert collapse_duplicates([fit]) == ([fit], {})
+
+    # Hai section từ cùng một feed
+    ai = NewsSection("AI", [news(REPOSTS[0], 1)])
+    clc = NewsSection("CLC", [news(REPOSTS[1], 2)])
+    sections = [ai, clc]
+    assert collapse_duplicates(sections, sources=["feed", "feed"]) == (sections, {})
+
+
+def test_collapse_same_url_across_sections():
+    item = news("Thông báo học bổng khuyến khích học tập", 1)
+    sections = [NewsSection("AI", [item]), NewsSection("CLC", [item, news("Lịch thi", 2)])]
+    collapsed, duplicates = collapse_duplicates(sections, sources=["feed", "feed"])
+    assert [len(section.items) for section in collapsed] == [1, 1]
+    assert duplicates == {item.url: [("CLC", item.url)]}
@@ -0,0 +1,84 @@
+import unicodedata
+
+import pytest
+
+from hcmus_crawler.matcher import KeywordMatcher, fold_diacritics
+
+KEYWORDS = {
+    "it": ["IT", "công nghệ thông tin"],
+    "ai": ["AI", "trí tuệ nhân tạo"],
+    "clc": ["CLC", "chương trình CLC", "chất lượng cao"],
+    "news": ["thông báo", "học bổng"],
+}
+
+
+@pytest.fixture
+def matcher():
+    return KeywordMatcher(KEYWORDS)
+
+
+def test_fold_diacritics():
+    assert fold_diacritics("Học bổng ĐẠI HỌC") == "hoc bong dai hoc"
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Sinh viên cần đạt ít nhất 3 tín chỉ",
+        "Ai được miễn học phí",
+        "Ái Quốc",
+        "Đăng ký học phần it nhất 14 tín chỉ",
+        "Lịch thi HK2 khoa Toán",
+    ],
+)
+def test_folding_does_not_create_acronyms(matcher, text):
+    assert matcher.match(text) == frozenset()
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Hội thảo IT 2025", {"it"}),
+        ("Khóa học AI cho sinh viên", {"ai"}),
+        ("(AI) Seminar", {"ai"}),
+        ("Tuyển sinh CLC", {"clc"}),
+        ("Lớp CLC_IT", {"clc", "it"}),
+    ],
+)
+def test_acronyms_match_whole_words_as_written(matcher, text, expected):
+    assert matcher.match(text) == frozenset(expected)
+
+
+def test_acronyms_do_not_match_inside_words(matcher):
+    assert matcher.match("ITEM và SAIGON, CLCX") == frozenset()
+
+
+def test_decomposed_diacritics_do_not_split_a_word(matcher):
+    # "AÍ" dạng NFD là "AI" + dấu sắc
+    assert matcher.match(unicodedata.normalize("NFD", "Học AÍ")) == frozenset()
+
+
+def test_long_keywords_ignore_diacritics_and_case(matcher):
+    assert matcher.match("TRI TUE NHAN TAO va Cong nghe thong tin") == {"ai", "it"}
+
+
+def test_underscore_separates_words(matcher):
+    assert matcher.match("CTTT_Thông báo lịch thi") == {"news"}
+
+
+def test_prefix_keyword_is_not_hidden_by_longer_one(matcher):
+    # "chương trình CLC" che "CLC" tại cùng vị trí nhưng vẫn thuộc cả hai tập
+    both = KeywordMatcher({"short": ["chương trình"], "long": ["chương trình CLC"]})
+    assert both.match("Chương trình CLC năm 2025") == {"short", "long"}
+    assert matcher.match("Chương trình CLC năm 2025") == {"clc"}
+
+
+def test_without_folding_keeps_diacritics():
+    matcher = KeywordMatcher(KEYWORDS, fold=False)
+    assert matcher.match("Học Bổng khuyến khích") == {"news"}
+    assert matcher.match("Hoc bong khuyen khich") == frozenset()
+
+
+def test_empty_text_and_keywords():
+    assert KeywordMatcher({}).match("IT") == frozenset()
+    assert KeywordMatcher(KEYWORDS).match("") == frozenset()
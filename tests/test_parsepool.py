@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import List
+
+import pytest
+
+from hcmus_crawler.models import NewsItem
+from hcmus_crawler.parsepool import ParsePool, parse_page
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures")
+
+PAGES = {
+    "feed": "main_feed.xml",
+    "ctda": "ctda.html",
+    "fit": "fit.html",
+    "old_hcmus": "old_hcmus.html",
+}
+
+
+def read_page(kind: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, PAGES[kind]), "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="module")
+def pool():
+    # Một process spawn cho cả module: khởi động process con tốn thời gian
+    pool = ParsePool(processes=1)
+    yield pool
+    pool.close()
+
+
+@pytest.mark.parametrize("kind", list(PAGES))
+def test_worker_process_parses_like_the_thread(pool, kind):
+    content = read_page(kind)
+    items = pool.submit(kind, content).result(timeout=60)
+    assert items
+    assert items == parse_page(kind, content)
+
+
+@pytest.mark.parametrize("kind", ["feed", "ctda", "fit"])
+def test_worker_process_parses_incrementally_like_the_thread(pool, kind):
+    content = read_page(kind)
+    previous = parse_page(kind, content)[3:]
+    items = pool.submit(kind, content, previous).result(timeout=60)
+    assert items == parse_page(kind, content, previous)
+
+
+class HeldExecutor:
+    """Executor whose tasks only finish when the test says so"""
+
+    def __init__(self):
+        self.futures: List[Future] = []
+
+    def submit(self, fn, *args) -> Future:
+        future: Future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False) -> None:
+        pass
+
+
+def test_submit_blocks_while_the_queue_is_full():
+    pool = ParsePool(processes=1, max_pending=2)
+    executor = HeldExecutor()
+    pool._executor = executor  # type: ignore[assignment]
+
+    first = pool.submit("feed", b"")
+    pool.submit("feed", b"")
+    with pytest.raises(FutureTimeoutError):
+        pool.submit("feed", b"", timeout=0.1)
+
+    # Một trang parse xong trả lại chỗ trong hàng đợi
+    executor.futures[0].set_result([("Tin 1", "https://hcmus.edu.vn/1", "01/10/2025", None, None)])
+    assert first.result(timeout=0) == [NewsItem("Tin 1", "https://hcmus.edu.vn/1", "01/10/2025")]
+    pool.submit("feed", b"", timeout=0.1)
+    with pytest.raises(FutureTimeoutError):
+        pool.submit("feed", b"", timeout=0.1)
+
+
+def test_failed_parse_frees_its_slot():
+    pool = ParsePool(processes=1, max_pending=1)
+    executor = HeldExecutor()
+    pool._executor = executor  # type: ignore[assignment]
+
+    failed = pool.submit("feed", b"")
+    executor.futures[0].set_exception(ValueError("broken page"))
+    with pytest.raises(ValueError):
+        failed.result(timeout=0)
+    pool.submit("feed", b"", timeout=0.1)
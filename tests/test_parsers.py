@@ -0,0 +1,144 @@
+import os
+
+import pytest
+
+from hcmus_crawler.config import config
+from hcmus_crawler.models import NewsItem
+from hcmus_crawler.parsers import get_html_parser, merge_new_items, parse_feed
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "fixtures")
+
+RSS = b"""<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0"><channel><title>HCMUS</title>
+<item><title>Th\xc3\xb4ng b\xc3\xa1o 3</title><link>https://hcmus.edu.vn/3</link>
+<pubDate>Fri, 03 Oct 2025 08:00:00 +0700</pubDate><description>ba</description></item>
+<item><title>Th\xc3\xb4ng b\xc3\xa1o 2</title><link>https://hcmus.edu.vn/2</link>
+<pubDate>Thu, 02 Oct 2025 08:00:00 +0700</pubDate></item>
+<item><title>Kh\xc3\xb4ng c\xc3\xb3 ng\xc3\xa0y</title><link>https://hcmus.edu.vn/x</link></item>
+<item><title>Th\xc3\xb4ng b\xc3\xa1o 1</title><link>https://hcmus.edu.vn/1</link>
+<pubDate>Wed, 01 Oct 2025 08:00:00 +0700</pubDate></item>
+</channel></rss>"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>FIT</title>
+<entry><title>Seminar</title><link rel="alternate" href="https://fit.hcmus.edu.vn/s"/>
+<published>2025-10-05T09:00:00Z</published><summary>AI</summary></entry>
+</feed>"""
+
+
+def item(number: int, day: int = 0) -> NewsItem:
+    return NewsItem(
+        f"Tin {number}", f"https://hcmus.edu.vn/{number}", f"{day or number:02d}/10/2025"
+    )
+
+
+def test_parse_rss():
+    items = parse_feed(RSS)
+    assert [(i.title, i.url, i.date) for i in items] == [
+        ("Thông báo 3", "https://hcmus.edu.vn/3", "03/10/2025"),
+        ("Thông báo 2", "https://hcmus.edu.vn/2", "02/10/2025"),
+        ("Thông báo 1", "https://hcmus.edu.vn/1", "01/10/2025"),
+    ]
+    assert items[0].description == "ba"
+
+
+def test_parse_rss_max_items():
+    assert [i.url for i in parse_feed(RSS, max_items=2)] == [
+        "https://hcmus.edu.vn/3",
+        "https://hcmus.edu.vn/2",
+    ]
+
+
+def test_parse_atom():
+    [entry] = parse_feed(ATOM)
+    assert (entry.url, entry.date, entry.description) == (
+        "https://fit.hcmus.edu.vn/s",
+        "05/10/2025",
+        "AI",
+    )
+
+
+def test_parse_broken_document():
+    assert parse_feed(b"") == []
+    assert parse_feed(b"<rss><channel><item><title>") == []
+
+
+def test_merge_without_previous_reads_everything():
+    assert merge_new_items(iter([item(2), item(1)])) == [item(2), item(1)]
+    assert merge_new_items(iter([item(2), item(1)]), []) == [item(2), item(1)]
+
+
+def test_merge_stops_at_the_mark():
+    consumed = []
+
+    def items():
+        for number in (5, 4, 3, 2, 1):
+            consumed.append(number)
+            yield item(number)
+
+    merged = merge_new_items(items(), [item(3), item(2), item(1)])
+    assert merged == [item(5), item(4), item(3)]
+    # Không đọc tiếp sau mốc
+    assert consumed == [5, 4, 3]
+
+
+def test_merge_keeps_the_length_of_the_page():
+    # Trang giữ 3 tin mới nhất: danh sách gộp cũng vậy
+    merged = merge_new_items(iter([item(4), item(3)]), [item(3), item(2), item(1)])
+    assert merged == [item(4), item(3), item(2)]
+
+    # Nhiều tin mới hơn độ dài trước đó: giữ hết tin mới
+    previous = [item(2), item(1)]
+    merged = merge_new_items(iter([item(5), item(4), item(3), item(2)]), previous)
+    assert merged == [item(5), item(4), item(3)]
+
+
+def test_merge_moves_a_bumped_item_to_the_front():
+    merged = merge_new_items(iter([item(1), item(3)]), [item(3), item(2), item(1)])
+    assert merged == [item(1), item(3), item(2)]
+
+
+def test_merge_without_mark_returns_the_new_page():
+    # Tin mới nhất trước đó đổi ngày (đăng lại): trang đã bị xáo trộn
+    previous = [item(3), item(2), item(1)]
+    assert merge_new_items(iter([item(4), item(3, day=9)]), previous) == [item(4), item(3, day=9)]
+
+
+@pytest.mark.parametrize("source", ["ctda", "fit", "old_hcmus"])
+def test_html_engines_agree_on_fixture(source):
+    with open(os.path.join(FIXTURES_DIR, f"{source}.html"), "rb") as f:
+        args = (f.read(),) + ((config.ctda_section_titles,) if source == "ctda" else ())
+    items = get_html_parser(source, "lxml")(*args)
+    assert items
+    assert items == get_html_parser(source, "bs4")(*args)
+
+
+def test_old_hcmus_link():
+    content = (
+        b'<ul><li class="feed-link">\n\t<a href="https://old.hcmus.edu.vn/1" title="Xem">\n'
+        b'\t\tThong bao\t\n</a></li><li class="feed-link">Khong co link</li></ul>'
+    )
+    [item] = get_html_parser("old_hcmus", "lxml")(content)
+    assert (item.title, item.url) == ("Thong bao", "https://old.hcmus.edu.vn/1")
+
+
+OLD_HCMUS_CASES = {
+    # href là thuộc tính cuối của thẻ <a> (không có '" ' phía sau)
+    "href last": b'<li class="feed-link"><a href="https://old.hcmus.edu.vn/1">A</a></li>',
+    "nested anchor": (
+        b'<li class="feed-link"><div><span><a href="https://old.hcmus.edu.vn/1">A</a></span>'
+        b"</div></li>"
+    ),
+    "several anchors": (
+        b'<li class="feed-link"><a name="top">A</a> <a href="https://old.hcmus.edu.vn/1" '
+        b'class="x">B</a> <a href="https://old.hcmus.edu.vn/2">C</a></li>'
+    ),
+}
+
+
+@pytest.mark.parametrize("case", sorted(OLD_HCMUS_CASES))
+def test_old_hcmus_engines_read_the_first_href(case):
+    content = b"<ul>" + OLD_HCMUS_CASES[case] + b"</ul>"
+    items = get_html_parser("old_hcmus", "lxml")(content)
+    assert [item.url for item in items] == ["https://old.hcmus.edu.vn/1"]
+    assert items == get_html_parser("old_hcmus", "bs4")(content)
@@ -0,0 +1,173 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from hcmus_crawler import ratelimit
+from hcmus_crawler.ratelimit import (
+    DeadlineExceededError,
+    HostRateLimiter,
+    HostUnavailableError,
+    parse_retry_after,
+)
+
+URL = "https://hcmus.edu.vn/feed/"
+OTHER_URL = "https://www.fit.hcmus.edu.vn/vn/"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self._lock = threading.Lock()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(ratelimit, "time", clock)
+    return clock
+
+
+def breaker(**kwargs) -> HostRateLimiter:
+    options = dict(default=(0.0, 1), failure_threshold=3, cool_off=300.0, probe_timeout=30.0)
+    options.update(kwargs)
+    return HostRateLimiter(**options)
+
+
+def open_circuit(limiter: HostRateLimiter) -> None:
+    for _ in range(limiter.failure_threshold - 1):
+        assert not limiter.record_failure(URL)
+    assert limiter.record_failure(URL)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=60), usegmt=True)
+    assert 55 <= parse_retry_after(later) <= 60
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_burst_then_rate(clock):
+    limiter = HostRateLimiter(default=(2.0, 3))
+    assert [limiter.acquire(URL) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.acquire(URL) == pytest.approx(0.5)
+    assert limiter.acquire(URL) == pytest.approx(0.5)
+    # Host khác có bucket riêng
+    assert limiter.acquire(OTHER_URL) == 0.0
+
+
+def test_per_host_rates_and_no_limit(clock):
+    limiter = HostRateLimiter({"www.fit.hcmus.edu.vn": (1.0, 1)}, default=(0.0, 1))
+    assert [limiter.acquire(URL) for _ in range(5)] == [0.0] * 5
+    assert limiter.acquire(OTHER_URL) == 0.0
+    assert limiter.acquire(OTHER_URL) == pytest.approx(1.0)
+
+
+def test_retry_after_defers_the_host(clock):
+    limiter = HostRateLimiter(default=(0.0, 1), max_wait=30.0)
+    limiter.defer(URL, 10.0)
+    assert limiter.acquire(URL) == pytest.approx(10.0)
+
+    limiter.defer(URL, 60.0)
+    with pytest.raises(HostUnavailableError):
+        limiter.acquire(URL)
+
+
+def test_deadline_does_not_reserve_a_slot(clock):
+    limiter = HostRateLimiter(default=(1.0, 1))
+    limiter.acquire(URL)
+    with pytest.raises(DeadlineExceededError):
+        limiter.acquire(URL, deadline=clock.now + 0.5)
+    # Slot không bị giữ: request kế tiếp vẫn chỉ chờ một khoảng
+    assert limiter.acquire(URL) == pytest.approx(1.0)
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    limiter = breaker()
+    # Thành công ở giữa đặt lại bộ đếm lỗi liên tiếp
+    limiter.record_failure(URL)
+    limiter.record_failure(URL)
+    limiter.record_success(URL)
+    limiter.acquire(URL)
+
+    open_circuit(limiter)
+    with pytest.raises(HostUnavailableError, match="marked down"):
+        limiter.acquire(URL)
+    assert limiter.acquire(OTHER_URL) == 0.0
+
+
+def test_half_open_lets_one_probe_through(clock):
+    limiter = breaker()
+    open_circuit(limiter)
+    clock.now += 300.0
+
+    limiter.acquire(URL)  # request thử
+    for _ in range(3):
+        with pytest.raises(HostUnavailableError, match="probe"):
+            limiter.acquire(URL)
+
+    limiter.record_success(URL)
+    assert [limiter.acquire(URL) for _ in range(3)] == [0.0] * 3
+
+
+def test_failed_probe_opens_the_circuit_again(clock):
+    limiter = breaker()
+    open_circuit(limiter)
+    clock.now += 300.0
+    limiter.acquire(URL)
+
+    assert limiter.record_failure(URL)
+    clock.now += 299.0
+    with pytest.raises(HostUnavailableError):
+        limiter.acquire(URL)
+    clock.now += 1.0
+    limiter.acquire(URL)
+
+
+def test_probe_without_result_frees_the_slot(clock):
+    limiter = breaker()
+    open_circuit(limiter)
+    clock.now += 300.0
+    limiter.acquire(URL)
+
+    clock.now += 29.0
+    with pytest.raises(HostUnavailableError):
+        limiter.acquire(URL)
+    clock.now += 1.0
+    limiter.acquire(URL)
+    with pytest.raises(HostUnavailableError):
+        limiter.acquire(URL)
+
+
+def test_one_probe_among_concurrent_threads(clock):
+    limiter = breaker()
+    open_circuit(limiter)
+    clock.now += 300.0
+
+    results = []
+    start = threading.Barrier(8)
+
+    def request():
+        start.wait()
+        try:
+            limiter.acquire(URL)
+            results.append("sent")
+        except HostUnavailableError:
+            results.append("failed fast")
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == ["failed fast"] * 7 + ["sent"]
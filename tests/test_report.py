@@ -0,0 +1,97 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hcmus_crawler.config import ProgramType, config
+from hcmus_crawler.crawler import NewsCrawler
+from hcmus_crawler.emitters import write_formats
+from hcmus_crawler.models import CrawlerReport, NewsItem, NewsSection, SaveStatus
+
+
+@pytest.fixture
+def crawler(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "item_store", False)
+    monkeypatch.setattr(config, "output_formats", [])
+    crawler = NewsCrawler(ProgramType.APCS)
+    yield crawler
+    crawler.close()
+
+
+T0 = datetime(2025, 10, 3, 8, 0, tzinfo=timezone.utc)
+
+
+def report(*titles: str) -> CrawlerReport:
+    items = [NewsItem(title, f"https://hcmus.edu.vn/{title}", "01/10/2025") for title in titles]
+    return CrawlerReport([NewsSection("Tin tức", items)], datetime.now(timezone.utc))
+
+
+def test_save_status_truth():
+    assert SaveStatus.WRITTEN
+    assert SaveStatus.UNCHANGED
+    assert not SaveStatus.FAILED
+
+
+def test_save_report_skips_unchanged_content(crawler):
+    assert crawler.save_report(report("a")) is SaveStatus.WRITTEN
+    assert crawler.save_report(report("a")) is SaveStatus.UNCHANGED
+    assert crawler.save_report(report("a", "b")) is SaveStatus.WRITTEN
+    with open(config.get_output_filename(ProgramType.APCS), encoding="utf-8") as f:
+        assert "[b](https://hcmus.edu.vn/b)" in f.read()
+
+
+def test_failed_write_leaves_no_temporary_file(crawler):
+    # Thư mục trùng tên file báo cáo: os.replace thất bại sau khi đã ghi file tạm
+    output_filename = config.get_output_filename(ProgramType.APCS)
+    os.mkdir(output_filename)
+
+    status = crawler.save_report(report("a"))
+    assert status is SaveStatus.FAILED
+    assert not status
+    assert not os.path.exists(f"{output_filename}.tmp")
+
+
+def full_report(description: str = "Mô tả", timestamp: datetime = T0) -> CrawlerReport:
+    items = [
+        NewsItem("Lịch thi", "https://hcmus.edu.vn/1", "02/10/2025", "Thi cử", description),
+        NewsItem("Học bổng", "https://hcmus.edu.vn/2", "01/10/2025", "Học bổng"),
+        NewsItem("Không ngày", "https://hcmus.edu.vn/3", "Tuần 40", "Học bổng"),
+    ]
+    sections = [
+        NewsSection("Tin tức", items),
+        NewsSection("FIT", [], "Failed to load FIT"),
+        NewsSection("AI", [], merged=2),
+        NewsSection("Trống", []),
+    ]
+    duplicates = {"https://hcmus.edu.vn/1": [("FIT", "https://fit.hcmus.edu.vn/1")]}
+    return CrawlerReport(sections, timestamp, ["FIT: lỗi"], duplicates)
+
+
+@pytest.mark.parametrize("max_items", [None, 2])
+def test_markdown_emitter_matches_iter_markdown(tmp_path, max_items):
+    report = full_report()
+    markdown_filename = str(tmp_path / "NEWS-APCS.md")
+    write_formats(report, "apcs", ["markdown"], markdown_filename, max_items)
+    with open(markdown_filename, encoding="utf-8") as f:
+        assert f.read() == report.to_markdown(max_items)
+
+
+def test_each_format_is_compared_on_its_own_digest(tmp_path):
+    formats = ["markdown", "json", "ndjson", "atom"]
+    markdown_filename = str(tmp_path / "NEWS-APCS.md")
+    statuses = write_formats(full_report(), "apcs", formats, markdown_filename)
+    assert set(statuses.values()) == {SaveStatus.WRITTEN}
+
+    # Chỉ thời điểm tạo báo cáo đổi: không ghi lại file nào
+    later = T0 + timedelta(hours=1)
+    statuses = write_formats(full_report(timestamp=later), "apcs", formats, markdown_filename)
+    assert set(statuses.values()) == {SaveStatus.UNCHANGED}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    # Mô tả chỉ có trong các định dạng máy đọc: markdown giữ nguyên, các file khác ghi lại
+    statuses = write_formats(full_report("Mô tả mới"), "apcs", formats, markdown_filename)
+    unchanged, written = SaveStatus.UNCHANGED, SaveStatus.WRITTEN
+    assert list(statuses.values()) == [unchanged, written, written, written]
+    with open(tmp_path / "NEWS-APCS.ndjson", encoding="utf-8") as f:
+        assert "Mô tả mới" in f.read()
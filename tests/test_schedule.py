@@ -0,0 +1,87 @@
+import pytest
+
+from hcmus_crawler.config import config
+from hcmus_crawler.schedule import PollSchedule
+
+T0 = 1_760_000_000.0
+
+
+@pytest.fixture
+def schedule(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "poll_intervals", {"ctda": 600})
+    monkeypatch.setattr(config, "adaptive_poll_fraction", 0.5)
+    monkeypatch.setattr(config, "adaptive_ewma_alpha", 0.3)
+    monkeypatch.setattr(config, "adaptive_max_interval", 20_000)
+    monkeypatch.setattr(config, "poll_due_slack", 300)
+    return PollSchedule(str(tmp_path / "schedule.json"))
+
+
+def interval(schedule: PollSchedule, now: float) -> float:
+    next_poll = schedule.next_poll("ctda")
+    assert next_poll is not None
+    return next_poll - now
+
+
+def test_change_interval_is_an_ewma(schedule):
+    assert schedule.observe("ctda", "a", now=T0)
+    assert schedule.observe("ctda", "b", now=T0 + 4000)
+    assert schedule._sources["ctda"]["mean_change_interval"] == 4000
+    assert interval(schedule, T0 + 4000) == 2000
+
+    # 0.3 × 2000 + 0.7 × 4000
+    assert schedule.observe("ctda", "c", now=T0 + 6000)
+    assert schedule._sources["ctda"]["mean_change_interval"] == pytest.approx(3400)
+    assert interval(schedule, T0 + 6000) == pytest.approx(1700)
+
+    # Không đổi: giữ ước lượng, chỉ đếm lượt kiểm tra
+    assert not schedule.observe("ctda", "c", now=T0 + 6500)
+    assert schedule._sources["ctda"]["mean_change_interval"] == pytest.approx(3400)
+    assert schedule._sources["ctda"]["changes"] == 2
+    assert schedule._sources["ctda"]["checks"] == 4
+
+
+def test_long_quiet_period_counts_as_a_slower_rate(schedule):
+    schedule.observe("ctda", "a", now=T0)
+    schedule.observe("ctda", "b", now=T0 + 2000)
+    assert interval(schedule, T0 + 2000) == 1000
+
+    # Im lặng 10000 s > ước lượng 2000 s: đề xuất theo 10000 s
+    schedule.observe("ctda", "b", now=T0 + 12_000)
+    assert interval(schedule, T0 + 12_000) == 5000
+
+
+def test_interval_is_clamped(schedule):
+    schedule.observe("ctda", "a", now=T0)
+    schedule.observe("ctda", "b", now=T0 + 100)
+    # 50 s < poll_intervals["ctda"]
+    assert interval(schedule, T0 + 100) == 600
+
+    schedule.observe("ctda", "b", now=T0 + 100_000)
+    assert interval(schedule, T0 + 100_000) == config.adaptive_max_interval
+
+
+def test_unknown_source_uses_the_default_minimum(schedule):
+    schedule.observe("fit", "a", now=T0)
+    assert schedule.next_poll("fit") == T0 + 1800
+
+
+def test_due_only_slack(schedule):
+    assert schedule.is_due("ctda", now=T0)
+    schedule.observe("ctda", "a", now=T0)
+    next_poll = schedule.next_poll("ctda")
+
+    assert not schedule.is_due("ctda", now=next_poll - 301)
+    # Sắp đến hạn trong poll_due_slack: vẫn tính là đến hạn
+    assert schedule.is_due("ctda", now=next_poll - 300)
+    assert schedule.due_sources(["ctda", "fit"], now=next_poll - 301) == ["fit"]
+    assert schedule.due_sources(["ctda", "fit"], now=next_poll) == ["ctda", "fit"]
+
+
+def test_schedule_survives_a_restart(schedule):
+    schedule.observe("ctda", "a", now=T0)
+    schedule.observe("ctda", "b", now=T0 + 4000)
+    schedule.save()
+
+    reloaded = PollSchedule(schedule.path)
+    assert reloaded.next_poll("ctda") == schedule.next_poll("ctda")
+    assert not reloaded.observe("ctda", "b", now=T0 + 4100)
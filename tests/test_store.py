@@ -0,0 +1,224 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from hcmus_crawler.models import NewsItem, NewsSection
+from hcmus_crawler.store import ItemStore, canonical_url, url_hash
+
+T0 = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ItemStore(str(tmp_path / "state" / "items.sqlite3"))
+    yield store
+    store.close()
+
+
+def section(*items: NewsItem, title: str = "Tin tức") -> NewsSection:
+    return NewsSection(title, list(items))
+
+
+def news(number: int, title: str = "", description=None) -> NewsItem:
+    return NewsItem(
+        title or f"Thông báo {number}",
+        f"https://hcmus.edu.vn/tin/{number}",
+        f"{number:02d}/10/2025",
+        description=description,
+    )
+
+
+def test_canonical_url():
+    assert canonical_url("HTTPS://HCMUS.edu.vn/tin/1/?utm_source=fb&b=2&a=1#top") == (
+        "https://hcmus.edu.vn/tin/1?a=1&b=2"
+    )
+    assert url_hash("https://hcmus.edu.vn/tin/1/") == url_hash("https://hcmus.edu.vn/tin/1")
+
+
+def test_record_counts_new_items(store):
+    assert store.record([("hcmus", "hcmus", section(news(1), news(2)))], T0) == 2
+    assert store.record([("hcmus", "hcmus", section(news(2), news(3)))], T0) == 1
+    assert store.record([]) == 0
+    assert store.record([("hcmus", "hcmus", section())]) == 0
+
+
+def test_upsert_keeps_first_seen_and_updates_the_rest(store):
+    store.record([("hcmus", "hcmus", section(news(1, description="Mô tả")))], T0)
+    later = T0 + timedelta(hours=1)
+    store.record([("hcmus", "hcmus", section(news(1, title="Thông báo 1 (cập nhật)")))], later)
+
+    [stored] = store.items_since(T0)
+    assert stored.item.title == "Thông báo 1 (cập nhật)"
+    # Lần sau không có mô tả: giữ mô tả cũ
+    assert stored.item.description == "Mô tả"
+    assert (stored.first_seen, stored.last_seen) == (T0, later)
+
+
+def test_same_url_in_several_sections_is_one_item(store):
+    item = news(1)
+    variant = NewsItem(item.title, item.url + "/?utm_campaign=x", item.date)
+    new = store.record(
+        [("hcmus", "hcmus", section(item)), ("standard_ai", "main_feed", section(variant))], T0
+    )
+    assert new == 1
+    [stored] = store.items_since(T0)
+    assert stored.source == "hcmus"
+    assert stored.sections == ["hcmus", "standard_ai"]
+
+
+def test_record_without_touching_existing_items(store):
+    store.record([("hcmus", "hcmus", section(news(1)))], T0)
+    later = T0 + timedelta(days=1)
+    new = store.record(
+        [("hcmus", "hcmus", section(news(1, title="Đổi tiêu đề"), news(2)))],
+        later,
+        touch_existing=False,
+    )
+    assert new == 1
+    by_url = {stored.item.url: stored for stored in store.items_since(T0)}
+    assert by_url[news(1).url].item.title == "Thông báo 1"
+    assert by_url[news(1).url].last_seen == T0
+
+
+def test_items_since_and_section_filter(store):
+    store.record([("ctda", "ctda", section(news(1)))], T0)
+    store.record([("fit", "fit", section(news(2)))], T0 + timedelta(hours=2))
+
+    assert [s.item.url for s in store.items_since(T0 + timedelta(hours=1))] == [news(2).url]
+    assert [s.item.url for s in store.items_since(T0, section="ctda")] == [news(1).url]
+
+
+def test_history_survives_reopening(tmp_path):
+    path = str(tmp_path / "items.sqlite3")
+    store = ItemStore(path)
+    store.record([("hcmus", "hcmus", section(news(1)))], T0)
+    store.close()
+
+    store = ItemStore(path)
+    assert store.record([("hcmus", "hcmus", section(news(1)))], T0) == 0
+    store.close()
+
+
+@pytest.fixture
+def history(store):
+    store.record(
+        [
+            (
+                "hcmus",
+                "hcmus",
+                section(
+                    NewsItem(
+                        "Thông báo học bổng khuyến khích", "https://hcmus.edu.vn/1", "05/09/2025"
+                    ),
+                    NewsItem(
+                        "Lịch thi học kỳ 1",
+                        "https://hcmus.edu.vn/2",
+                        "20/10/2024",
+                        category="Important",
+                        description="<p>Sinh viên xem <b>lịch thi</b> &amp; phòng thi</p>",
+                    ),
+                ),
+            ),
+            (
+                "fit",
+                "fit",
+                section(
+                    NewsItem("Học bổng doanh nghiệp FIT", "https://fit.hcmus.edu.vn/3", "Tuần 40")
+                ),
+            ),
+        ],
+        T0,
+    )
+    return store
+
+
+def urls(results):
+    return sorted(result.item.url for result in results)
+
+
+def test_search_ignores_diacritics_and_case(history):
+    assert urls(history.search("HOC BONG")) == [
+        "https://fit.hcmus.edu.vn/3",
+        "https://hcmus.edu.vn/1",
+    ]
+    assert urls(history.search("học bổng khuyến")) == ["https://hcmus.edu.vn/1"]
+
+
+def test_search_description_without_markup(history):
+    assert urls(history.search("phong thi")) == ["https://hcmus.edu.vn/2"]
+    assert history.search("amp") == []
+
+
+def test_search_last_word_is_a_prefix(history):
+    assert urls(history.search("doanh ngh")) == ["https://fit.hcmus.edu.vn/3"]
+
+
+def test_search_operators_are_literal(history):
+    assert history.search('hoc OR "bong') == []
+    assert history.search("!!!") == []
+
+
+def test_search_filters(history):
+    assert urls(history.search("hoc", since="2025")) == [
+        "https://fit.hcmus.edu.vn/3",
+        "https://hcmus.edu.vn/1",
+    ]
+    assert urls(history.search("hoc", until="2024-10")) == ["https://hcmus.edu.vn/2"]
+    assert urls(history.search("hoc", category="important")) == ["https://hcmus.edu.vn/2"]
+    assert urls(history.search("hoc bong", section="fit")) == ["https://fit.hcmus.edu.vn/3"]
+
+
+def test_search_newest_first_and_limit(history):
+    results = history.search("hoc", newest_first=True, limit=2)
+    # Tin FIT không có ngày: xếp theo ngày thấy lần đầu (T0)
+    assert [result.item.url for result in results] == [
+        "https://fit.hcmus.edu.vn/3",
+        "https://hcmus.edu.vn/1",
+    ]
+
+
+def test_search_rejects_bad_date_bounds(history):
+    with pytest.raises(ValueError):
+        history.search("hoc", since="10/2025")
+
+
+def test_renamed_item_is_reindexed(history):
+    renamed = NewsItem("Lịch thi cuối kỳ", "https://hcmus.edu.vn/1", "05/09/2025")
+    history.record([("hcmus", "hcmus", section(renamed))], T0)
+    assert history.search("khuyen khich") == []
+    assert urls(history.search("cuoi ky")) == ["https://hcmus.edu.vn/1"]
+
+
+def test_search_does_not_match_the_source_url(store):
+    store.record(
+        [
+            (
+                "ctda",
+                "https://www.ctda.hcmus.edu.vn/",
+                section(news(1, "Thông báo học bổng"), news(2, "Lịch học CTĐA")),
+            )
+        ],
+        T0,
+    )
+    assert store.search("hcmus") == []
+    assert store.search("edu") == []
+    assert urls(store.search("ctda")) == ["https://hcmus.edu.vn/tin/2"]
+
+
+def test_index_with_the_source_column_is_rebuilt(tmp_path):
+    path = str(tmp_path / "items.sqlite3")
+    store = ItemStore(path)
+    store.record([("ctda", "https://www.ctda.hcmus.edu.vn/", section(news(1)))], T0)
+    # Chỉ mục của phiên bản trước còn cột source
+    with store._conn:
+        store._conn.execute("DROP TABLE items_fts")
+        store._conn.execute(
+            "CREATE VIRTUAL TABLE items_fts USING fts5("
+            "url_hash UNINDEXED, published UNINDEXED, title, description, source)"
+        )
+    store.close()
+
+    store = ItemStore(path)
+    assert urls(store.search("thong bao")) == ["https://hcmus.edu.vn/tin/1"]
+    assert store.search("ctda") == []
+    store.close()